@@ -0,0 +1 @@
+"""Performance benchmarks for BIND framework (run with ``python -m benchmarks``)."""
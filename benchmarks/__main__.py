@@ -0,0 +1,193 @@
+"""
+Run and compare BIND benchmarks.
+
+Usage:
+    python -m benchmarks run [--profile quick] [--filter analysis/gradient]
+    python -m benchmarks compare BASE [HEAD] [--threshold 0.1]
+    python -m benchmarks imports [--repeats 5]
+
+Results are stored as ``benchmarks/results/<commit>.json``; ``compare``
+accepts commits (anything ``git rev-parse`` understands) or JSON paths.
+``imports`` fails when a package import exceeds its budget in
+``IMPORT_BUDGETS_MS`` or loads one of ``HEAVY_MODULES``.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .imports import HEAVY_MODULES, IMPORT_BUDGETS_MS, measure_import
+from .measure import measure
+from .suite import build_suite
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Metrics checked by ``compare``: (name, minimum base value worth comparing)
+COMPARED_METRICS = [
+    ('wall_time', 1e-3),
+    ('alloc_peak_bytes', 1 << 20),
+    ('peak_rss_bytes', 1 << 20),
+    ('alloc_retained_blocks', 1000),
+]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _results_path(ref: str) -> str:
+    """JSON path for ``ref``: an existing file or a commit's stored results."""
+    if os.path.isfile(ref):
+        return ref
+    commit = _git('rev-parse', '--verify', f'{ref}^{{commit}}') or ref
+    return os.path.join(RESULTS_DIR, f'{commit}.json')
+
+
+def run(args: argparse.Namespace) -> int:
+    cases = [case for case in build_suite(args.profile)
+             if not args.filter or any(f in case.name for f in args.filter)]
+
+    commit = _git('rev-parse', 'HEAD') or 'unknown'
+    report = {
+        'commit': commit,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'profile': args.profile,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cases': {},
+    }
+
+    for case in cases:
+        stages = case.setup()
+        results = {}
+        for stage_name, stage in stages.items():
+            results[stage_name] = measure(stage, repeats=args.repeats)
+            print(f"{case.name:40s} {stage_name:34s} "
+                  f"{results[stage_name]['wall_time'] * 1e3:10.2f} ms  "
+                  f"{results[stage_name]['alloc_peak_bytes'] / 2**20:8.1f} MiB")
+        report['cases'][case.name] = {'params': case.params, 'stages': results}
+        del stages
+
+    output = args.output or os.path.join(RESULTS_DIR, f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+    return 0
+
+
+def compare_reports(base: Dict, head: Dict,
+                    threshold: float) -> List[Tuple[str, str, str, float, float, bool]]:
+    """
+    Rows ``(case, stage, metric, base, head, regressed)`` for every metric
+    present in both reports. A metric regresses when ``head`` exceeds
+    ``base`` by more than ``threshold`` (a fraction); values below the
+    metric's floor in ``COMPARED_METRICS`` are too small to judge.
+    """
+    rows = []
+    for case_name, case in head['cases'].items():
+        base_case = base['cases'].get(case_name)
+        if base_case is None:
+            continue
+        for stage_name, stage in case['stages'].items():
+            base_stage = base_case['stages'].get(stage_name)
+            if base_stage is None:
+                continue
+            for metric, floor in COMPARED_METRICS:
+                old, new = base_stage.get(metric), stage.get(metric)
+                if old is None or new is None:
+                    continue
+                regressed = max(old, new) >= floor and new > old * (1 + threshold)
+                rows.append((case_name, stage_name, metric, old, new, regressed))
+    return rows
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(_results_path(args.base)) as f:
+        base = json.load(f)
+    with open(_results_path(args.head)) as f:
+        head = json.load(f)
+
+    rows = compare_reports(base, head, args.threshold)
+    regressions = [row for row in rows if row[5]]
+
+    print(f"base {base['commit'][:10]}  head {head['commit'][:10]}  "
+          f"threshold +{args.threshold:.0%}\n")
+    for case_name, stage_name, metric, old, new, regressed in rows:
+        if regressed or args.verbose:
+            change = (new - old) / old if old else float('inf')
+            flag = 'REGRESSION' if regressed else ''
+            print(f"{case_name:40s} {stage_name:34s} {metric:18s} "
+                  f"{old:12.6g} -> {new:12.6g} ({change:+7.1%}) {flag}")
+
+    print(f"\n{len(regressions)} regression(s) in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+def imports(args: argparse.Namespace) -> int:
+    failures = 0
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        result = measure_import(module, repeats=args.repeats)
+        elapsed = result['import_time'] * 1e3
+        problems = []
+        if elapsed > budget:
+            problems.append(f"over {budget:.0f} ms budget")
+        if result['heavy_modules']:
+            problems.append(f"loads {', '.join(result['heavy_modules'])}")
+        failures += bool(problems)
+        print(f"import {module:20s} {elapsed:8.2f} ms  {'; '.join(problems) or 'ok'}")
+
+    print(f"\n{failures} import(s) over budget or loading {', '.join(HEAVY_MODULES)}")
+    return 1 if failures else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="BIND performance benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the suite and store the results")
+    run_parser.add_argument('--profile', choices=['full', 'quick'], default='full')
+    run_parser.add_argument('--filter', action='append',
+                            help="Only cases whose name contains this (repeatable)")
+    run_parser.add_argument('--repeats', type=int, default=5)
+    run_parser.add_argument('--output', help="JSON path (default: results/<commit>.json)")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help="Flag regressions between two runs")
+    compare_parser.add_argument('base', help="Commit or results JSON")
+    compare_parser.add_argument('head', nargs='?', default='HEAD', help="Commit or results JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Allowed relative increase (default 0.10)")
+    compare_parser.add_argument('--verbose', action='store_true',
+                                help="Also list comparisons that did not regress")
+    compare_parser.set_defaults(func=compare)
+
+    imports_parser = commands.add_parser('imports',
+                                         help="Check package import times against budgets")
+    imports_parser.add_argument('--repeats', type=int, default=5)
+    imports_parser.set_defaults(func=imports)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
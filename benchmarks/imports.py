@@ -0,0 +1,63 @@
+"""
+Import-time measurement for BIND packages.
+
+Each measurement imports the module in a fresh interpreter with
+``-X importtime`` and reads the module's cumulative time, so interpreter
+start-up and already-cached modules do not count.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# Cumulative import time allowed per module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    'bind': 100.0,
+    'bind.core': 100.0,
+    'bind.systems': 100.0,
+}
+
+# Modules a bare package import must not pull in
+HEAVY_MODULES = ['scipy', 'matplotlib', 'pandas', 'torch']
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _probe(module: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [_REPO_ROOT, env.get('PYTHONPATH')]))
+    code = (f"import sys, {module}\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=True, env=env)
+
+
+def _cumulative_us(stderr: str, module: str) -> int:
+    """Cumulative microseconds of ``module`` in ``-X importtime`` output."""
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise ValueError(f"{module} not found in import-time output")
+
+
+def measure_import(module: str, repeats: int = 5) -> Dict[str, object]:
+    """
+    Best-of-``repeats`` cold import time of ``module``.
+
+    Returns:
+        Dictionary with 'import_time' (seconds) and 'heavy_modules', the
+        entries of ``HEAVY_MODULES`` the import loaded
+    """
+    times: List[float] = []
+    heavy: List[str] = []
+    for _ in range(max(repeats, 1)):
+        result = _probe(module)
+        times.append(_cumulative_us(result.stderr, module) * 1e-6)
+        heavy = [name for name in result.stdout.strip().split(',') if name]
+    return {'import_time': min(times), 'heavy_modules': heavy}
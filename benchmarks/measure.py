@@ -0,0 +1,98 @@
+"""
+Timing and memory measurement for BIND benchmarks.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS counter (Linux only); True on success."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+
+
+def measure(stage: Callable[[], object], repeats: int = 5,
+            warmup: int = 1) -> Dict[str, object]:
+    """
+    Measure one stage: wall time, peak RSS and allocations.
+
+    The stage is called ``warmup`` times unmeasured, then ``repeats`` times
+    under ``time.perf_counter``. A final call runs under ``tracemalloc``
+    (kept out of the timed runs because tracing slows allocation down) and
+    reports the peak bytes allocated while it ran, and the bytes and
+    number of memory blocks still held by its result (``tracemalloc``
+    sees live blocks, not every allocation made and freed on the way).
+    NumPy reports its array buffers to ``tracemalloc``, so all three
+    include array allocations.
+
+    Peak RSS is reset before the timed runs where the platform allows it
+    (``peak_rss_reset``); otherwise it is the process-lifetime peak and
+    only an upper bound for the stage.
+    """
+    for _ in range(warmup):
+        stage()
+
+    gc.collect()
+    rss_reset = _reset_peak_rss()
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stage()
+        times.append(time.perf_counter() - start)
+    peak_rss = _peak_rss()
+
+    # Tracing starts empty, so the traced peak is what the stage allocated
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = stage()
+        retained, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_time': min(times),
+        'wall_time_median': statistics.median(times),
+        'wall_times': times,
+        'peak_rss_bytes': peak_rss,
+        'peak_rss_reset': rss_reset,
+        'alloc_peak_bytes': int(peak),
+        'alloc_retained_bytes': int(retained),
+        'alloc_retained_blocks': int(blocks),
+    }
@@ -0,0 +1,134 @@
+"""
+Benchmark cases for the BIND analysis and simulation hot paths.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from dataclasses import dataclass, field
+import numpy as np
+from typing import Callable, Dict, List, Tuple
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+from bind.core.simulator import BoundarySimulator
+
+
+# A case's setup returns its stages: name -> zero-argument callable
+Stages = Dict[str, Callable[[], object]]
+
+FIELD_SHAPES = {
+    'full': [(4096,), (65536,), (64, 64), (256, 256), (512, 512),
+             (1024, 1024), (2048, 2048), (32, 32, 32), (64, 64, 64)],
+    'quick': [(4096,), (64, 64), (256, 256), (32, 32, 32)],
+}
+FRAME_COUNTS = {
+    'full': [10, 100, 500],
+    'quick': [10, 50],
+}
+METHODS = ['gradient', 'laplacian']
+SEQUENCE_SIZE = (64, 64)
+
+
+@dataclass
+class Case:
+    """One benchmark case: parameters plus a setup building its stages."""
+    name: str
+    group: str
+    params: Dict[str, object]
+    setup: Callable[[], Stages] = field(repr=False)
+
+
+def _shape_name(shape: Tuple[int, ...]) -> str:
+    return 'x'.join(str(n) for n in shape)
+
+
+def _field(shape: Tuple[int, ...], seed: int = 0) -> np.ndarray:
+    np.random.seed(seed)
+    return BoundarySimulator.generate_two_phase_system(shape)
+
+
+def _frames(count: int, seed: int = 0) -> np.ndarray:
+    np.random.seed(seed)
+    return np.stack(BoundarySimulator.generate_consciousness_emergence(
+        timesteps=count, size=SEQUENCE_SIZE))
+
+
+def _analysis_stages(shape: Tuple[int, ...], method: str) -> Stages:
+    """``analyze_system`` and the stages it is made of, on one field."""
+    monitor = BoundaryMonitor(BoundaryConfig(boundary_detection_method=method))
+    data = np.asarray(_field(shape), dtype=monitor.dtype)
+    boundaries = monitor._detect_boundaries(data).copy()
+
+    def analyze_system():
+        monitor.history.clear()
+        return monitor.analyze_system(data)
+
+    return {
+        'detect_boundaries': lambda: monitor._detect_boundaries(data),
+        'entropy_gradient': lambda: monitor._calculate_entropy_gradient(data, boundaries),
+        'normal_vector': lambda: monitor._estimate_normal_vector(data, boundaries),
+        'analyze_system': analyze_system,
+    }
+
+
+def _sequence_stages(count: int, method: str) -> Stages:
+    """A frame sequence analyzed frame by frame and as one batch."""
+    monitor = BoundaryMonitor(BoundaryConfig(boundary_detection_method=method))
+    frames = _frames(count)
+
+    def analyze_loop():
+        monitor.history.clear()
+        return [monitor.analyze_system(frame) for frame in frames]
+
+    def analyze_batch():
+        monitor.history.clear()
+        return monitor.analyze_batch(frames)
+
+    return {'analyze_loop': analyze_loop, 'analyze_batch': analyze_batch}
+
+
+def build_suite(profile: str = 'full') -> List[Case]:
+    """All cases of a profile (``'full'`` or ``'quick'``)."""
+    if profile not in FIELD_SHAPES:
+        raise ValueError(f"Unknown benchmark profile: {profile}")
+
+    cases = []
+    for shape in FIELD_SHAPES[profile]:
+        for method in METHODS:
+            cases.append(Case(
+                name=f"analysis/{method}/{_shape_name(shape)}",
+                group='analysis',
+                params={'shape': list(shape), 'method': method},
+                setup=lambda shape=shape, method=method: _analysis_stages(shape, method),
+            ))
+
+    for shape in FIELD_SHAPES[profile]:
+        cases.append(Case(
+            name=f"simulator/two_phase/{_shape_name(shape)}",
+            group='simulator',
+            params={'shape': list(shape)},
+            setup=lambda shape=shape: {
+                'generate_two_phase_system':
+                    lambda: BoundarySimulator.generate_two_phase_system(shape)},
+        ))
+
+    for count in FRAME_COUNTS[profile]:
+        cases.append(Case(
+            name=f"simulator/emergence/{count}",
+            group='simulator',
+            params={'frames': count, 'shape': list(SEQUENCE_SIZE)},
+            setup=lambda count=count: {
+                'generate_consciousness_emergence':
+                    lambda: BoundarySimulator.generate_consciousness_emergence(
+                        timesteps=count, size=SEQUENCE_SIZE)},
+        ))
+        for method in METHODS:
+            cases.append(Case(
+                name=f"sequence/{method}/{count}",
+                group='sequence',
+                params={'frames': count, 'shape': list(SEQUENCE_SIZE), 'method': method},
+                setup=lambda count=count, method=method: _sequence_stages(count, method),
+            ))
+
+    return cases
@@ -11,8 +11,35 @@ __version__ = "0.1.0"
 __author__ = "Hillary Danan"
 __email__ = "hillarydanan@gmail.com"
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 # Import main components
 from .config import BoundaryConfig
-from .core.boundary_state import BoundaryState
+
+# Loaded on first access (PEP 562) to keep ``import bind`` cheap
+_LAZY = {
+    'BoundaryState': ('.core.boundary_state', 'BoundaryState'),
+    'core': ('.core', None),
+    'systems': ('.systems', None),
+}
+
+if TYPE_CHECKING:
+    from .core.boundary_state import BoundaryState
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY[name]
+    module = import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = ['BoundaryConfig', 'BoundaryState']
@@ -30,13 +30,32 @@ class BoundaryConfig:
     
     # System parameters
     boundary_detection_method: str = "gradient"  # Options: "gradient", "laplacian"
+    threshold_method: str = "exact"  # Options: "exact", "histogram", "reservoir"
+    threshold_bins: int = 4096  # Bins for histogram thresholds
+    threshold_sample_size: int = 10000  # Sample size for reservoir thresholds
+    threshold_seed: int = 0  # Seed for reservoir thresholds
     entropy_calculation_method: str = "shannon"  # Options: "shannon", "renyi"
+    renyi_alpha: float = 2.0  # Order of Rényi entropy (used when method is "renyi")
     integration_time_window: float = 0.1  # Time window in seconds
+    quantile_relative_accuracy: float = 0.01  # Streaming threshold sketch error
     spatial_resolution: float = 0.001  # Spatial resolution in meters
+    entropy_window_size: int = 5  # Side of the local entropy window
+    entropy_bins: int = 10  # Histogram bins per local entropy window
+    dtype: str = "float64"  # Compute precision: "float64" or "float32"
+    slab_size: int = 64  # Rows along axis 0 processed per slab (bounds memory)
+    workspace_max_bytes: int = 16 * 2**20  # Scratch buffers a monitor keeps between calls
+    history_capacity: int = 10000  # States kept in BoundaryMonitor.history
+    parallel_chunk_size: int = 16  # Frames per task in analyze_parallel
+    instrumentation: bool = False  # Record per-stage timings (BoundaryMonitor.stats)
+    record_masks: bool = False  # Keep compact per-frame masks (BoundaryMonitor.masks)
+    cache_max_bytes: int = 0  # Memory budget of the result cache (0 disables it)
+    cache_path: str = ""  # SQLite file for the on-disk cache tier ("" for none)
+    cache_disk_max_bytes: int = 2**30  # Budget of the on-disk cache tier (0: unbounded)
+    recording_chunk_frames: int = 256  # Frames per recording chunk file
     
     # Hexagonal topology parameters
     hex_grid_size: int = 7  # Number of hexagons per side
-    hex_connectivity: int = 6  # Hexagonal has 6 neighbors by definition
+    hex_connectivity: int = 6  # Hexagonal neighbours: 6, or 12 with the diagonal ring
     
     # Trust dynamics parameters
     trust_decay_rate: float = 0.1  # How quickly trust decays
@@ -73,9 +92,28 @@ class BoundaryConfig:
             (self.transformation_beta > 0, "transformation_beta must be positive"),
             (self.boundary_detection_method in ["gradient", "laplacian"], 
              "Invalid boundary detection method"),
+            (self.threshold_method in ["exact", "histogram", "reservoir"],
+             "Invalid threshold method"),
+            (self.threshold_bins > 0, "threshold_bins must be positive"),
+            (self.threshold_sample_size > 0, "threshold_sample_size must be positive"),
             (self.entropy_calculation_method in ["shannon", "renyi"], 
              "Invalid entropy calculation method"),
+            (self.renyi_alpha >= 0, "renyi_alpha must be non-negative"),
+            (self.entropy_window_size > 0, "entropy_window_size must be positive"),
+            (self.entropy_bins > 0, "entropy_bins must be positive"),
+            (self.dtype in ["float64", "float32"], "dtype must be float64 or float32"),
+            (self.slab_size > 0, "slab_size must be positive"),
+            (self.history_capacity > 0, "history_capacity must be positive"),
+            (self.cache_max_bytes >= 0, "cache_max_bytes must be non-negative"),
+            (self.cache_disk_max_bytes >= 0, "cache_disk_max_bytes must be non-negative"),
+            (self.workspace_max_bytes >= 0, "workspace_max_bytes must be non-negative"),
+            (self.recording_chunk_frames > 0, "recording_chunk_frames must be positive"),
+            (self.integration_time_window > 0, "integration_time_window must be positive"),
+            (0 < self.quantile_relative_accuracy < 1,
+             "quantile_relative_accuracy must be between 0 and 1"),
+            (self.parallel_chunk_size > 0, "parallel_chunk_size must be positive"),
             (self.hex_grid_size > 0, "hex_grid_size must be positive"),
+            (self.hex_connectivity in [6, 12], "hex_connectivity must be 6 or 12"),
             (0 <= self.initial_trust <= 1, "initial_trust must be between 0 and 1"),
         ]
         
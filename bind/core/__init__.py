@@ -1,7 +1,101 @@
-"""Core modules for BIND framework."""
+"""
+Core modules for BIND framework.
 
-from .boundary_state import BoundaryState
-from .monitor import BoundaryMonitor
-from .simulator import BoundarySimulator
+Submodules are imported on first attribute access (PEP 562), so
+``import bind.core`` stays cheap and e.g. scipy is only loaded by the
+stages that use it.
+"""
 
-__all__ = ['BoundaryState', 'BoundaryMonitor', 'BoundarySimulator']
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'BoundaryState': 'boundary_state',
+    'BoundaryBatch': 'boundary_state',
+    'ResultCache': 'cache',
+    'EntropyBackend': 'entropy',
+    'ShannonEntropy': 'entropy',
+    'RenyiEntropy': 'entropy',
+    'HexBoundaryMonitor': 'hexagonal',
+    'HexGrid': 'hexagonal',
+    'clear_hex_grids': 'hexagonal',
+    'BoundaryHistory': 'history',
+    'IncrementalBoundaryMonitor': 'incremental',
+    'Instrumentation': 'instrumentation',
+    'FrameRecord': 'instrumentation',
+    'PrometheusExporter': 'instrumentation',
+    'BoundaryMonitor': 'monitor',
+    'analyze_parallel': 'parallel',
+    'compare_precision': 'precision',
+    'analyze_pyramid': 'pyramid',
+    'PyramidReport': 'pyramid',
+    'analyze_regions': 'regions',
+    'RegionTable': 'regions',
+    'Recording': 'recording',
+    'RecordingWriter': 'recording',
+    'BoundarySimulator': 'simulator',
+    'SparseMask': 'sparse',
+    'MaskHistory': 'sparse',
+    'sweep': 'sweep',
+    'SweepResult': 'sweep',
+    'StreamingBoundaryMonitor': 'streaming',
+    'QuantileSketch': 'streaming',
+    'TrustNetwork': 'trust',
+    'TrustTrajectory': 'trust',
+    'ThresholdStrategy': 'thresholds',
+    'ExactThreshold': 'thresholds',
+    'HistogramThreshold': 'thresholds',
+    'ReservoirThreshold': 'thresholds',
+    'analyze_tiled': 'tiled',
+    'DerivativeWorkspace': 'workspace',
+}
+
+if TYPE_CHECKING:
+    from .boundary_state import BoundaryState, BoundaryBatch
+    from .cache import ResultCache
+    from .entropy import EntropyBackend, ShannonEntropy, RenyiEntropy
+    from .hexagonal import HexBoundaryMonitor, HexGrid, clear_hex_grids
+    from .history import BoundaryHistory
+    from .incremental import IncrementalBoundaryMonitor
+    from .instrumentation import Instrumentation, FrameRecord, PrometheusExporter
+    from .monitor import BoundaryMonitor
+    from .parallel import analyze_parallel
+    from .precision import compare_precision
+    from .pyramid import analyze_pyramid, PyramidReport
+    from .recording import Recording, RecordingWriter
+    from .regions import analyze_regions, RegionTable
+    from .simulator import BoundarySimulator
+    from .sparse import SparseMask, MaskHistory
+    from .sweep import sweep, SweepResult
+    from .streaming import StreamingBoundaryMonitor, QuantileSketch
+    from .trust import TrustNetwork, TrustTrajectory
+    from .thresholds import (ThresholdStrategy, ExactThreshold, HistogramThreshold,
+                             ReservoirThreshold)
+    from .tiled import analyze_tiled
+    from .workspace import DerivativeWorkspace
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    # Cache on the package; this also restores names such as ``sweep`` that
+    # the import of the same-named submodule rebinds to the module
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+__all__ = ['BoundaryState', 'BoundaryBatch', 'BoundaryHistory', 'BoundaryMonitor', 'BoundarySimulator',
+           'StreamingBoundaryMonitor', 'QuantileSketch', 'analyze_parallel', 'compare_precision',
+           'analyze_tiled', 'ThresholdStrategy', 'ExactThreshold',
+           'HistogramThreshold', 'ReservoirThreshold', 'DerivativeWorkspace',
+           'Instrumentation', 'FrameRecord', 'PrometheusExporter', 'ResultCache',
+           'EntropyBackend', 'ShannonEntropy', 'RenyiEntropy', 'sweep', 'SweepResult',
+           'analyze_regions', 'RegionTable', 'analyze_pyramid', 'PyramidReport',
+           'IncrementalBoundaryMonitor', 'SparseMask', 'MaskHistory', 'HexBoundaryMonitor',
+           'HexGrid', 'clear_hex_grids', 'TrustNetwork', 'TrustTrajectory', 'Recording', 'RecordingWriter']
@@ -7,6 +7,7 @@ Date: July 2025
 
 from dataclasses import dataclass
 import numpy as np
+from typing import List
 
 
 @dataclass
@@ -24,6 +25,8 @@ class BoundaryState:
         decoherence_rate: Rate of quantum decoherence D(t)
         phi_integrated: Integrated information measure Φ(I)
         timestamp: When this state was measured
+    
+    Vector quantities have one component per array axis, in axis order.
     """
     
     entropy_gradient: np.ndarray
@@ -54,3 +57,69 @@ class BoundaryState:
             'phi_integrated': float(self.phi_integrated),
             'timestamp': float(self.timestamp)
         }
+
+
+@dataclass
+class BoundaryBatch:
+    """
+    Columnar boundary states for a stack of frames.
+    
+    Row ``t`` holds the same measurements as one ``BoundaryState``; the
+    leading axis of every column indexes the frame.
+    
+    Attributes:
+        entropy_gradient: Entropy gradients, shape (T, ndim)
+        normal_vector: Unit normal vectors, shape (T, ndim)
+        information_flux: Information flux per frame, shape (T,)
+        decoherence_rate: Decoherence rate per frame, shape (T,)
+        phi_integrated: Integrated information per frame, shape (T,)
+        timestamp: Measurement time per frame, shape (T,)
+    """
+    
+    entropy_gradient: np.ndarray
+    normal_vector: np.ndarray
+    information_flux: np.ndarray
+    decoherence_rate: np.ndarray
+    phi_integrated: np.ndarray
+    timestamp: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.information_flux)
+    
+    @classmethod
+    def from_states(cls, states: List[BoundaryState]) -> 'BoundaryBatch':
+        """Stack states of equal dimensionality into columns."""
+        return cls(
+            entropy_gradient=np.array([s.entropy_gradient for s in states], dtype=np.float64),
+            normal_vector=np.array([s.normal_vector for s in states], dtype=np.float64),
+            information_flux=np.array([s.information_flux for s in states], dtype=np.float64),
+            decoherence_rate=np.array([s.decoherence_rate for s in states], dtype=np.float64),
+            phi_integrated=np.array([s.phi_integrated for s in states], dtype=np.float64),
+            timestamp=np.array([s.timestamp for s in states], dtype=np.float64)
+        )
+    
+    def state(self, index: int) -> BoundaryState:
+        """Materialize one frame as a BoundaryState."""
+        return BoundaryState(
+            entropy_gradient=self.entropy_gradient[index],
+            normal_vector=self.normal_vector[index],
+            information_flux=float(self.information_flux[index]),
+            decoherence_rate=float(self.decoherence_rate[index]),
+            phi_integrated=float(self.phi_integrated[index]),
+            timestamp=float(self.timestamp[index])
+        )
+    
+    def states(self) -> List[BoundaryState]:
+        """Materialize every frame as a BoundaryState."""
+        return [self.state(i) for i in range(len(self))]
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary of columns for serialization."""
+        return {
+            'entropy_gradient': self.entropy_gradient.tolist(),
+            'normal_vector': self.normal_vector.tolist(),
+            'information_flux': self.information_flux.tolist(),
+            'decoherence_rate': self.decoherence_rate.tolist(),
+            'phi_integrated': self.phi_integrated.tolist(),
+            'timestamp': self.timestamp.tolist()
+        }
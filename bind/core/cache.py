@@ -0,0 +1,238 @@
+"""
+Content-addressed result cache for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from collections import OrderedDict
+import hashlib
+import io
+import numpy as np
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from ..config import BoundaryConfig
+
+
+Payload = Dict[str, np.ndarray]
+
+# Config fields a cached product depends on. The local-entropy map does
+# not depend on boundary detection, so it is shared across those settings.
+ENTROPY_FIELDS = ('entropy_window_size', 'entropy_bins', 'entropy_calculation_method',
+                  'renyi_alpha', 'epsilon', 'dtype')
+ANALYSIS_FIELDS = ENTROPY_FIELDS + ('boundary_detection_method', 'threshold_method',
+                                    'threshold_bins', 'threshold_sample_size',
+                                    'threshold_seed')
+
+
+def array_digest(data: np.ndarray) -> bytes:
+    """BLAKE2b digest of an array's bytes, shape and dtype."""
+    data = np.ascontiguousarray(data)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((data.shape, data.dtype.str)).encode())
+    h.update(memoryview(data).cast('B'))
+    return h.digest()
+
+
+def cache_key(kind: str, digest: bytes, config: BoundaryConfig,
+              fields: Sequence[str]) -> str:
+    """Key for product ``kind`` of the array with ``digest`` under ``config``."""
+    h = hashlib.blake2b(digest, digest_size=16)
+    h.update(kind.encode())
+    h.update(repr([(name, getattr(config, name)) for name in fields]).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of analysis products, keyed by content.
+
+    Entries are dicts of arrays. The memory tier is an LRU bounded by
+    ``max_bytes`` of array data; with a ``path`` a SQLite file backs it,
+    so entries survive restarts and a memory miss that hits on disk is
+    promoted back into memory. Stored arrays are read-only.
+
+    The disk tier is an LRU too, bounded by ``max_disk_bytes`` of encoded
+    entries (None: unbounded). Entries are stamped when written or read
+    from disk; once over budget, the least recently stamped entries not
+    held in the memory tier are deleted until the tier is back under
+    90% of the budget, so trimming runs once per many writes.
+
+    ``hits``, ``misses``, ``disk_hits``, ``evictions`` and
+    ``disk_evictions`` count lookups since creation; ``info()`` returns
+    them with the current sizes.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, path: Optional[str] = None,
+                 max_disk_bytes: Optional[int] = None):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        if max_disk_bytes is not None and max_disk_bytes < 0:
+            raise ValueError("max_disk_bytes must be non-negative")
+
+        self.max_bytes = int(max_bytes)
+        self.max_disk_bytes = None if max_disk_bytes is None else int(max_disk_bytes)
+        self.path = path
+        self._memory: 'OrderedDict[str, Payload]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.nbytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        self._db = None
+        self.disk_nbytes = 0
+        self.disk_entries = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS entries '
+                             '(key TEXT PRIMARY KEY, value BLOB, nbytes INTEGER, created REAL, '
+                             'used REAL)')
+            columns = {row[1] for row in self._db.execute('PRAGMA table_info(entries)')}
+            if 'used' not in columns:  # Files written before the disk tier had a budget
+                self._db.execute('ALTER TABLE entries ADD COLUMN used REAL')
+                self._db.execute('UPDATE entries SET used = created')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_used ON entries (used)')
+            self.disk_nbytes, self.disk_entries = self._db.execute(
+                'SELECT COALESCE(SUM(LENGTH(value)), 0), COUNT(*) FROM entries').fetchone()
+            self._trim_disk()
+            self._db.commit()
+
+    @staticmethod
+    def _encode(payload: Payload) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(buffer, **payload)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _decode(blob: bytes) -> Payload:
+        with np.load(io.BytesIO(blob)) as archive:
+            return {name: archive[name] for name in archive.files}
+
+    def _remember(self, key: str, payload: Payload) -> None:
+        """Insert into the memory tier, evicting least recently used entries."""
+        size = sum(value.nbytes for value in payload.values())
+        if size > self.max_bytes:
+            return
+
+        if key in self._memory:
+            self.nbytes -= self._sizes[key]
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        self._sizes[key] = size
+        self.nbytes += size
+
+        while self.nbytes > self.max_bytes:
+            old, _ = self._memory.popitem(last=False)
+            self.nbytes -= self._sizes.pop(old)
+            self.evictions += 1
+
+    def _trim_disk(self) -> None:
+        """Delete least recently used disk entries once over budget."""
+        if self.max_disk_bytes is None or self.disk_nbytes <= self.max_disk_bytes:
+            return
+
+        target = 0.9 * self.max_disk_bytes
+        doomed = []
+        for key, size in self._db.execute(
+                'SELECT key, LENGTH(value) FROM entries ORDER BY used'):
+            if self.disk_nbytes <= target:
+                break
+            if key in self._memory:
+                continue
+            doomed.append((key,))
+            self.disk_nbytes -= size
+            self.disk_entries -= 1
+        self._db.executemany('DELETE FROM entries WHERE key = ?', doomed)
+        self.disk_evictions += len(doomed)
+
+    def get(self, key: str) -> Optional[Payload]:
+        """Cached payload for ``key``, or None."""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return payload
+
+            if self._db is not None:
+                row = self._db.execute('SELECT value FROM entries WHERE key = ?',
+                                       (key,)).fetchone()
+                if row is not None:
+                    self._db.execute('UPDATE entries SET used = ? WHERE key = ?',
+                                     (time.time(), key))
+                    self._db.commit()
+                    payload = self._decode(row[0])
+                    for value in payload.values():
+                        value.flags.writeable = False
+                    self._remember(key, payload)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return payload
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, payload: Payload) -> None:
+        """Store ``payload`` (arrays are copied and made read-only)."""
+        payload = {name: np.array(value) for name, value in payload.items()}
+        for value in payload.values():
+            value.flags.writeable = False
+
+        with self._lock:
+            self._remember(key, payload)
+            if self._db is not None:
+                blob = self._encode(payload)
+                old = self._db.execute('SELECT LENGTH(value) FROM entries WHERE key = ?',
+                                       (key,)).fetchone()
+                if old is not None:
+                    self.disk_nbytes -= old[0]
+                    self.disk_entries -= 1
+                now = time.time()
+                self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                                 (key, blob, sum(value.nbytes for value in payload.values()),
+                                  now, now))
+                self.disk_nbytes += len(blob)
+                self.disk_entries += 1
+                self._trim_disk()
+                self._db.commit()
+
+    def clear(self, disk: bool = False) -> None:
+        """Empty the memory tier (and the disk tier if ``disk``)."""
+        with self._lock:
+            self._memory.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            if disk and self._db is not None:
+                self._db.execute('DELETE FROM entries')
+                self._db.commit()
+                self.disk_nbytes = self.disk_entries = 0
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def info(self) -> Dict[str, int]:
+        """Hit/miss counters and current memory usage."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+            'disk_evictions': self.disk_evictions,
+            'entries': len(self._memory),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'disk_entries': self.disk_entries,
+            'disk_nbytes': self.disk_nbytes,
+            'max_disk_bytes': self.max_disk_bytes,
+        }
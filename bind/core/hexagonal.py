@@ -0,0 +1,445 @@
+"""
+Hexagonal-lattice boundary analysis for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from collections import OrderedDict
+import numpy as np
+from numpy.typing import DTypeLike
+import threading
+import time
+from typing import Callable, Optional, Sequence, Tuple
+
+from .boundary_state import BoundaryBatch, BoundaryState
+from .cache import ANALYSIS_FIELDS
+from .entropy import EntropyBackend, RenyiEntropy, ShannonEntropy, _fix_bins
+from .instrumentation import StageTimer
+from .monitor import BoundaryMonitor
+from .sparse import SparseMask
+
+
+# Axial (dq, dr) offsets of the nearest ring, then of the "diagonal" ring
+# at distance sqrt(3) that hex_connectivity=12 adds
+_NEAREST = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+_DIAGONAL = ((2, -1), (1, -2), (-1, -1), (-2, 1), (-1, 2), (1, 1))
+_OFFSETS = {6: _NEAREST, 12: _NEAREST + _DIAGONAL}
+
+# Cells per chunk when gathering entropy neighbourhoods (bounds memory)
+_CHUNK_CELLS = 2**16
+
+# Bytes of cached grids kept for reuse (a 12-neighbour grid costs about
+# 80 bytes per cell, so one 1024 x 1024 grid fits)
+_GRID_CACHE_BYTES = 128 * 2**20
+_grids: 'OrderedDict[Tuple, HexGrid]' = OrderedDict()
+_grids_lock = threading.Lock()
+
+
+def _cartesian(dq: np.ndarray, dr: np.ndarray) -> np.ndarray:
+    """(y, x) displacement of axial offsets, unit distance between neighbours."""
+    return np.stack([np.sqrt(3) / 2 * dr, dq + dr / 2])
+
+
+class HexGrid:
+    """
+    Cells of a pointy-top hexagonal lattice in axial coordinates.
+
+    ``q`` and ``r`` hold the axial coordinates of the N cells in storage
+    order; a field on the grid is a length-N array (or, for rectangles, a
+    (rows, cols) array in odd-r offset layout, read row by row). The
+    neighbour index arrays are built once: ``neighbors[k]`` is the flat
+    index of every cell's k-th neighbour, with cells on the edge of the
+    grid standing in for missing neighbours (like edge padding on the
+    square grid).
+
+    Use ``hex_rectangle`` and ``hex_hexagon``, which reuse recently built
+    grids (see ``clear_hex_grids``).
+
+    Attributes:
+        q, r: Axial coordinates of the cells, shape (N,)
+        shape: Array shape fields on this grid are given in
+        connectivity: Neighbours per cell (6, or 12 with the diagonal ring)
+        neighbors: Neighbour flat indices, shape (connectivity, N)
+        displacements: (y, x) offset of each neighbour, shape (2, connectivity)
+    """
+
+    def __init__(self, q: np.ndarray, r: np.ndarray, shape: Tuple[int, ...],
+                 connectivity: int = 6):
+        if connectivity not in _OFFSETS:
+            raise ValueError("hex connectivity must be 6 or 12")
+
+        self.q = np.asarray(q, dtype=np.int64)
+        self.r = np.asarray(r, dtype=np.int64)
+        self.shape = tuple(shape)
+        self.connectivity = connectivity
+        self.size = len(self.q)
+        self.index_dtype = np.int32 if self.size < 2**31 else np.int64
+
+        # Flat index of every axial position in the bounding box (-1: none)
+        self._q0, self._r0 = int(self.q.min()), int(self.r.min())
+        box = (int(self.r.max()) - self._r0 + 1, int(self.q.max()) - self._q0 + 1)
+        self._lookup = np.full(box, -1, dtype=self.index_dtype)
+        self._lookup[self.r - self._r0, self.q - self._q0] = np.arange(self.size)
+
+        offsets = np.array(_OFFSETS[connectivity])
+        self.displacements = _cartesian(offsets[:, 0], offsets[:, 1])
+        self.neighbors = self.gather_indices(offsets, 0, self.size)
+
+        # For isotropic stencils sum_k d_k d_k^T = (sum_k |d_k|^2 / 2) I
+        self._moment = float(np.sum(self.displacements ** 2) / 2)
+
+    def gather_indices(self, offsets: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """
+        Flat indices of cells ``[start, stop)`` shifted by axial ``offsets``.
+
+        Returns:
+            Array of shape (len(offsets), stop - start); shifts that leave
+            the grid clamp to the nearest cell along the shift
+        """
+        q, r = self.q[start:stop], self.r[start:stop]
+        own = np.arange(start, stop, dtype=self.index_dtype)
+        out = np.empty((len(offsets), stop - start), dtype=self.index_dtype)
+        for k, (dq, dr) in enumerate(offsets):
+            out[k] = self._clamped(q, r, dq, dr, own)
+        return out
+
+    def _find(self, q: np.ndarray, r: np.ndarray) -> np.ndarray:
+        """Flat index of the cells at axial (q, r), -1 where there is none."""
+        rows, cols = self._lookup.shape
+        row, col = r - self._r0, q - self._q0
+        inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+        found = self._lookup.ravel().take(np.where(inside, row * cols + col, 0))
+        found[~inside] = -1
+        return found
+
+    def _clamped(self, q: np.ndarray, r: np.ndarray, dq: int, dr: int,
+                 own: np.ndarray) -> np.ndarray:
+        """Index of (q + dq, r + dr), backing off along the shift when off-grid."""
+        result = self._find(q + dq, r + dr)
+        missing = np.flatnonzero(result < 0)
+
+        # Shrink the shift towards the cell, one lattice step at a time
+        steps = max(abs(dq), abs(dr), abs(dq + dr))
+        for step in range(steps - 1, 0, -1):
+            if missing.size == 0:
+                break
+            found = self._find(q[missing] + round(dq * step / steps),
+                               r[missing] + round(dr * step / steps))
+            result[missing] = found
+            missing = missing[found < 0]
+        result[missing] = own[missing]
+        return result
+
+    def disk(self, radius: int) -> np.ndarray:
+        """Axial offsets of the hexagonal neighbourhood of ``radius`` rings."""
+        offsets = [(dq, dr) for dq in range(-radius, radius + 1)
+                   for dr in range(-radius, radius + 1) if abs(dq + dr) <= radius]
+        return np.array(offsets, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the coordinate, lookup and neighbour arrays."""
+        return self.q.nbytes + self.r.nbytes + self._lookup.nbytes + self.neighbors.nbytes
+
+    def centers(self) -> np.ndarray:
+        """(y, x) position of every cell, shape (2, N)."""
+        return _cartesian(self.q, self.r)
+
+    # Gather-based kernels; ``values`` is a length-N field
+
+    def differences(self, values: np.ndarray) -> np.ndarray:
+        """Neighbour minus cell, shape (connectivity, N)."""
+        return values[self.neighbors] - values
+
+    def smooth(self, values: np.ndarray, sigma: float = 1.0, passes: int = 4) -> np.ndarray:
+        """
+        Gaussian-like smoothing with variance ``sigma**2`` per axis, as
+        ``passes`` repetitions of a centre-plus-neighbours stencil.
+        """
+        weight = sigma * sigma / passes / self._moment
+        for _ in range(passes):
+            values = values + weight * self.differences(values).sum(axis=0)
+        return values
+
+    def gradient(self, values: np.ndarray) -> np.ndarray:
+        """Least-squares (y, x) gradient from neighbour differences, shape (2, N)."""
+        return self.displacements @ self.differences(values) / self._moment
+
+    def laplacian(self, values: np.ndarray) -> np.ndarray:
+        """Laplacian from neighbour differences."""
+        return self.differences(values).sum(axis=0) * (2 / self._moment)
+
+
+def _cached_grid(key: Tuple, build: Callable[[], HexGrid]) -> HexGrid:
+    """
+    Grid for ``key`` from the cache, built on a miss. The least recently
+    used grids are dropped once the cache holds more than
+    ``_GRID_CACHE_BYTES``; a grid larger than that is not kept at all.
+    """
+    with _grids_lock:
+        grid = _grids.pop(key, None)
+    if grid is None:
+        grid = build()
+    if grid.nbytes > _GRID_CACHE_BYTES:
+        return grid
+
+    with _grids_lock:
+        _grids[key] = grid
+        total = sum(cached.nbytes for cached in _grids.values())
+        while total > _GRID_CACHE_BYTES:
+            _, dropped = _grids.popitem(last=False)
+            total -= dropped.nbytes
+    return grid
+
+
+def clear_hex_grids() -> None:
+    """Drop every cached grid, releasing its neighbour index arrays."""
+    with _grids_lock:
+        _grids.clear()
+
+
+def hex_rectangle(rows: int, cols: int, connectivity: int = 6) -> HexGrid:
+    """
+    Rectangular ``rows`` x ``cols`` grid in odd-r offset layout: odd rows
+    are shifted half a cell to the right, so a (rows, cols) array can be
+    analyzed as is.
+    """
+    def build() -> HexGrid:
+        row, col = np.divmod(np.arange(rows * cols), cols)
+        return HexGrid(col - (row - (row & 1)) // 2, row, (rows, cols), connectivity)
+
+    return _cached_grid(('rectangle', rows, cols, connectivity), build)
+
+
+def hex_hexagon(size: int, connectivity: int = 6) -> HexGrid:
+    """
+    Hexagon-shaped board with ``size`` cells per side (3 size^2 - 3 size + 1
+    cells), stored row by row.
+    """
+    def build() -> HexGrid:
+        radius = size - 1
+        r, q = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+        inside = np.abs(q + r) <= radius
+        return HexGrid(q[inside], r[inside], (int(inside.sum()),), connectivity)
+
+    return _cached_grid(('hexagon', size, connectivity), build)
+
+
+def hex_local_entropy(grid: HexGrid, values: np.ndarray, radius: int = 2,
+                      bins: int = 10, backend: Optional[EntropyBackend] = None,
+                      dtype: DTypeLike = float) -> np.ndarray:
+    """
+    Entropy of the hexagonal neighbourhood of ``radius`` rings around
+    every cell, binned over each neighbourhood's own range exactly like
+    ``window_bin_counts`` (including its correction for samples on a bin
+    edge, so quantized values match ``np.histogram``). Cells are processed
+    in chunks, each one a gather of (neighbourhood, chunk) values.
+
+    Backends returning several maps (e.g. ``RenyiEntropy`` with a sequence
+    of orders) give an array of shape ``(maps, cells)``.
+    """
+    backend = backend or ShannonEntropy()
+    values = np.asarray(values, dtype=dtype)
+    offsets = grid.disk(radius)
+    count_dtype = np.min_scalar_type(len(offsets))
+    tolerance = 64 * np.finfo(values.dtype).eps * bins
+    chunks = []
+
+    for start in range(0, grid.size, _CHUNK_CELLS):
+        stop = min(start + _CHUNK_CELLS, grid.size)
+        window = values[grid.gather_indices(offsets, start, stop)]
+
+        lo, hi = window.min(axis=0), window.max(axis=0)
+        span = hi - lo
+        scale = np.divide(bins, span, out=np.zeros_like(span), where=span > 0)
+        step = span / bins
+
+        # One-hot counts, one neighbourhood member at a time
+        counts = np.zeros((bins, stop - start), dtype=count_dtype)
+        for member in window:
+            position = (member - lo) * scale
+            index = np.floor(position)
+            # Samples whose scaled position is near an integer may sit on
+            # either side of the edge: check them against the edge itself
+            near = np.abs(position - index - 0.5) > 0.5 - tolerance
+            near &= (member != lo) & (member != hi)
+            np.minimum(index, bins - 1, out=index)
+            candidates = np.flatnonzero(near)
+            if len(candidates):
+                _fix_bins(index, member[candidates], candidates, lo, step, bins - 1)
+
+            position = index.astype(np.min_scalar_type(bins))
+            for b in range(bins):
+                counts[b] += position == b
+        chunks.append(backend.from_counts(counts, dtype))
+    return np.concatenate(chunks, axis=-1)
+
+
+class HexBoundaryMonitor(BoundaryMonitor):
+    """
+    Boundary monitor for fields sampled on a hexagonal lattice.
+
+    Fields are given either as a (rows, cols) array in odd-r offset layout
+    or, for the hexagon-shaped board of ``config.hex_grid_size`` cells per
+    side, as a flat array of its cells; any other layout can pass its own
+    ``HexGrid``. Neighbourhoods follow ``config.hex_connectivity``.
+
+    Every stage runs on gathers over the grid's neighbour index arrays:
+    smoothing, least-squares gradients and the Laplacian for detection,
+    hexagonal neighbourhoods of ``entropy_window_size // 2`` rings for
+    local entropy. Vector quantities are reported as (y, x) with y along
+    the rows, so a field sampled on both lattices gives a state comparable
+    to ``BoundaryMonitor`` on the square grid.
+
+    ``local_entropy``, ``entropy_spectrum`` and ``analyze_batch`` (and so
+    ``analyze_parallel``) run on the same hexagonal path. The square-grid
+    helpers (``analyze_tiled``, ``analyze_regions``, ``analyze_pyramid``)
+    reject this monitor.
+    """
+
+    def grid_for(self, data: np.ndarray) -> HexGrid:
+        """Grid a field of this shape lives on (see class docstring)."""
+        connectivity = self.config.hex_connectivity
+        if data.ndim == 2:
+            return hex_rectangle(data.shape[0], data.shape[1], connectivity)
+        board = hex_hexagon(self.config.hex_grid_size, connectivity)
+        if data.shape == board.shape:
+            return board
+        raise ValueError(f"No hexagonal grid for data of shape {data.shape}: pass a "
+                         f"(rows, cols) array, {board.size} board cells or a HexGrid")
+
+    def local_entropy(self, data: np.ndarray, digest: Optional[bytes] = None,
+                      grid: Optional[HexGrid] = None) -> np.ndarray:
+        """
+        Local entropy over hexagonal neighbourhoods, in the layout of
+        ``data``. Maps are not cached; ``digest`` is accepted for
+        signature compatibility.
+        """
+        data = np.asarray(data, dtype=self.dtype)
+        grid = grid or self.grid_for(data)
+        return hex_local_entropy(
+            grid, data.ravel(),
+            radius=self.config.entropy_window_size // 2,
+            bins=self.config.entropy_bins,
+            backend=self.entropy_backend,
+            dtype=self.dtype,
+        ).reshape(data.shape)
+
+    def _cached_fields(self) -> Optional[Tuple[str, ...]]:
+        """The lattice is part of what a cached state depends on."""
+        return ANALYSIS_FIELDS + ('hex_connectivity', 'hex_grid_size')
+
+    def entropy_spectrum(self, data: np.ndarray, alphas: Sequence[float],
+                         grid: Optional[HexGrid] = None) -> np.ndarray:
+        """
+        Local Rényi entropy maps of several orders over hexagonal
+        neighbourhoods, stacked along axis 0, from a single binning pass.
+        """
+        data = np.asarray(data, dtype=self.dtype)
+        grid = grid or self.grid_for(data)
+        return hex_local_entropy(
+            grid, data.ravel(),
+            radius=self.config.entropy_window_size // 2,
+            bins=self.config.entropy_bins,
+            backend=RenyiEntropy(alphas, self.config.epsilon),
+            dtype=self.dtype,
+        ).reshape((len(alphas),) + data.shape)
+
+    def analyze_batch(self, stack: np.ndarray,
+                      grid: Optional[HexGrid] = None) -> BoundaryBatch:
+        """
+        Analyze a stack of frames (leading axis) one frame at a time.
+
+        Args:
+            stack: Frames of shape (T, rows, cols) or (T, board cells)
+            grid: Lattice to use instead of the one inferred from the shape
+
+        Returns:
+            BoundaryBatch with one row per frame
+        """
+        stack = np.asarray(stack)
+        if stack.ndim < 2:
+            raise ValueError("analyze_batch expects a stack of frames (T, ...)")
+
+        grid = grid or self.grid_for(stack[0])
+        timestamp = time.time()
+        return BoundaryBatch.from_states([self.analyze_system(frame, timestamp, grid)
+                                          for frame in stack])
+
+    def analyze_system(self, data: np.ndarray,
+                       timestamp: Optional[float] = None,
+                       grid: Optional[HexGrid] = None) -> BoundaryState:
+        """
+        Analyze a field on a hexagonal lattice.
+
+        Cache, instrumentation, mask history and recording hooks run as in
+        ``BoundaryMonitor.analyze_system``; states of frames on a custom
+        ``grid`` are not cached.
+
+        Args:
+            data: Field values (see class docstring for layouts)
+            timestamp: When the state was captured (default: now)
+            grid: Lattice to use instead of the one inferred from the shape
+
+        Returns:
+            BoundaryState with 2-component (y, x) vectors
+        """
+        return self._analyze(data, timestamp, cacheable=grid is None, grid=grid)
+
+    def _measure(self, data: np.ndarray, timestamp: float, digest: Optional[bytes],
+                 timer: Optional[StageTimer],
+                 grid: Optional[HexGrid] = None) -> Tuple[BoundaryState, SparseMask]:
+        """Boundary state and mask of one field, on gathers over ``grid``."""
+        grid = grid or self.grid_for(data)
+        values = data.ravel()
+        if values.size != grid.size:
+            raise ValueError(f"Grid has {grid.size} cells, data has {values.size}")
+
+        # Detection on the smoothed field
+        smoothed = grid.smooth(values)
+        gradients = grid.gradient(smoothed)
+        if self.config.boundary_detection_method == "gradient":
+            strength = np.sqrt(np.einsum('ij,ij->j', gradients, gradients))
+        else:  # laplacian
+            strength = np.abs(grid.laplacian(smoothed))
+        boundaries = SparseMask.from_dense(strength > self._boundary_threshold(strength))
+        if timer:
+            timer.lap('detection')
+
+        # Mean gradient of the local entropy map
+        local_entropy = self.local_entropy(values, grid=grid)
+        entropy_grad = grid.gradient(local_entropy).mean(axis=1, dtype=np.float64)
+        if timer:
+            timer.lap('entropy')
+
+        count = len(boundaries)
+        if count > 0:
+            avg_grad = np.array([boundaries.values(grad).sum(dtype=np.float64)
+                                 for grad in gradients]) / count
+            normal = avg_grad / (np.linalg.norm(avg_grad) + self.config.epsilon)
+        else:
+            normal = np.array([1.0, 0.0])
+        if timer:
+            timer.lap('normal')
+
+        decoherence = float(np.std(boundaries.values(values), dtype=np.float64)) if count else 0.0
+        if timer:
+            timer.lap('decoherence')
+
+        # Information flux: I(B) = ∇S · n̂
+        info_flux = np.abs(np.dot(entropy_grad, normal))
+        phi = float(self._phi_from_counts(info_flux, count, grid.size))
+        if timer:
+            timer.lap('phi')
+
+        state = BoundaryState(
+            entropy_gradient=entropy_grad,
+            normal_vector=normal,
+            information_flux=info_flux,
+            decoherence_rate=decoherence,
+            phi_integrated=phi,
+            timestamp=timestamp
+        )
+        # Masks are kept in the layout of ``data``
+        return state, SparseMask(boundaries.indices, data.shape)
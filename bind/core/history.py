@@ -0,0 +1,230 @@
+"""
+Bounded columnar history of boundary states for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import operator
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, List, Optional, Union
+
+from .boundary_state import BoundaryState, BoundaryBatch
+
+
+SCALAR_FIELDS = ('information_flux', 'decoherence_rate', 'phi_integrated', 'timestamp')
+VECTOR_FIELDS = ('entropy_gradient', 'normal_vector')
+# Short names accepted wherever a field name is (matching the properties)
+FIELD_ALIASES = {'phi': 'phi_integrated'}
+
+
+class BoundaryHistory:
+    """
+    Ring buffer of boundary states stored as one structured numpy array.
+
+    Rows are preallocated on the first append (when the dimensionality of
+    the vectors is known); appends are O(1) and, once ``capacity`` rows
+    are held, overwrite the oldest row. A state with more vector
+    components than the storage holds (a monitor reused from 2D to 3D
+    input) widens it once; shorter vectors are stored NaN-padded and
+    come back at their own length. Column accessors such as
+    ``history.phi`` return chronologically ordered arrays, and indexing
+    returns a ``BoundaryState`` for one row (a list of them for a slice,
+    so ``history[-n:]`` works as it did on a list of states).
+    """
+
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = int(capacity)
+        self._rows: Optional[np.ndarray] = None
+        self._next = 0  # Row the next append writes to
+        self._size = 0
+
+    @staticmethod
+    def _dtype(ndim: int) -> np.dtype:
+        """Structured row layout for states with ``ndim``-component vectors."""
+        return np.dtype([(name, np.float64, (ndim,)) for name in VECTOR_FIELDS]
+                        + [(name, np.float64) for name in SCALAR_FIELDS])
+
+    @classmethod
+    def _storage_dtype(cls, ndim: int) -> np.dtype:
+        """Row layout plus each state's own vector length."""
+        return np.dtype(cls._dtype(ndim).descr + [('ndim', np.int64)])
+
+    def _allocate(self, ndim: int) -> None:
+        """Allocate storage on first use, widening it for longer vectors."""
+        if self._rows is None:
+            self._rows = np.zeros(self.capacity, dtype=self._storage_dtype(ndim))
+        elif ndim > self.ndim:
+            rows = np.zeros(self.capacity, dtype=self._storage_dtype(ndim))
+            for name in SCALAR_FIELDS + ('ndim',):
+                rows[name] = self._rows[name]
+            for name in VECTOR_FIELDS:
+                rows[name] = np.nan
+                rows[name][:, :self.ndim] = self._rows[name]
+            self._rows = rows
+
+    def _padded(self, vectors: np.ndarray) -> np.ndarray:
+        """Vectors (last axis) NaN-padded to the storage width."""
+        missing = self.ndim - vectors.shape[-1]
+        if missing == 0:
+            return vectors
+        pad = [(0, 0)] * (vectors.ndim - 1) + [(0, missing)]
+        return np.pad(vectors, pad, constant_values=np.nan)
+
+    @property
+    def ndim(self) -> Optional[int]:
+        """
+        Vector components per stored row (None while empty): the largest
+        dimensionality appended so far.
+        """
+        if self._rows is None:
+            return None
+        return self._rows.dtype['normal_vector'].shape[0]
+
+    def append(self, state: BoundaryState) -> None:
+        """Record one state, evicting the oldest one when full."""
+        ndim = len(state.normal_vector)
+        self._allocate(ndim)
+
+        row = self._rows[self._next]
+        for name in VECTOR_FIELDS:
+            row[name] = self._padded(np.asarray(getattr(state, name), dtype=np.float64))
+        for name in SCALAR_FIELDS:
+            row[name] = getattr(state, name)
+        row['ndim'] = ndim
+
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, batch: BoundaryBatch) -> None:
+        """Record a batch of states in one vectorized write."""
+        n = len(batch)
+        if n == 0:
+            return
+        ndim = batch.normal_vector.shape[1]
+        self._allocate(ndim)
+
+        # Only the last ``capacity`` rows of the batch can survive
+        skip = max(n - self.capacity, 0)
+        positions = (self._next + skip + np.arange(n - skip)) % self.capacity
+        for name in VECTOR_FIELDS:
+            self._rows[name][positions] = self._padded(getattr(batch, name)[skip:])
+        for name in SCALAR_FIELDS:
+            self._rows[name][positions] = getattr(batch, name)[skip:]
+        self._rows['ndim'][positions] = ndim
+
+        self._next = (self._next + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def clear(self) -> None:
+        """Forget all recorded states (storage is kept)."""
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _order(self) -> Union[slice, np.ndarray]:
+        """Storage positions of the held rows, oldest first."""
+        if self._size < self.capacity:
+            return slice(0, self._size)
+        return (self._next + np.arange(self.capacity)) % self.capacity
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Chronologically ordered copy of one field ('phi' is accepted).
+        Vector columns have ``ndim`` components, NaN beyond a state's own.
+        """
+        name = FIELD_ALIASES.get(name, name)
+        if self._rows is None:
+            if name in VECTOR_FIELDS:
+                return np.zeros((0, 0))
+            return np.zeros(0)
+        return self._rows[name][self._order()].copy()
+
+    @property
+    def entropy_gradient(self) -> np.ndarray:
+        """Entropy gradients, shape (n, ndim)."""
+        return self.column('entropy_gradient')
+
+    @property
+    def normal_vector(self) -> np.ndarray:
+        """Unit normal vectors, shape (n, ndim)."""
+        return self.column('normal_vector')
+
+    @property
+    def information_flux(self) -> np.ndarray:
+        """Information flux per state."""
+        return self.column('information_flux')
+
+    @property
+    def decoherence_rate(self) -> np.ndarray:
+        """Decoherence rate per state."""
+        return self.column('decoherence_rate')
+
+    @property
+    def phi(self) -> np.ndarray:
+        """Integrated information Φ per state."""
+        return self.column('phi_integrated')
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        """Measurement time per state."""
+        return self.column('timestamp')
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BoundaryState, List[BoundaryState]]:
+        """
+        State ``index`` in chronological order (negative counts from newest),
+        or the list of states selected by a slice.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        index = operator.index(index)
+        if not -self._size <= index < self._size:
+            raise IndexError("history index out of range")
+
+        index %= self._size
+        if self._size == self.capacity:
+            index = (self._next + index) % self.capacity
+
+        row = self._rows[index]
+        ndim = int(row['ndim'])
+        return BoundaryState(
+            entropy_gradient=row['entropy_gradient'][:ndim].copy(),
+            normal_vector=row['normal_vector'][:ndim].copy(),
+            information_flux=float(row['information_flux']),
+            decoherence_rate=float(row['decoherence_rate']),
+            phi_integrated=float(row['phi_integrated']),
+            timestamp=float(row['timestamp'])
+        )
+
+    def __iter__(self) -> Iterator[BoundaryState]:
+        for i in range(self._size):
+            yield self[i]
+
+    def to_batch(self) -> BoundaryBatch:
+        """All held states as a columnar BoundaryBatch."""
+        return BoundaryBatch(**{name: self.column(name)
+                                for name in VECTOR_FIELDS + SCALAR_FIELDS})
+
+    def rolling_mean(self, name: str, window: int) -> np.ndarray:
+        """Mean of a scalar field over each run of ``window`` consecutive states."""
+        return self._rolling(name, window).mean(axis=-1)
+
+    def rolling_std(self, name: str, window: int) -> np.ndarray:
+        """Standard deviation of a scalar field over each run of ``window`` states."""
+        return self._rolling(name, window).std(axis=-1)
+
+    def _rolling(self, name: str, window: int) -> np.ndarray:
+        """Sliding windows (views) over a scalar field ('phi' is accepted)."""
+        name = FIELD_ALIASES.get(name, name)
+        if name not in SCALAR_FIELDS:
+            raise ValueError(f"Rolling statistics need a scalar field, got {name!r}")
+        values = self.column(name)
+        if not 0 < window <= len(values):
+            return np.zeros((0, max(window, 0)))
+        return sliding_window_view(values, window)
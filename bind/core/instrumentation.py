@@ -0,0 +1,241 @@
+"""
+Opt-in per-stage instrumentation for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+import numpy as np
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+STAGES = ('cache', 'detection', 'entropy', 'normal', 'decoherence', 'phi')
+
+
+@dataclass
+class FrameRecord:
+    """Timings and metadata for one ``analyze_system`` / ``analyze_batch`` call."""
+    timestamp: float
+    shape: Tuple[int, ...]
+    dtype: str
+    frames: int  # 1 for analyze_system, the stack length for analyze_batch
+    boundary_pixels: int
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    cache_hits: int = 0  # Frames served from the result cache
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.stage_seconds.values())
+
+    def to_dict(self) -> Dict:
+        """Plain-Python representation (e.g. for JSON logs)."""
+        return {
+            'timestamp': self.timestamp,
+            'shape': list(self.shape),
+            'dtype': self.dtype,
+            'frames': self.frames,
+            'boundary_pixels': self.boundary_pixels,
+            'stage_seconds': dict(self.stage_seconds),
+            'total_seconds': self.total_seconds,
+            'cache_hits': self.cache_hits,
+        }
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one call.
+
+    ``lap(stage)`` charges the time since the previous lap (or since the
+    timer was created) to ``stage``; repeated laps of the same stage, e.g.
+    one per slab, add up.
+    """
+
+    def __init__(self, data: np.ndarray, frames: int = 1):
+        self.shape = tuple(data.shape)
+        self.dtype = str(data.dtype)
+        self.frames = frames
+        self.boundary_pixels = 0
+        self.cache_hits = 0
+        self.stage_seconds: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+class Instrumentation:
+    """
+    Per-stage timings of a monitor's recent calls.
+
+    Keeps the last ``capacity`` records, calls every registered callback
+    with each new ``FrameRecord`` and summarizes the records with
+    ``stats``. A monitor without instrumentation skips all of this; the
+    only cost left in the hot path is a ``None`` check per stage.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.records: deque = deque(maxlen=int(capacity))
+        self.callbacks: List[Callable[[FrameRecord], None]] = []
+
+    def start(self, data: np.ndarray, frames: int = 1) -> StageTimer:
+        """Timer for one call on ``data``."""
+        return StageTimer(data, frames)
+
+    def finish(self, timer: StageTimer, timestamp: float) -> FrameRecord:
+        """Store the timer's record and hand it to the callbacks."""
+        record = FrameRecord(
+            timestamp=timestamp,
+            shape=timer.shape,
+            dtype=timer.dtype,
+            frames=timer.frames,
+            boundary_pixels=int(timer.boundary_pixels),
+            stage_seconds=timer.stage_seconds,
+            cache_hits=timer.cache_hits,
+        )
+        self.records.append(record)
+        for callback in self.callbacks:
+            callback(record)
+        return record
+
+    def add_callback(self, callback: Callable[[FrameRecord], None]) -> None:
+        """Call ``callback(record)`` after every instrumented call."""
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[FrameRecord], None]) -> None:
+        self.callbacks.remove(callback)
+
+    def export_prometheus(self, path: str, interval: float = 10.0) -> 'PrometheusExporter':
+        """Register a ``PrometheusExporter`` writing to ``path``."""
+        exporter = PrometheusExporter(self, path, interval)
+        self.add_callback(exporter)
+        return exporter
+
+    def clear(self) -> None:
+        self.records.clear()
+
+    def slowest(self, n: int = 5) -> List[FrameRecord]:
+        """The ``n`` records with the longest per-frame time, slowest first."""
+        return sorted(self.records, key=lambda r: r.total_seconds / r.frames,
+                      reverse=True)[:n]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-frame summary of every stage, the total and the boundary pixels.
+
+        Each entry holds ``count``, ``mean``, ``p50``, ``p95``, ``p99`` and
+        ``max``. Batch records count as their per-frame average, so batch
+        and single-frame calls can be mixed.
+        """
+        if not self.records:
+            return {}
+
+        frames = np.array([r.frames for r in self.records], dtype=np.float64)
+        columns = {stage: np.array([r.stage_seconds.get(stage, 0.0) for r in self.records])
+                   for stage in STAGES}
+        columns['total'] = np.array([r.total_seconds for r in self.records])
+        columns = {name: values / frames for name, values in columns.items()}
+        columns['boundary_pixels'] = np.array(
+            [r.boundary_pixels for r in self.records]) / frames
+
+        summary = {}
+        for name, values in columns.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            summary[name] = {
+                'count': int(values.size),
+                'mean': float(values.mean()),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(values.max()),
+            }
+        return summary
+
+
+class PrometheusExporter:
+    """
+    Writes instrumentation stats as a Prometheus text-format file.
+
+    Meant for the node_exporter textfile collector: the file is replaced
+    atomically at most once per ``interval`` seconds (call ``write()`` to
+    force it). Stage timings are exported as summaries with quantiles
+    over the records held, plus running ``_sum``/``_count`` totals over
+    every record seen.
+    """
+
+    def __init__(self, instrumentation: Instrumentation, path: str,
+                 interval: float = 10.0):
+        self.instrumentation = instrumentation
+        self.path = path
+        self.interval = interval
+        self._last_write = -np.inf
+        self._seconds = {stage: 0.0 for stage in STAGES}
+        self._frames = 0
+        self._calls = 0
+        self._cache_hits = 0
+        self._last: Optional[FrameRecord] = None
+
+    def __call__(self, record: FrameRecord) -> None:
+        for stage, seconds in record.stage_seconds.items():
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+        self._frames += record.frames
+        self._calls += 1
+        self._cache_hits += record.cache_hits
+        self._last = record
+
+        if time.monotonic() - self._last_write >= self.interval:
+            self.write()
+
+    def render(self) -> str:
+        """The current metrics in Prometheus text format."""
+        stats = self.instrumentation.stats()
+        lines = [
+            '# HELP bind_stage_seconds Per-frame time spent in each analysis stage.',
+            '# TYPE bind_stage_seconds summary',
+        ]
+        for stage in STAGES:
+            for q in ('p50', 'p95', 'p99'):
+                if stage in stats:
+                    quantile = int(q[1:]) / 100
+                    lines.append(f'bind_stage_seconds{{stage="{stage}",quantile="{quantile}"}} '
+                                 f'{stats[stage][q]:.9g}')
+            lines.append(f'bind_stage_seconds_sum{{stage="{stage}"}} {self._seconds[stage]:.9g}')
+            lines.append(f'bind_stage_seconds_count{{stage="{stage}"}} {self._frames}')
+
+        lines += [
+            '# HELP bind_frames_total Frames analyzed.',
+            '# TYPE bind_frames_total counter',
+            f'bind_frames_total {self._frames}',
+            '# HELP bind_calls_total Instrumented analyze calls.',
+            '# TYPE bind_calls_total counter',
+            f'bind_calls_total {self._calls}',
+            '# HELP bind_cache_hits_total Frames served from the result cache.',
+            '# TYPE bind_cache_hits_total counter',
+            f'bind_cache_hits_total {self._cache_hits}',
+        ]
+        if self._last is not None:
+            lines += [
+                '# HELP bind_boundary_pixels Boundary pixels per frame in the last call.',
+                '# TYPE bind_boundary_pixels gauge',
+                f'bind_boundary_pixels {self._last.boundary_pixels / self._last.frames:.9g}',
+                '# HELP bind_frame_size Values per frame in the last call.',
+                '# TYPE bind_frame_size gauge',
+                f'bind_frame_size {int(np.prod(self._last.shape)) // self._last.frames}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        """Write the metrics file now (atomically, via a temporary file)."""
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp, self.path)
+        self._last_write = time.monotonic()
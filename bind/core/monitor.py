@@ -6,13 +6,24 @@ Date: July 2025
 """
 
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from scipy.stats import entropy
-from scipy.ndimage import laplace, gaussian_gradient_magnitude
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import time
 
 from ..config import BoundaryConfig
-from .boundary_state import BoundaryState
+from .boundary_state import BoundaryState, BoundaryBatch
+from .cache import ANALYSIS_FIELDS, ENTROPY_FIELDS, ResultCache, array_digest, cache_key
+from .history import BoundaryHistory
+from .instrumentation import Instrumentation, StageTimer
+from .recording import RecordingWriter
+from .sparse import MaskHistory, SparseMask, as_sparse_mask
+from .thresholds import make_threshold_strategy
+from .entropy import RenyiEntropy, make_entropy_backend
+from .workspace import DerivativeWorkspace
+
+
+# Gaussian derivative with sigma=1 reaches int(truncate * sigma + 0.5) = 4
+# rows (scipy's default truncate=4); the Laplacian only needs one
+_DERIVATIVE_HALO = 4
 
 
 class BoundaryMonitor:
@@ -25,35 +36,252 @@ class BoundaryMonitor:
     
     def __init__(self, config: Optional[BoundaryConfig] = None):
         self.config = config or BoundaryConfig()
-        self.history: List[BoundaryState] = []
+        self.history = BoundaryHistory(self.config.history_capacity)
+        self.threshold_strategy = make_threshold_strategy(self.config)
+        self.entropy_backend = make_entropy_backend(self.config)
+        self.dtype = np.dtype(self.config.dtype)
+        self.workspace = DerivativeWorkspace(self.config.workspace_max_bytes)
+        self.instrumentation: Optional[Instrumentation] = None
+        if self.config.instrumentation:
+            self.enable_instrumentation()
+        self.cache: Optional[ResultCache] = None
+        if self.config.cache_max_bytes > 0 or self.config.cache_path:
+            self.enable_cache(self.config.cache_max_bytes, self.config.cache_path or None,
+                              self.config.cache_disk_max_bytes or None)
+        self.masks: Optional[MaskHistory] = None
+        if self.config.record_masks:
+            self.enable_mask_history()
+        self.recording: Optional[RecordingWriter] = None
+        
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Start recording per-stage timings, boundary pixel counts and input
+        shape/dtype for every analyzed frame (see ``stats``).
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation(self.config.history_capacity)
+        return self.instrumentation
+    
+    def disable_instrumentation(self) -> None:
+        """Stop recording timings and drop the recorded ones."""
+        self.instrumentation = None
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-stage timing summary (count, mean, p50, p95, p99, max) over the
+        recorded frames; empty unless instrumentation is enabled.
+        """
+        if self.instrumentation is None:
+            return {}
+        return self.instrumentation.stats()
+    
+    def enable_cache(self, max_bytes: int = 256 * 2**20,
+                     path: Optional[str] = None,
+                     max_disk_bytes: Optional[int] = 2**30) -> ResultCache:
+        """
+        Cache results by content: re-analyzing an identical array (same
+        bytes, shape, dtype and relevant config) returns the stored state
+        instead of recomputing it. The local-entropy map is cached on its
+        own, so it is shared between detection settings.
+        
+        Args:
+            max_bytes: Budget of the in-memory LRU tier
+            path: Optional SQLite file for a persistent tier
+            max_disk_bytes: Budget of the persistent tier (None: unbounded)
+        """
+        self.cache = ResultCache(max_bytes, path, max_disk_bytes)
+        return self.cache
+    
+    def enable_mask_history(self, capacity: Optional[int] = None) -> MaskHistory:
+        """
+        Keep the boundary mask of every analyzed frame in compact form
+        (see ``MaskHistory``; ``masks.save`` persists them). Frames need
+        their mask computed, so state cache lookups are skipped while the
+        history is enabled.
+        """
+        if self.masks is None:
+            self.masks = MaskHistory(capacity or self.config.history_capacity)
+        return self.masks
+    
+    def enable_recording(self, path: str, chunk_frames: Optional[int] = None) -> RecordingWriter:
+        """
+        Record every analyzed frame and its state to the directory ``path``
+        (see ``RecordingWriter``; read it back with ``Recording``). Chunks
+        are written by a background thread; call ``disable_recording`` to
+        flush and close the recording.
+        """
+        if self.recording is None:
+            self.recording = RecordingWriter(path, self.config, chunk_frames)
+        return self.recording
+    
+    def disable_recording(self) -> None:
+        """Flush and close the recording, if any."""
+        if self.recording is not None:
+            recording, self.recording = self.recording, None
+            recording.close()
+    
+    def _cached_fields(self) -> Optional[Tuple[str, ...]]:
+        """Config fields a cached state depends on (None: not cacheable)."""
+        return ANALYSIS_FIELDS
+    
+    def local_entropy(self, data: np.ndarray, digest: Optional[bytes] = None) -> np.ndarray:
+        """
+        Local entropy map of ``data``, served from the cache when enabled.
+        
+        Cached maps are read-only.
+        """
+        data = np.asarray(data, dtype=self.dtype)
+        if self.cache is not None:
+            key = cache_key('local_entropy', digest or array_digest(data),
+                            self.config, ENTROPY_FIELDS)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached['local_entropy']
+        
+        local_entropy = self.entropy_backend.local_entropy(
+            data,
+            window_size=self.config.entropy_window_size,
+            bins=self.config.entropy_bins,
+            dtype=self.dtype,
+        )
+        if self.cache is not None:
+            self.cache.put(key, {'local_entropy': local_entropy})
+        return local_entropy
+    
+    def entropy_spectrum(self, data: np.ndarray, alphas: Sequence[float]) -> np.ndarray:
+        """
+        Local Rényi entropy maps of several orders, stacked along axis 0.
+        
+        All orders come from a single binning pass over ``data``; order 1
+        is the Shannon map.
+        """
+        backend = RenyiEntropy(alphas, self.config.epsilon)
+        return backend.local_entropy(
+            np.asarray(data, dtype=self.dtype),
+            window_size=self.config.entropy_window_size,
+            bins=self.config.entropy_bins,
+            dtype=self.dtype,
+        )
         
-    def analyze_system(self, data: np.ndarray) -> BoundaryState:
+    def analyze_system(self, data: np.ndarray,
+                       timestamp: Optional[float] = None) -> BoundaryState:
         """
         Analyze a system to find and characterize its boundaries.
         
         Args:
             data: System state as numpy array (any dimensionality)
+            timestamp: When the state was captured (default: now)
             
         Returns:
             BoundaryState with all computed metrics
         """
-        # Detect boundaries
-        boundaries = self._detect_boundaries(data)
+        return self._analyze(data, timestamp)
+    
+    def _analyze(self, data: np.ndarray, timestamp: Optional[float] = None,
+                 cacheable: bool = True, **options) -> BoundaryState:
+        """
+        Per-frame pipeline shared by every monitor.
+        
+        Looks the frame up in the cache, measures it with ``_measure``
+        (``options`` are passed through) and runs the instrumentation,
+        cache, mask history, recording and history hooks around it.
+        Subclasses change how a frame is measured, not these hooks.
+        """
+        data = np.asarray(data, dtype=self.dtype)
+        timestamp = time.time() if timestamp is None else timestamp
+        
+        timer = self.instrumentation and self.instrumentation.start(data)
+        
+        # Content-addressed lookup
+        digest, state_key = None, None
+        if self.cache is not None:
+            digest = array_digest(data)
+            fields = self._cached_fields()
+            if cacheable and fields is not None and self.masks is None:
+                state_key = cache_key('state', digest, self.config, fields)
+                cached = self.cache.get(state_key)
+                if cached is not None:
+                    state = BoundaryState(
+                        entropy_gradient=cached['entropy_gradient'].copy(),
+                        normal_vector=cached['normal_vector'].copy(),
+                        information_flux=float(cached['information_flux']),
+                        decoherence_rate=float(cached['decoherence_rate']),
+                        phi_integrated=float(cached['phi_integrated']),
+                        timestamp=timestamp
+                    )
+                    if timer:
+                        timer.lap('cache')
+                        timer.cache_hits = 1
+                        timer.boundary_pixels = int(cached.get('boundary_pixels', 0))
+                        self.instrumentation.finish(timer, timestamp)
+                    self.history.append(state)
+                    if self.recording is not None:
+                        self.recording.append(data, state)
+                    return state
+            if timer:
+                timer.lap('cache')
+        
+        state, boundaries = self._measure(data, timestamp, digest, timer, **options)
+        
+        if state_key is not None:
+            self.cache.put(state_key, {
+                'entropy_gradient': state.entropy_gradient,
+                'normal_vector': state.normal_vector,
+                'information_flux': np.float64(state.information_flux),
+                'decoherence_rate': np.float64(state.decoherence_rate),
+                'phi_integrated': np.float64(state.phi_integrated),
+                'boundary_pixels': np.int64(len(boundaries)),
+            })
+        
+        if timer:
+            timer.boundary_pixels = len(boundaries)
+            self.instrumentation.finish(timer, state.timestamp)
+        
+        if self.masks is not None:
+            self.masks.append(boundaries, timestamp)
+        if self.recording is not None:
+            self.recording.append(data, state)
+        
+        self.history.append(state)
+        return state
+    
+    def _measure(self, data: np.ndarray, timestamp: float, digest: Optional[bytes],
+                 timer: Optional[StageTimer]) -> Tuple[BoundaryState, SparseMask]:
+        """
+        Boundary state and mask of one frame, without any hooks.
+        
+        ``digest`` is the frame's content hash when a cache is enabled;
+        ``timer`` (if any) gets one lap per stage.
+        """
+        # Edge strength slab by slab; the stages below consume the compact mask
+        strength, gradients = self._edge_strength(data)
+        boundaries = self._boundary_mask(strength, self._boundary_threshold(strength))
+        del strength
+        if timer:
+            timer.lap('detection')
         
         # Calculate entropy gradient
-        entropy_grad = self._calculate_entropy_gradient(data, boundaries)
+        entropy_grad = self._calculate_entropy_gradient(data, boundaries, digest)
+        if timer:
+            timer.lap('entropy')
         
         # Calculate normal vectors
-        normal = self._estimate_normal_vector(data, boundaries)
-        
-        # Information flux: I(B) = ∇S · n̂
-        info_flux = np.abs(np.dot(entropy_grad, normal))
+        normal = self._estimate_normal_vector(data, boundaries, gradients)
+        if timer:
+            timer.lap('normal')
         
         # Decoherence rate (simplified - based on boundary sharpness)
         decoherence = self._calculate_decoherence(data, boundaries)
+        if timer:
+            timer.lap('decoherence')
+        
+        # Information flux: I(B) = ∇S · n̂
+        info_flux = np.abs(np.dot(entropy_grad, normal))
         
         # Integrated information (simplified Φ calculation)
         phi = self._calculate_phi(data, boundaries, info_flux)
+        if timer:
+            timer.lap('phi')
         
         state = BoundaryState(
             entropy_gradient=entropy_grad,
@@ -61,105 +289,341 @@ class BoundaryMonitor:
             information_flux=info_flux,
             decoherence_rate=decoherence,
             phi_integrated=phi,
-            timestamp=time.time()
+            timestamp=timestamp
         )
+        return state, boundaries
+
+    def analyze_batch(self, stack: np.ndarray) -> BoundaryBatch:
+        """
+        Analyze a stack of frames in batched array operations.
         
-        self.history.append(state)
-        return state
+        The leading axis is treated as time/batch; every frame is analyzed
+        exactly as ``analyze_system`` would, but detection, thresholding,
+        entropy and flux run over ``slab_size`` frames at once instead of
+        one Python call per frame. With mask history enabled, every
+        frame's boundary mask is recorded too; batches never use the
+        result cache.
+        
+        Args:
+            stack: Frames as numpy array of shape (T, ...)
+            
+        Returns:
+            BoundaryBatch with one row per frame
+        """
+        stack = np.asarray(stack)
+        if stack.ndim < 2:
+            raise ValueError("analyze_batch expects a stack of frames (T, ...)")
+        
+        n_frames, ndim = stack.shape[0], stack.ndim - 1
+        entropy_grad = np.zeros((n_frames, ndim))
+        normal = np.zeros((n_frames, ndim))
+        decoherence = np.zeros(n_frames)
+        boundary_count = np.zeros(n_frames)
+        masks: List[SparseMask] = []
+        timer = self.instrumentation and self.instrumentation.start(stack, n_frames)
+        
+        for _, _, start, stop in self._slabs(stack):
+            frames = np.asarray(stack[start:stop], dtype=self.dtype)
+            gradients, boundaries = self._detect_boundaries_batch(frames)
+            boundary_count[start:stop] = boundaries.reshape(len(frames), -1).sum(axis=1)
+            if self.masks is not None:
+                masks.extend(SparseMask.from_dense(mask) for mask in boundaries)
+            if timer:
+                timer.lap('detection')
+            
+            entropy_grad[start:stop] = self._calculate_entropy_gradient_batch(frames)
+            if timer:
+                timer.lap('entropy')
+            normal[start:stop] = self._estimate_normal_vector_batch(gradients, boundaries)
+            if timer:
+                timer.lap('normal')
+            decoherence[start:stop] = self._calculate_decoherence_batch(frames, boundaries)
+            if timer:
+                timer.lap('decoherence')
+        
+        # Information flux: I(B) = ∇S · n̂, row by row
+        info_flux = np.abs(np.einsum('ij,ij->i', entropy_grad, normal))
+        
+        # Integrated information
+        phi = self._phi_from_counts(info_flux, boundary_count,
+                                    int(np.prod(stack.shape[1:])))
+        
+        batch = BoundaryBatch(
+            entropy_gradient=entropy_grad,
+            normal_vector=normal,
+            information_flux=info_flux,
+            decoherence_rate=decoherence,
+            phi_integrated=phi,
+            timestamp=np.full(n_frames, time.time())
+        )
+        
+        if timer:
+            timer.lap('phi')
+            timer.boundary_pixels = boundary_count.sum()
+            self.instrumentation.finish(timer, float(batch.timestamp[0]))
+        
+        for mask, timestamp in zip(masks, batch.timestamp):
+            self.masks.append(mask, timestamp)
+        if self.recording is not None:
+            self.recording.extend(stack, batch)
+        
+        # Slabs of whole frames; a later single frame would not reuse them
+        self.workspace.release()
+        self.history.extend(batch)
+        return batch
     
     def _detect_boundaries(self, data: np.ndarray) -> np.ndarray:
         """Detect boundaries using configured method."""
+        strength, _ = self._edge_strength(np.asarray(data, dtype=self.dtype))
+        return strength > self._boundary_threshold(strength)
+    
+    def _edge_strength(self, data: np.ndarray) -> Tuple[np.ndarray, Optional[List[np.ndarray]]]:
+        """
+        Edge strength of ``data``, computed slab by slab.
+        
+        Each slab's derivatives are taken with a halo wide enough for the
+        Gaussian, so the result equals the whole-field computation while
+        the workspace only holds one slab of gradients. Returns the
+        strength (a fresh array) and, when the field fits in a single
+        slab, its gradient components, which are then still valid.
+        """
+        strength = np.empty(data.shape, dtype=self.dtype)
+        slabs = list(self._slabs(data, halo=_DERIVATIVE_HALO))
+        for lo, hi, start, stop in slabs:
+            gradients, block = self._derivatives(data[lo:hi])
+            strength[start:stop] = block[start - lo:stop - lo]
+        return strength, (gradients if len(slabs) == 1 else None)
+    
+    def _boundary_mask(self, strength: np.ndarray, threshold: float) -> SparseMask:
+        """Compact mask ``strength > threshold``, built slab by slab."""
+        row = int(np.prod(strength.shape[1:]))
+        indices = [np.flatnonzero(self.workspace.mask(strength[start:stop], threshold))
+                   + start * row
+                   for _, _, start, stop in self._slabs(strength)]
+        return SparseMask(np.concatenate(indices), strength.shape)
+    
+    def _derivatives(self, data: np.ndarray,
+                     axes: Optional[Tuple[int, ...]] = None) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Smoothed gradient components and edge strength of ``data``.
+        
+        Both live in workspace buffers that the next call overwrites.
+        """
+        # Gaussian derivative (sigma=1) along each axis, computed once
+        gradients = self.workspace.smoothed_gradient(data, sigma=1.0, axes=axes)
+        
         if self.config.boundary_detection_method == "gradient":
             # Gradient magnitude
-            grad = gaussian_gradient_magnitude(data, sigma=1.0)
-            threshold = np.percentile(grad, 90)
-            return grad > threshold
+            strength = self.workspace.gradient_magnitude(gradients)
         else:  # laplacian
-            lap = laplace(data)
-            threshold = np.percentile(np.abs(lap), 90)
-            return np.abs(lap) > threshold
+            strength = self.workspace.abs_laplacian(data, axes=axes)
+        return gradients, strength
+    
+    def _boundary_threshold(self, strength: np.ndarray) -> float:
+        """Threshold above which a point counts as boundary."""
+        return self.threshold_strategy.threshold(strength, 90)
+    
+    def _slabs(self, data: np.ndarray, halo: int = 0):
+        """
+        Split ``data`` into slabs along axis 0.
+        
+        Yields ``(lo, hi, start, stop)``: the slab owns rows ``[start, stop)``
+        and is computed over ``[lo, hi)``, which adds up to ``halo`` rows of
+        context on each side.
+        """
+        length = data.shape[0]
+        step = max(int(self.config.slab_size), 1)
+        for start in range(0, length, step):
+            stop = min(start + step, length)
+            yield max(start - halo, 0), min(stop + halo, length), start, stop
     
     def _calculate_entropy_gradient(self, data: np.ndarray, 
-                                  boundaries: np.ndarray) -> np.ndarray:
-        """Calculate entropy gradient at boundaries."""
-        # Local entropy calculation
-        window_size = 5
-        pad_width = window_size // 2
-        padded = np.pad(data, pad_width, mode='edge')
-        
-        local_entropy = np.zeros_like(data, dtype=float)
-        
-        for i in range(data.shape[0]):
-            for j in range(data.shape[1] if data.ndim > 1 else 1):
-                if data.ndim == 1:
-                    window = padded[i:i+window_size]
-                else:
-                    window = padded[i:i+window_size, j:j+window_size]
-                
-                # Calculate entropy of local window
-                hist, _ = np.histogram(window.flatten(), bins=10)
-                hist = hist + self.config.epsilon  # Avoid log(0)
-                local_entropy[i, j] = entropy(hist)
-        
-        # Gradient of entropy
-        if data.ndim == 1:
-            grad = np.gradient(local_entropy)
-            return np.array([grad, 0, 0])[:data.ndim]
-        else:
-            grad = np.gradient(local_entropy)
-            return np.array([grad[0].mean(), grad[1].mean(), 0])[:data.ndim]
+                                  boundaries: Union[np.ndarray, SparseMask],
+                                  digest: Optional[bytes] = None) -> np.ndarray:
+        """
+        Calculate the mean entropy gradient, one component per axis.
+        
+        Local entropy is computed slab by slab (with a one-row halo for the
+        finite differences), so only one slab of intermediates is alive at
+        a time. With a cache the whole map is needed to store it, so it is
+        computed (or fetched) in one piece instead.
+        """
+        if self.cache is not None:
+            return self._entropy_gradient_from_map(self.local_entropy(data, digest))
+        
+        totals = np.zeros(data.ndim)
+        for lo, hi, start, stop in self._slabs(data, halo=1):
+            # Local entropy calculation (vectorized over all windows)
+            local_entropy = self.entropy_backend.local_entropy(
+                data,
+                window_size=self.config.entropy_window_size,
+                bins=self.config.entropy_bins,
+                start=lo,
+                stop=hi,
+                dtype=self.dtype,
+            )
+            
+            # Gradient of entropy over the rows this slab owns, one axis at
+            # a time so only one component is alive
+            owned = slice(start - lo, stop - lo)
+            for axis in range(data.ndim):
+                grad = np.gradient(local_entropy, axis=axis)
+                totals[axis] += grad[owned].sum(dtype=np.float64)
+        
+        return totals / data.size
+    
+    def _entropy_gradient_from_map(self, local_entropy: np.ndarray) -> np.ndarray:
+        """
+        Mean entropy gradient of a whole local entropy map.
+        
+        Sums slab by slab in the same order as ``_calculate_entropy_gradient``,
+        so both give bit-identical results.
+        """
+        totals = np.zeros(local_entropy.ndim)
+        for axis in range(local_entropy.ndim):
+            grad = np.gradient(local_entropy, axis=axis)
+            for _, _, start, stop in self._slabs(local_entropy):
+                totals[axis] += grad[start:stop].sum(dtype=np.float64)
+        return totals / local_entropy.size
     
     def _estimate_normal_vector(self, data: np.ndarray, 
-                               boundaries: np.ndarray) -> np.ndarray:
-        """Estimate normal vector at boundaries."""
-        if data.ndim == 1:
-            return np.array([1.0, 0, 0])[:data.ndim]
-        
-        # For 2D, use gradient direction
-        grad_y, grad_x = np.gradient(data)
-        
-        # Average over boundary points
-        boundary_points = np.where(boundaries)
-        if len(boundary_points[0]) > 0:
-            avg_grad_x = grad_x[boundary_points].mean()
-            avg_grad_y = grad_y[boundary_points].mean()
+                               boundaries: Union[np.ndarray, SparseMask],
+                               gradients: Optional[List[np.ndarray]] = None) -> np.ndarray:
+        """
+        Estimate unit normal vector at boundaries, one component per axis.
+        
+        Averages the smoothed gradient over boundary points. Gradients are
+        recomputed slab by slab (with the derivative halo) unless the
+        whole-field ``gradients`` from ``_derivatives`` are passed; either
+        way they are summed slab by slab, so both give identical results.
+        """
+        boundaries = as_sparse_mask(boundaries)
+        count = len(boundaries)
+        if count > 0:
+            totals = np.zeros(data.ndim)
+            data = np.asarray(data, dtype=self.dtype)
+            row = int(np.prod(data.shape[1:]))
+            for lo, hi, start, stop in self._slabs(data, halo=_DERIVATIVE_HALO):
+                # Boundary points owned by this slab, as offsets into it
+                first, last = np.searchsorted(boundaries.indices, [start * row, stop * row])
+                if first == last:
+                    continue
+                if gradients is not None:
+                    block_gradients, offsets = gradients, boundaries.indices[first:last]
+                else:
+                    block_gradients, _ = self._derivatives(data[lo:hi])
+                    offsets = boundaries.indices[first:last] - lo * row
+                for axis, grad in enumerate(block_gradients):
+                    totals[axis] += grad.ravel().take(offsets).sum(dtype=np.float64)
+            avg_grad = totals / count
             
             # Normalize
-            norm = np.sqrt(avg_grad_x**2 + avg_grad_y**2) + self.config.epsilon
-            return np.array([avg_grad_x/norm, avg_grad_y/norm, 0])[:data.ndim]
+            norm = np.linalg.norm(avg_grad) + self.config.epsilon
+            return avg_grad / norm
         
-        return np.array([1.0, 0, 0])[:data.ndim]
+        normal = np.zeros(data.ndim)
+        normal[0] = 1.0
+        return normal
     
     def _calculate_decoherence(self, data: np.ndarray, 
-                              boundaries: np.ndarray) -> float:
+                              boundaries: Union[np.ndarray, SparseMask]) -> float:
         """Calculate decoherence rate at boundaries."""
         # Simplified: based on boundary sharpness
-        if boundaries.sum() == 0:
+        boundaries = as_sparse_mask(boundaries)
+        if len(boundaries) == 0:
             return 0.0
         
         # Measure local variance at boundaries
-        boundary_values = data[boundaries]
-        if len(boundary_values) > 0:
-            return float(np.std(boundary_values))
-        return 0.0
+        boundary_values = boundaries.values(data)
+        return float(np.std(boundary_values, dtype=np.float64))
     
-    def _calculate_phi(self, data: np.ndarray, boundaries: np.ndarray,
+    def _calculate_phi(self, data: np.ndarray, boundaries: Union[np.ndarray, SparseMask],
                       flux: float) -> float:
         """
         Calculate integrated information Φ.
         Simplified version based on Tononi's IIT.
         """
-        if boundaries.sum() == 0:
-            return 0.0
-        
+        return float(self._phi_from_counts(flux, len(as_sparse_mask(boundaries)), data.size))
+    
+    @staticmethod
+    def _phi_from_counts(flux, boundary_count, size: int):
+        """
+        Φ from flux and boundary pixel count; works on scalars or arrays.
+        """
         # Partition coefficient (how much the boundary divides the system)
-        partition_ratio = boundaries.sum() / boundaries.size
+        partition_ratio = np.asarray(boundary_count) / size
         
         # Information integration based on flux and partition
-        phi = flux * partition_ratio * np.log2(data.size)
+        phi = flux * partition_ratio * np.log2(size)
         
         # Normalize to typical range [0, 10]
-        return float(np.clip(phi / 1e6, 0, 10))
+        return np.clip(phi / 1e6, 0, 10)
+    
+    def _detect_boundaries_batch(self, frames: np.ndarray) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Detect boundaries in every frame, with per-frame thresholds.
+        
+        Returns the smoothed spatial gradient components (time is neither
+        smoothed nor differentiated) together with the boundary mask.
+        """
+        n_frames = len(frames)
+        gradients, strength = self._derivatives(frames, axes=tuple(range(1, frames.ndim)))
+        
+        threshold = self.threshold_strategy.threshold_rows(strength.reshape(n_frames, -1), 90)
+        threshold = threshold.reshape((n_frames,) + (1,) * (frames.ndim - 1))
+        return gradients, self.workspace.mask(strength, threshold)
+    
+    def _spatial_gradients(self, frames: np.ndarray) -> List[np.ndarray]:
+        """np.gradient of every frame along its own (non-batch) axes."""
+        grads = np.gradient(frames, axis=tuple(range(1, frames.ndim)))
+        return [grads] if frames.ndim == 2 else list(grads)
+    
+    def _calculate_entropy_gradient_batch(self, frames: np.ndarray) -> np.ndarray:
+        """Mean entropy gradient per frame, shape (n_frames, ndim)."""
+        # Window of extent 1 along the batch axis keeps frames independent
+        window = (1,) + (self.config.entropy_window_size,) * (frames.ndim - 1)
+        local_entropy = self.entropy_backend.local_entropy(
+            frames,
+            window_size=window,
+            bins=self.config.entropy_bins,
+            dtype=self.dtype,
+        )
+        
+        n_frames = len(frames)
+        return np.stack([grad.reshape(n_frames, -1).mean(axis=1, dtype=np.float64)
+                         for grad in self._spatial_gradients(local_entropy)], axis=1)
+    
+    def _estimate_normal_vector_batch(self, gradients: List[np.ndarray],
+                                      boundaries: np.ndarray) -> np.ndarray:
+        """Unit normal per frame from smoothed gradients, shape (n_frames, ndim)."""
+        n_frames = len(boundaries)
+        mask = boundaries.reshape(n_frames, -1)
+        count = mask.sum(axis=1)
+        
+        totals = np.stack([np.sum(grad.reshape(n_frames, -1), axis=1, where=mask,
+                                  dtype=np.float64)
+                           for grad in gradients], axis=1)
+        avg_grad = totals / np.maximum(count, 1)[:, None]
+        normal = avg_grad / (np.linalg.norm(avg_grad, axis=1, keepdims=True)
+                             + self.config.epsilon)
+        
+        # Frames without boundaries fall back to the first axis
+        normal[count == 0] = 0.0
+        normal[count == 0, 0] = 1.0
+        return normal
+    
+    def _calculate_decoherence_batch(self, frames: np.ndarray,
+                                     boundaries: np.ndarray) -> np.ndarray:
+        """Standard deviation of boundary values per frame."""
+        n_frames = len(frames)
+        values = frames.reshape(n_frames, -1)
+        mask = boundaries.reshape(n_frames, -1)
+        count = np.maximum(mask.sum(axis=1), 1)
+        
+        # Accumulate in float64 whatever the working precision
+        mean = np.where(mask, values, 0).sum(axis=1, dtype=np.float64) / count
+        deviation = np.where(mask, values - mean[:, None].astype(values.dtype), 0)
+        return np.sqrt(np.square(deviation).sum(axis=1, dtype=np.float64) / count)
     
     def detect_consciousness_potential(self, state: BoundaryState) -> Dict:
         """
@@ -0,0 +1,155 @@
+"""
+Process-pool parallel analysis of frame sequences for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ..config import BoundaryConfig
+from .boundary_state import BoundaryBatch
+from .hexagonal import HexBoundaryMonitor
+from .monitor import BoundaryMonitor
+
+
+# Per-worker state, set once by _init_worker
+_worker: Dict = {}
+
+
+def _init_worker(config: BoundaryConfig, source: Dict, monitor_type: type) -> None:
+    """Attach to the shared frames and build this worker's monitor."""
+    if source['kind'] == 'shared_memory':
+        shm = shared_memory.SharedMemory(name=source['name'])
+        frames = np.ndarray(source['shape'], dtype=source['dtype'], buffer=shm.buf)
+        _worker['shm'] = shm  # Keep the mapping alive
+    else:  # memmap
+        frames = np.memmap(source['filename'], dtype=source['dtype'], mode='r',
+                           offset=source['offset'], shape=source['shape'])
+
+    _worker['frames'] = frames
+    _worker['monitor'] = monitor_type(config)
+
+
+def _analyze_chunk(bounds: Tuple[int, int]) -> Tuple[np.ndarray, ...]:
+    """Analyze frames ``[start, stop)`` in a worker; returns result columns."""
+    start, stop = bounds
+    batch = _worker['monitor'].analyze_batch(_worker['frames'][start:stop])
+    _worker['monitor'].history.clear()
+    return (batch.entropy_gradient, batch.normal_vector, batch.information_flux,
+            batch.decoherence_rate, batch.phi_integrated)
+
+
+def _memmap_offset(frames: np.ndarray) -> Optional[int]:
+    """
+    File offset of the first byte of ``frames`` if workers can reopen it
+    as a plain memmap, i.e. it is a C-contiguous view into a file mapping.
+
+    A view's own ``.offset`` is copied from the memmap it was sliced from,
+    so the offset is recomputed from the distance to that root mapping.
+    """
+    if not (isinstance(frames, np.memmap) and frames.filename is not None
+            and frames.flags.c_contiguous):
+        return None
+    root = frames
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+    if not isinstance(root, np.memmap):
+        return None
+    return root.offset + (frames.ctypes.data - root.ctypes.data)
+
+
+def analyze_parallel(monitor: BoundaryMonitor,
+                     frames: Union[np.ndarray, Sequence[np.ndarray]],
+                     max_workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None) -> BoundaryBatch:
+    """
+    Analyze many same-shaped frames across a process pool.
+
+    Frames are never pickled: a C-contiguous ``np.memmap`` stack (or view
+    of one) is reopened by each worker from its file, and anything else is copied once into a
+    ``multiprocessing.shared_memory`` block the workers map directly. Each
+    worker runs ``analyze_batch`` on contiguous chunks of ``chunk_size``
+    frames; results are merged back in frame order, so the output is the
+    same for any number of workers, and appended to ``monitor.history``.
+    Workers for a ``HexBoundaryMonitor`` run its hexagonal batch path.
+
+    Args:
+        monitor: Monitor whose config is used and whose history is extended
+        frames: Stack of shape (T, ...) or a sequence of equal-shape arrays
+        max_workers: Worker processes (default: ``os.cpu_count()``)
+        chunk_size: Frames per task (default: ``config.parallel_chunk_size``)
+
+    Returns:
+        BoundaryBatch with one row per frame
+    """
+    if len(frames) == 0:
+        raise ValueError("analyze_parallel needs at least one frame")
+
+    chunk_size = chunk_size or monitor.config.parallel_chunk_size
+    # Other subclasses keep per-monitor state, so workers run the plain batch path
+    monitor_type = HexBoundaryMonitor if isinstance(monitor, HexBoundaryMonitor) else BoundaryMonitor
+    max_workers = max_workers or os.cpu_count() or 1
+    timestamp = time.time()
+
+    shm = None
+    offset = _memmap_offset(frames)
+    if offset is not None:
+        source = {
+            'kind': 'memmap',
+            'filename': frames.filename,
+            'offset': offset,
+            'dtype': frames.dtype.str,
+            'shape': frames.shape,
+        }
+        n_frames = frames.shape[0]
+    else:
+        if isinstance(frames, np.ndarray):
+            shape, dtype = frames.shape, frames.dtype
+        else:
+            shape = (len(frames),) + np.shape(frames[0])
+            dtype = np.asarray(frames[0]).dtype
+
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        shared = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        for i, frame in enumerate(frames):
+            shared[i] = frame
+        source = {'kind': 'shared_memory', 'name': shm.name,
+                  'dtype': dtype.str, 'shape': shape}
+        n_frames = shape[0]
+
+    bounds = [(start, min(start + chunk_size, n_frames))
+              for start in range(0, n_frames, chunk_size)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(monitor.config, source, monitor_type)) as pool:
+            parts: List[Tuple[np.ndarray, ...]] = list(pool.map(_analyze_chunk, bounds))
+    finally:
+        if shm is not None:
+            del shared
+            shm.close()
+            shm.unlink()
+
+    columns = [np.concatenate(column) for column in zip(*parts)]
+
+    batch = BoundaryBatch(
+        entropy_gradient=columns[0],
+        normal_vector=columns[1],
+        information_flux=columns[2],
+        decoherence_rate=columns[3],
+        phi_integrated=columns[4],
+        timestamp=np.full(n_frames, timestamp)
+    )
+
+    if monitor.recording is not None:
+        monitor.recording.extend(frames, batch)
+
+    monitor.history.extend(batch)
+    return batch
@@ -0,0 +1,318 @@
+"""
+Coarse-to-fine (pyramid) boundary analysis for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from dataclasses import dataclass
+import numpy as np
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .boundary_state import BoundaryState
+from .hexagonal import HexBoundaryMonitor
+from .monitor import BoundaryMonitor
+from .sparse import SparseMask
+from .thresholds import ExactThreshold, _lerp
+
+
+# Gaussian derivative with sigma=1 reaches 4 pixels (see tiled._STRENGTH_HALO)
+_HALO = 4
+
+
+@dataclass
+class PyramidReport:
+    """
+    How much of the field a pyramid analysis computed.
+
+    Attributes:
+        band_fraction: Fraction of pixels whose derivatives were computed
+        tiles_computed: Tiles analyzed at full resolution
+        tiles_total: Tiles in the field
+        refinements: Rounds that grew the band where boundaries crossed it
+        sampled_pixels: Pixels checked at full resolution outside the band
+        sampled_missed: Pixels among them strong enough to change the result
+        estimated_missed_fraction: Estimated fraction of boundary pixels
+            lying outside the band (upper end of a 95% interval from the
+            sampled tiles)
+        threshold: Edge-strength threshold found from the band
+        fallback: Whether the band could not be trusted and the field was
+            analyzed in full with ``analyze_system``
+    """
+
+    band_fraction: float
+    tiles_computed: int
+    tiles_total: int
+    refinements: int
+    sampled_pixels: int
+    sampled_missed: int
+    estimated_missed_fraction: float
+    threshold: float
+    fallback: bool = False
+
+
+def _downsample(data: np.ndarray, factor: int) -> np.ndarray:
+    """Block mean over ``factor``-sided blocks (edges padded by replication)."""
+    if factor == 1:
+        return data
+    pads = [(0, -n % factor) for n in data.shape]
+    padded = np.pad(data, pads, mode='edge') if any(p for _, p in pads) else data
+    shape = []
+    for n in padded.shape:
+        shape += [n // factor, factor]
+    return padded.reshape(shape).mean(axis=tuple(range(1, 2 * data.ndim, 2)))
+
+
+def border_entropy_gradient(monitor: BoundaryMonitor, data: np.ndarray) -> np.ndarray:
+    """
+    Mean entropy gradient of ``data`` from the local entropy of its borders.
+
+    Along an axis of length n, ``np.gradient`` sums to ``1.5 f[n-1] -
+    0.5 f[n-2] - 1.5 f[0] + 0.5 f[1]`` (the central differences
+    telescope), so the field mean that ``analyze_system`` reports only
+    needs the local entropy of two hyperplanes at each end of every axis.
+    The result equals the full computation up to rounding.
+    """
+    totals = np.zeros(data.ndim)
+    for axis in range(data.ndim):
+        # Cubic windows make the entropy map independent of axis order
+        moved = np.moveaxis(data, axis, 0)
+        n = moved.shape[0]
+
+        def rows(start: int, stop: int) -> np.ndarray:
+            return monitor.entropy_backend.local_entropy(
+                moved,
+                window_size=monitor.config.entropy_window_size,
+                bins=monitor.config.entropy_bins,
+                start=start,
+                stop=stop,
+                dtype=monitor.dtype,
+            )
+
+        head, tail = rows(0, 2), rows(n - 2, n)
+        total = 1.5 * tail[1] - 0.5 * tail[0] - 1.5 * head[0] + 0.5 * head[1]
+        totals[axis] = total.sum(dtype=np.float64)
+    return totals / data.size
+
+
+def _wilson_upper(successes: int, trials: int, z: float = 1.96) -> float:
+    """Upper end of the Wilson score interval for a binomial proportion."""
+    if trials == 0:
+        return 1.0
+    p = successes / trials
+    center = p + z * z / (2 * trials)
+    spread = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials))
+    return float(min((center + spread) / (1 + z * z / trials), 1.0))
+
+
+def _band_threshold(monitor: BoundaryMonitor, strengths: List[np.ndarray],
+                    total: int) -> Optional[Tuple[float, float]]:
+    """
+    The field's 90th-percentile threshold from the edge strength in the band.
+
+    Assumes every pixel outside the band is weaker than the band's pixels
+    at the percentile's rank, so those ranks fall inside the band. Returns
+    the threshold and the weakest value an outside pixel may not exceed
+    for that to hold (the lower order statistic for the exact strategy),
+    or None when the band has too few pixels to hold the ranks.
+    """
+    count = sum(strength.size for strength in strengths)
+    offset = total - count
+    position = (total - 1) * 0.9
+    if position < offset:
+        return None
+
+    strategy = monitor.threshold_strategy
+    if isinstance(strategy, ExactThreshold):
+        k = int(np.floor(position))
+        ranks = [k - offset, min(k + 1, total - 1) - offset]
+        values = np.concatenate([np.ravel(strength) for strength in strengths])
+        selected = np.partition(values, ranks)
+        a, b = selected[ranks[0]], selected[ranks[1]]
+        return _lerp(a, b, position - k), float(a)
+
+    # Approximate strategies see the band only, at the matching rank
+    q = 100.0 * (position - offset) / max(count - 1, 1)
+    threshold = strategy.threshold_tiles(lambda: iter(strengths), q)
+    return threshold, threshold
+
+
+def analyze_pyramid(monitor: BoundaryMonitor, data: np.ndarray,
+                    levels: int = 2, band: int = 1,
+                    candidate_percentile: float = 80.0,
+                    check_tiles: int = 16,
+                    max_refinements: int = 8,
+                    timestamp: Optional[float] = None) -> Tuple[BoundaryState, PyramidReport]:
+    """
+    Analyze a large field coarse to fine.
+
+    Candidate boundaries are the points above ``candidate_percentile`` of
+    edge strength on a ``2**levels`` times downsampled copy; dilated by
+    ``band`` coarse cells they select the tiles (``config.slab_size`` per
+    side) whose derivatives are computed at full resolution. Pixels
+    outside the band are assumed weaker than the threshold, which is then
+    taken from the band's own order statistics. Wherever a band tile's
+    face exceeds that, the neighbouring tiles are added and the threshold
+    recomputed, until no face does.
+
+    The entropy gradient needs no band: it is computed exactly from the
+    field's borders (see ``border_entropy_gradient``).
+
+    With the exact threshold method the result equals ``analyze_system``
+    whenever no pixel outside the band is strong enough to change the
+    threshold. As a check, ``check_tiles`` random tiles outside the band
+    are computed in full. If any of them has such a pixel, if boundaries
+    still cross the band after ``max_refinements`` rounds, or if the band
+    is too small to hold the threshold's ranks, the field is analyzed with
+    ``analyze_system`` instead (``report.fallback``).
+
+    Downsampling and tiling assume a square grid, so ``HexBoundaryMonitor``
+    is rejected.
+
+    Returns:
+        The BoundaryState (also appended to history) and a PyramidReport
+    """
+    if isinstance(monitor, HexBoundaryMonitor):
+        raise TypeError("analyze_pyramid only supports square-grid monitors")
+    data = np.asarray(data, dtype=monitor.dtype)
+    timestamp = time.time() if timestamp is None else timestamp
+    config = monitor.config
+    factor = 2 ** levels
+    tile = max(int(config.slab_size), 1)
+
+    # Coarse candidates, dilated into a band
+    coarse = _downsample(data, factor)
+    _, coarse_strength = monitor._derivatives(coarse)
+    candidates = coarse_strength > np.percentile(coarse_strength, candidate_percentile)
+    from scipy.ndimage import binary_dilation
+
+    coarse_band = binary_dilation(candidates, iterations=band) if band > 0 else candidates
+
+    # Tiles overlapping the band
+    grid = tuple(-(-n // tile) for n in data.shape)
+    starts = [np.arange(0, n, tile) // factor for n in data.shape]
+    active = coarse_band
+    for axis, start in enumerate(starts):
+        active = np.logical_or.reduceat(active, start, axis=axis)
+
+    tiles: Dict[Tuple[int, ...], Tuple[List[np.ndarray], np.ndarray]] = {}
+
+    def bounds(index: Tuple[int, ...]) -> Tuple[slice, ...]:
+        return tuple(slice(i * tile, min((i + 1) * tile, n))
+                     for i, n in zip(index, data.shape))
+
+    def compute(index: Tuple[int, ...]) -> Tuple[List[np.ndarray], np.ndarray]:
+        """Exact gradients and strength of one tile (computed with a halo)."""
+        owned = bounds(index)
+        outer = tuple(slice(max(s.start - _HALO, 0), min(s.stop + _HALO, n))
+                      for s, n in zip(owned, data.shape))
+        inner = tuple(slice(s.start - o.start, s.stop - o.start)
+                      for s, o in zip(owned, outer))
+        gradients, strength = monitor._derivatives(data[outer])
+        return [grad[inner].copy() for grad in gradients], strength[inner].copy()
+
+    refinements = 0
+    trusted = False
+    while True:
+        for index in zip(*np.nonzero(active)):
+            if index not in tiles:
+                tiles[index] = compute(index)
+
+        found = _band_threshold(monitor, [strength for _, strength in tiles.values()],
+                                data.size)
+        if found is None:
+            break
+        threshold, limit = found
+
+        # Grow the band across faces where the boundary reaches its edge
+        grow = np.zeros_like(active)
+        for index, (_, strength) in tiles.items():
+            for axis in range(data.ndim):
+                for side, step in ((0, -1), (-1, 1)):
+                    neighbour = list(index)
+                    neighbour[axis] += step
+                    if not 0 <= neighbour[axis] < grid[axis] or active[tuple(neighbour)]:
+                        continue
+                    face = np.take(strength, side, axis=axis)
+                    if np.any(face > limit):
+                        grow[tuple(neighbour)] = True
+        if not grow.any():
+            trusted = True
+            break
+        if refinements >= max_refinements:
+            break
+        active |= grow
+        refinements += 1
+
+    # Check random tiles outside the band at full resolution
+    outside = [tuple(index) for index in zip(*np.nonzero(~active))]
+    sampled_pixels, sampled_missed = 0, 0
+    if trusted:
+        rng = np.random.default_rng(config.threshold_seed)
+        for i in rng.permutation(len(outside))[:check_tiles]:
+            _, strength = compute(outside[i])
+            sampled_pixels += strength.size
+            sampled_missed += int(np.count_nonzero(strength > limit))
+
+    outside_pixels = data.size - sum(strength.size for _, strength in tiles.values())
+    if outside and sampled_pixels:
+        missed = _wilson_upper(sampled_missed, sampled_pixels) * outside_pixels
+        # The 90th-percentile threshold makes about a tenth of the field boundary
+        missed_fraction = missed / (0.1 * data.size + missed)
+    else:
+        missed_fraction = 0.0 if trusted else 1.0
+
+    report = PyramidReport(
+        band_fraction=1.0 - outside_pixels / data.size,
+        tiles_computed=len(tiles),
+        tiles_total=int(np.prod(grid)),
+        refinements=refinements,
+        sampled_pixels=sampled_pixels,
+        sampled_missed=sampled_missed,
+        estimated_missed_fraction=float(missed_fraction),
+        threshold=float(threshold) if found is not None else float('nan'),
+    )
+
+    if not trusted or sampled_missed > 0:
+        tiles.clear()
+        report.fallback = True
+        return monitor.analyze_system(data, timestamp=timestamp), report
+
+    # Full-resolution metrics over the band
+    normal_totals = np.zeros(data.ndim)
+    indices = []
+    for index, (gradients, strength) in tiles.items():
+        mask = strength > threshold
+        for axis, grad in enumerate(gradients):
+            normal_totals[axis] += np.sum(grad, where=mask, dtype=np.float64)
+        coords = tuple(c + s.start for c, s in zip(np.nonzero(mask), bounds(index)))
+        indices.append(np.ravel_multi_index(coords, data.shape))
+    tiles.clear()
+
+    boundaries = SparseMask(np.sort(np.concatenate(indices)).astype(np.int64), data.shape)
+    count = len(boundaries)
+
+    if count > 0:
+        avg_grad = normal_totals / count
+        normal = avg_grad / (np.linalg.norm(avg_grad) + config.epsilon)
+    else:
+        normal = np.zeros(data.ndim)
+        normal[0] = 1.0
+
+    entropy_grad = border_entropy_gradient(monitor, data)
+    info_flux = np.abs(np.dot(entropy_grad, normal))
+    decoherence = monitor._calculate_decoherence(data, boundaries)
+    phi = float(monitor._phi_from_counts(info_flux, count, data.size))
+    monitor.workspace.release()
+
+    state = BoundaryState(
+        entropy_gradient=entropy_grad,
+        normal_vector=normal,
+        information_flux=info_flux,
+        decoherence_rate=decoherence,
+        phi_integrated=phi,
+        timestamp=timestamp
+    )
+    monitor.history.append(state)
+    return state, report
@@ -0,0 +1,407 @@
+"""
+Chunked on-disk recording and replay of frames and boundary states for
+BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import json
+import os
+import queue
+import threading
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..config import BoundaryConfig
+from .boundary_state import BoundaryState, BoundaryBatch
+from .history import BoundaryHistory, SCALAR_FIELDS, VECTOR_FIELDS
+
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+CONFIG = 'config.json'
+
+# Frames and rows of one chunk, or None to stop the writer thread
+_Chunk = Optional[Tuple[int, np.ndarray, np.ndarray]]
+
+
+def _chunk_paths(path: str, index: int) -> Tuple[str, str]:
+    """Frame and state files of chunk ``index``."""
+    return (os.path.join(path, f'frames_{index:06d}.npy'),
+            os.path.join(path, f'states_{index:06d}.npy'))
+
+
+def _save_atomic(path: str, array: np.ndarray) -> None:
+    """Write ``array`` as ``.npy`` so that readers never see a partial file."""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def _read_manifest(path: str) -> Dict:
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording format version {manifest['version']}")
+    return manifest
+
+
+class RecordingWriter:
+    """
+    Append-only recording of frames and their boundary states.
+
+    A recording is a directory holding the config it was made with
+    (``config.json``), one pair of ``.npy`` files per chunk of
+    ``chunk_frames`` frames (the raw frames, shape (n, *frame_shape), and
+    the states as rows of ``BoundaryHistory``'s structured layout), and a
+    ``manifest.json`` listing the chunks with their first and last
+    timestamps, which is the time index ``Recording.seek`` searches.
+
+    ``append`` only copies the frame and state into the current chunk
+    buffer; full chunks go through a queue of at most ``queue_chunks``
+    entries to a background thread that writes them, so the analysis
+    loop only waits for the disk when that queue is full. Chunk files and
+    the manifest are replaced atomically, so a reader opened at any time
+    sees a consistent prefix. Opening an existing recording continues it.
+
+    Timestamps must not decrease; that is what keeps the index sorted.
+    """
+
+    def __init__(self, path: str, config: Optional[BoundaryConfig] = None,
+                 chunk_frames: Optional[int] = None, queue_chunks: int = 4):
+        config = config or BoundaryConfig()
+        chunk_frames = chunk_frames or config.recording_chunk_frames
+        if chunk_frames <= 0:
+            raise ValueError("chunk_frames must be positive")
+        if queue_chunks <= 0:
+            raise ValueError("queue_chunks must be positive")
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            manifest = _read_manifest(path)
+            self.chunk_frames = manifest['chunk_frames']
+            self.frame_shape = tuple(manifest['frame_shape'])
+            self.frame_dtype = np.dtype(manifest['frame_dtype'])
+            self._chunks: List[Dict] = manifest['chunks']
+        else:
+            self.chunk_frames = int(chunk_frames)
+            self.frame_shape: Optional[Tuple[int, ...]] = None
+            self.frame_dtype: Optional[np.dtype] = None
+            self._chunks = []
+            config.to_json(os.path.join(path, CONFIG))
+
+        self._frames: Optional[np.ndarray] = None
+        self._rows: Optional[np.ndarray] = None
+        self._count = 0  # Frames in the current chunk buffer
+        self._last_timestamp = self._chunks[-1]['last_timestamp'] if self._chunks else -np.inf
+        self._written = sum(chunk['count'] for chunk in self._chunks)
+
+        self._queue: 'queue.Queue[_Chunk]' = queue.Queue(maxsize=queue_chunks)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name='bind-recording',
+                                        daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """Frames appended so far (written or still buffered)."""
+        return self._written
+
+    def __enter__(self) -> 'RecordingWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _allocate(self, frame: np.ndarray, ndim: int) -> None:
+        """Start a chunk buffer, fixing the frame layout on first use."""
+        if self.frame_shape is None:
+            self.frame_shape = tuple(frame.shape)
+            self.frame_dtype = frame.dtype
+        elif tuple(frame.shape) != self.frame_shape:
+            raise ValueError(f"Recording holds frames of shape {self.frame_shape}, "
+                             f"got {tuple(frame.shape)}")
+        self._frames = np.empty((self.chunk_frames,) + self.frame_shape, dtype=self.frame_dtype)
+        self._rows = np.zeros(self.chunk_frames, dtype=BoundaryHistory._dtype(ndim))
+
+    def _check(self) -> None:
+        if self._closed:
+            raise ValueError("Recording is closed")
+        if self._error is not None:
+            raise RuntimeError("Recording writer thread failed") from self._error
+
+    def _check_time(self, first: float, last: float) -> None:
+        if first < self._last_timestamp:
+            raise ValueError(f"Timestamps must not decrease ({first} after "
+                             f"{self._last_timestamp})")
+        self._last_timestamp = last
+
+    def append(self, frame: np.ndarray, state: BoundaryState) -> None:
+        """Record one frame and the state analyzed from it."""
+        self._check()
+        frame = np.asarray(frame)
+        if self._frames is None:
+            self._allocate(frame, len(state.normal_vector))
+        elif tuple(frame.shape) != self.frame_shape:
+            raise ValueError(f"Recording holds frames of shape {self.frame_shape}, "
+                             f"got {tuple(frame.shape)}")
+        self._check_time(state.timestamp, state.timestamp)
+
+        self._frames[self._count] = frame
+        row = self._rows[self._count]
+        for name in VECTOR_FIELDS + SCALAR_FIELDS:
+            row[name] = getattr(state, name)
+        self._count += 1
+        self._written += 1
+        if self._count == self.chunk_frames:
+            self._submit()
+
+    def extend(self, frames: np.ndarray, batch: BoundaryBatch) -> None:
+        """Record a stack of frames and the batch analyzed from it."""
+        self._check()
+        frames = np.asarray(frames)
+        n = len(batch)
+        if len(frames) != n:
+            raise ValueError("frames and batch must have the same length")
+        if n == 0:
+            return
+        if self._frames is None:
+            self._allocate(frames[0], batch.normal_vector.shape[1])
+        elif tuple(frames.shape[1:]) != self.frame_shape:
+            raise ValueError(f"Recording holds frames of shape {self.frame_shape}, "
+                             f"got {tuple(frames.shape[1:])}")
+        timestamps = batch.timestamp
+        if np.any(np.diff(timestamps) < 0):
+            raise ValueError("Timestamps must not decrease within a batch")
+        self._check_time(float(timestamps[0]), float(timestamps[-1]))
+
+        # Fill the current buffer up to its end, submit, repeat
+        done = 0
+        while done < n:
+            take = min(n - done, self.chunk_frames - self._count)
+            target = slice(self._count, self._count + take)
+            self._frames[target] = frames[done:done + take]
+            for name in VECTOR_FIELDS + SCALAR_FIELDS:
+                self._rows[name][target] = getattr(batch, name)[done:done + take]
+            self._count += take
+            self._written += take
+            done += take
+            if self._count == self.chunk_frames:
+                self._submit()
+
+    def _submit(self) -> None:
+        """Hand the current buffer to the writer thread and start a new one."""
+        if self._count == 0:
+            return
+        frames, rows = self._frames[:self._count], self._rows[:self._count]
+        # Blocks only when ``queue_chunks`` chunks are already waiting
+        self._queue.put((len(self._chunks), frames, rows))
+        self._chunks.append({
+            'count': self._count,
+            'first_timestamp': float(rows['timestamp'][0]),
+            'last_timestamp': float(rows['timestamp'][-1]),
+        })
+        self._frames = np.empty_like(self._frames)
+        self._rows = np.zeros_like(self._rows)
+        self._count = 0
+
+    def _drain(self) -> None:
+        """Writer thread: write chunks and the manifest as they arrive."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    index, frames, rows = item
+                    frame_path, state_path = _chunk_paths(self.path, index)
+                    _save_atomic(frame_path, frames)
+                    _save_atomic(state_path, rows)
+                    self._write_manifest(index + 1)
+            except BaseException as error:  # surfaced by the next append/close
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _write_manifest(self, n_chunks: int) -> None:
+        """Publish the first ``n_chunks`` chunks (atomically)."""
+        manifest = {
+            'version': FORMAT_VERSION,
+            'frame_shape': list(self.frame_shape),
+            'frame_dtype': self.frame_dtype.str,
+            'chunk_frames': self.chunk_frames,
+            'chunks': self._chunks[:n_chunks],
+        }
+        tmp = os.path.join(self.path, f'{MANIFEST}.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, MANIFEST))
+
+    def flush(self) -> None:
+        """Write the partial chunk and wait until everything is on disk."""
+        self._check()
+        self._submit()
+        self._queue.join()
+        self._check()
+
+    def close(self) -> None:
+        """Flush and stop the writer thread. Safe to call more than once."""
+        if self._closed:
+            return
+        try:
+            if self._error is None:
+                self._submit()
+        finally:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Recording writer thread failed") from self._error
+
+
+class Recording:
+    """
+    Reader for a directory written by ``RecordingWriter``.
+
+    Chunks are opened memory-mapped on first use, so frames and metric
+    columns are only read from disk as they are accessed. ``seek`` finds
+    a time in O(log n): a binary search over the chunks' last timestamps
+    in the manifest, then one within the chunk's timestamp column.
+    ``replay`` streams the frames back through a ``BoundaryMonitor``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        manifest = _read_manifest(path)
+        self.frame_shape = tuple(manifest['frame_shape'])
+        self.frame_dtype = np.dtype(manifest['frame_dtype'])
+        self.chunk_frames = manifest['chunk_frames']
+        self.config = BoundaryConfig.from_json(os.path.join(path, CONFIG))
+
+        chunks = manifest['chunks']
+        counts = np.array([chunk['count'] for chunk in chunks], dtype=np.int64)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._last_timestamps = np.array([chunk['last_timestamp'] for chunk in chunks])
+        self._frame_chunks: Dict[int, np.ndarray] = {}
+        self._state_chunks: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._last_timestamps)
+
+    def _chunk_frames(self, index: int) -> np.ndarray:
+        if index not in self._frame_chunks:
+            self._frame_chunks[index] = np.load(_chunk_paths(self.path, index)[0],
+                                                mmap_mode='r')
+        return self._frame_chunks[index]
+
+    def _chunk_states(self, index: int) -> np.ndarray:
+        if index not in self._state_chunks:
+            self._state_chunks[index] = np.load(_chunk_paths(self.path, index)[1],
+                                                mmap_mode='r')
+        return self._state_chunks[index]
+
+    def _bounds(self, start: Optional[int], stop: Optional[int]) -> Tuple[int, int]:
+        return slice(start, stop).indices(len(self))[:2]
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Chunk and row within it of frame ``index``."""
+        chunk = int(np.searchsorted(self._offsets, index, side='right')) - 1
+        return chunk, index - int(self._offsets[chunk])
+
+    def chunks(self, start: Optional[int] = None,
+               stop: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Frames ``start:stop`` chunk by chunk.
+
+        Yields:
+            ``(frames, rows)`` memory-mapped slices of one chunk: frames of
+            shape (n, *frame_shape) and the states as structured rows
+        """
+        start, stop = self._bounds(start, stop)
+        while start < stop:
+            chunk, row = self._locate(start)
+            take = min(stop - start, int(self._offsets[chunk + 1]) - start)
+            yield (self._chunk_frames(chunk)[row:row + take],
+                   self._chunk_states(chunk)[row:row + take])
+            start += take
+
+    def frame(self, index: int) -> np.ndarray:
+        """Frame ``index`` (negative counts from the end), memory-mapped."""
+        if not -len(self) <= index < len(self):
+            raise IndexError("recording index out of range")
+        chunk, row = self._locate(index % len(self))
+        return self._chunk_frames(chunk)[row]
+
+    def state(self, index: int) -> BoundaryState:
+        """State recorded with frame ``index``."""
+        if not -len(self) <= index < len(self):
+            raise IndexError("recording index out of range")
+        chunk, row = self._locate(index % len(self))
+        row = self._chunk_states(chunk)[row]
+        return BoundaryState(
+            entropy_gradient=np.array(row['entropy_gradient']),
+            normal_vector=np.array(row['normal_vector']),
+            information_flux=float(row['information_flux']),
+            decoherence_rate=float(row['decoherence_rate']),
+            phi_integrated=float(row['phi_integrated']),
+            timestamp=float(row['timestamp'])
+        )
+
+    def column(self, name: str, start: Optional[int] = None,
+               stop: Optional[int] = None) -> np.ndarray:
+        """One state field over frames ``start:stop`` (e.g. 'phi_integrated')."""
+        if name not in VECTOR_FIELDS + SCALAR_FIELDS:
+            raise ValueError(f"Unknown state field {name!r}")
+        parts = [rows[name] for _, rows in self.chunks(start, stop)]
+        if not parts:
+            return np.zeros((0, len(self.frame_shape)) if name in VECTOR_FIELDS else 0)
+        return np.concatenate(parts)
+
+    def to_batch(self, start: Optional[int] = None,
+                 stop: Optional[int] = None) -> BoundaryBatch:
+        """States of frames ``start:stop`` as a BoundaryBatch."""
+        return BoundaryBatch(**{name: self.column(name, start, stop)
+                                for name in VECTOR_FIELDS + SCALAR_FIELDS})
+
+    def seek(self, timestamp: float) -> int:
+        """Index of the first frame recorded at or after ``timestamp``."""
+        chunk = int(np.searchsorted(self._last_timestamps, timestamp, side='left'))
+        if chunk == self.n_chunks:
+            return len(self)
+        times = self._chunk_states(chunk)['timestamp']
+        return int(self._offsets[chunk]) + int(np.searchsorted(times, timestamp, side='left'))
+
+    def time_range(self, start_time: Optional[float] = None,
+                   stop_time: Optional[float] = None) -> Tuple[int, int]:
+        """Frame indices ``(start, stop)`` with ``start_time <= t < stop_time``."""
+        start = 0 if start_time is None else self.seek(start_time)
+        stop = len(self) if stop_time is None else self.seek(stop_time)
+        return start, max(start, stop)
+
+    def replay(self, monitor=None, start_time: Optional[float] = None,
+               stop_time: Optional[float] = None) -> Iterator[BoundaryState]:
+        """
+        Re-analyze recorded frames, one chunk in memory at a time.
+
+        Args:
+            monitor: BoundaryMonitor to analyze with (default: one built
+                from the recording's config)
+            start_time, stop_time: Only frames with ``start_time <= t < stop_time``
+
+        Yields:
+            The monitor's state for each frame, stamped with the recorded time
+        """
+        if monitor is None:
+            from .monitor import BoundaryMonitor
+            monitor = BoundaryMonitor(self.config)
+
+        for frames, rows in self.chunks(*self.time_range(start_time, stop_time)):
+            for frame, timestamp in zip(frames, rows['timestamp']):
+                yield monitor.analyze_system(frame, timestamp=float(timestamp))
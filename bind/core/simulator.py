@@ -6,7 +6,69 @@ Date: July 2025
 """
 
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union
+
+
+Seed = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def _seed_sequence(seed: Seed) -> np.random.SeedSequence:
+    """
+    Root seed sequence of a simulation run.
+
+    Without a seed the entropy is drawn once from the global ``np.random``
+    state, so ``np.random.seed`` still reproduces a run.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(seed.integers(2**63, size=4))
+    if seed is None:
+        return np.random.SeedSequence(np.random.randint(2**31, size=4))
+    return np.random.SeedSequence(seed)
+
+
+def _batch_stream(root: np.random.SeedSequence, batch: int) -> np.random.Generator:
+    """Independent generator for one batch (``root.spawn`` without mutating root)."""
+    child = np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (batch,),
+                                   pool_size=root.pool_size)
+    return np.random.default_rng(child)
+
+
+def _emergence_grid(size: Tuple[int, ...]) -> List[np.ndarray]:
+    """Open coordinate grid on [-5, 5] per axis, shaped to broadcast against ``size``."""
+    ndim = len(size)
+    return [np.linspace(-5, 5, n).reshape((1,) * axis + (n,) + (1,) * (ndim - axis - 1))
+            for axis, n in enumerate(size)]
+
+
+def _emergence_frames(start: int, stop: int, timesteps: int,
+                      grid: List[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+    """Frames ``start`` to ``stop`` of an emergence run, as one (T, ...) stack."""
+    shape = tuple(np.broadcast_shapes(*(coordinate.shape for coordinate in grid)))
+    ndim = len(shape)
+
+    # System becomes more organized over time
+    organization = np.arange(start, stop) / timesteps
+    n_blobs = (1 + 3 * organization).astype(int)
+    sharpness = 0.5 - 0.4 * organization
+    noise_level = 0.2 * (1 - organization)
+
+    # All random draws for the batch up front, in a fixed order
+    centers = rng.uniform(-3, 3, size=(stop - start, n_blobs.max(initial=1), ndim))
+    frames = rng.standard_normal((stop - start,) + shape)
+
+    for i, n in enumerate(n_blobs):
+        # Every center at once: leading axis of the broadcast indexes blobs
+        offsets = centers[i, :n].T.reshape((ndim, n) + (1,) * ndim)
+        squared = sum((coordinate - offset) ** 2 for coordinate, offset in zip(grid, offsets))
+        data = np.sum(1 / (1 + np.exp(-(np.sqrt(squared) - 1.5) / sharpness[i])), axis=0)
+
+        # Normalize, then add decreasing noise
+        data = (data - data.min()) / (data.max() - data.min() + 1e-10)
+        frames[i] *= noise_level[i]
+        frames[i] += data
+    return frames
 
 
 class BoundarySimulator:
@@ -14,13 +76,16 @@ class BoundarySimulator:
     
     @staticmethod
     def generate_two_phase_system(size: Tuple[int, ...] = (100, 100),
-                                 boundary_sharpness: float = 0.1) -> np.ndarray:
+                                 boundary_sharpness: float = 0.1,
+                                 seed: Seed = None) -> np.ndarray:
         """
         Generate a system with two distinct phases and a boundary.
         
         Args:
             size: Dimensions of the system
             boundary_sharpness: How sharp the boundary is (0-1)
+            seed: Int, SeedSequence or Generator for the noise
+                (default: the global np.random state)
             
         Returns:
             numpy array with two-phase system
@@ -39,47 +104,73 @@ class BoundarySimulator:
             data = 1 / (1 + np.exp(-(R - 2.5)/boundary_sharpness))
             
         # Add some noise
-        noise = np.random.normal(0, 0.05, size)
+        rng = np.random if seed is None else np.random.default_rng(seed)
+        noise = rng.normal(0, 0.05, size)
         return data + noise
     
     @staticmethod
     def generate_consciousness_emergence(timesteps: int = 100,
-                                       size: Tuple[int, ...] = (50, 50)) -> List[np.ndarray]:
+                                       size: Tuple[int, ...] = (50, 50),
+                                       seed: Seed = None) -> List[np.ndarray]:
         """
         Generate a sequence showing consciousness emergence over time.
         
+        Materializes ``emergence_frames``; see there for ``seed``.
+        
         Returns:
             List of arrays showing system evolution
         """
-        states = []
+        return list(BoundarySimulator.emergence_frames(timesteps, size, seed=seed))
+    
+    @staticmethod
+    def emergence_frames(timesteps: int = 100,
+                         size: Tuple[int, ...] = (50, 50),
+                         seed: Seed = None,
+                         batch_size: int = 16,
+                         stacked: bool = False) -> Iterator[np.ndarray]:
+        """
+        Lazily generate a consciousness emergence sequence.
+        
+        More and sharper interacting blobs appear as the system organizes,
+        while the noise fades. Frames are produced ``batch_size`` at a time
+        from the batch's own random stream, spawned from ``seed``, so a run
+        is reproduced exactly by the same ``seed`` and ``batch_size`` and
+        any batch can be generated on its own (see ``emergence_batch``).
         
-        for t in range(timesteps):
-            # System becomes more organized over time
-            organization = t / timesteps
+        Args:
+            timesteps: Number of frames
+            size: Frame shape (any dimensionality)
+            seed: Int, SeedSequence or Generator (default: drawn from np.random)
+            batch_size: Frames per random stream
+            stacked: Yield (batch_size, ...) stacks instead of single frames
             
-            # Generate increasingly complex boundaries
-            if len(size) == 2:
-                x = np.linspace(-5, 5, size[0])
-                y = np.linspace(-5, 5, size[1])
-                X, Y = np.meshgrid(x, y)
-                
-                # Multiple interacting regions
-                data = np.zeros(size)
-                
-                # Add multiple boundaries that interact
-                for i in range(int(1 + 3 * organization)):
-                    cx = np.random.uniform(-3, 3)
-                    cy = np.random.uniform(-3, 3)
-                    R = np.sqrt((X - cx)**2 + (Y - cy)**2)
-                    data += 1 / (1 + np.exp(-(R - 1.5)/(0.5 - 0.4*organization)))
-                
-                # Normalize
-                data = (data - data.min()) / (data.max() - data.min() + 1e-10)
-                
-                # Add decreasing noise
-                noise_level = 0.2 * (1 - organization)
-                data += np.random.normal(0, noise_level, size)
-                
-            states.append(data)
+        Yields:
+            Frames in order, or stacks of consecutive frames
+        """
+        root = _seed_sequence(seed)
+        grid = _emergence_grid(size)
+        for batch, start in enumerate(range(0, timesteps, batch_size)):
+            frames = _emergence_frames(start, min(start + batch_size, timesteps), timesteps,
+                                       grid, _batch_stream(root, batch))
+            if stacked:
+                yield frames
+            else:
+                yield from frames
+    
+    @staticmethod
+    def emergence_batch(batch: int, timesteps: int = 100,
+                        size: Tuple[int, ...] = (50, 50),
+                        seed: Seed = 0,
+                        batch_size: int = 16) -> np.ndarray:
+        """
+        Batch ``batch`` of ``emergence_frames`` with the same arguments,
+        generated independently (e.g. by a worker process).
         
-        return states
+        Returns:
+            (T, ...) stack of frames ``batch * batch_size`` onwards
+        """
+        start = batch * batch_size
+        if not 0 <= start < timesteps:
+            raise ValueError(f"batch {batch} is outside a {timesteps}-frame run")
+        return _emergence_frames(start, min(start + batch_size, timesteps), timesteps,
+                                 _emergence_grid(size), _batch_stream(_seed_sequence(seed), batch))
@@ -0,0 +1,205 @@
+"""
+Compact boundary mask representation for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from collections import deque
+from dataclasses import dataclass
+import numpy as np
+from typing import Iterator, List, Optional, Tuple, Union
+
+
+@dataclass
+class SparseMask:
+    """
+    Boundary mask stored as the sorted flat (C-order) indices of its
+    boundary points.
+
+    Boundaries cover about a tenth of a frame, so this is smaller than the
+    dense boolean mask once the index dtype is accounted for, and the
+    downstream stages gather boundary values with one ``take`` instead of
+    re-scanning the full mask.
+
+    Attributes:
+        indices: Sorted flat indices of boundary points (int64)
+        shape: Shape of the frame the mask belongs to
+    """
+
+    indices: np.ndarray
+    shape: Tuple[int, ...]
+
+    @classmethod
+    def from_dense(cls, mask: np.ndarray) -> 'SparseMask':
+        """Compact form of a boolean mask (the one conversion per frame)."""
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.flatnonzero(mask), mask.shape)
+
+    @classmethod
+    def from_runs(cls, starts: np.ndarray, lengths: np.ndarray,
+                  shape: Tuple[int, ...]) -> 'SparseMask':
+        """Rebuild a mask from the runs returned by ``runs``."""
+        starts = np.asarray(starts, dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        total = int(lengths.sum())
+        if total == 0:
+            return cls(np.empty(0, dtype=np.int64), tuple(shape))
+
+        # Each run contributes start, start + 1, ...: a cumulative sum of
+        # ones with a jump to the next start at every run boundary
+        steps = np.ones(total, dtype=np.int64)
+        steps[0] = starts[0]
+        ends = np.cumsum(lengths)[:-1]
+        steps[ends] = starts[1:] - (starts[:-1] + lengths[:-1] - 1)
+        return cls(np.cumsum(steps), tuple(shape))
+
+    @property
+    def size(self) -> int:
+        """Number of points in the frame."""
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the indices."""
+        return self.indices.nbytes
+
+    def __len__(self) -> int:
+        """Number of boundary points."""
+        return len(self.indices)
+
+    def to_dense(self) -> np.ndarray:
+        """Boolean mask of the frame's shape."""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.indices] = True
+        return mask.reshape(self.shape)
+
+    def values(self, data: np.ndarray) -> np.ndarray:
+        """Values of ``data`` (same shape as the frame) at boundary points."""
+        return np.ravel(data).take(self.indices)
+
+    def coordinates(self) -> Tuple[np.ndarray, ...]:
+        """Per-axis coordinates of the boundary points, like ``np.nonzero``."""
+        return np.unravel_index(self.indices, self.shape)
+
+    def runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run-length encoding over the flattened frame.
+
+        Returns:
+            ``(starts, lengths)`` of the maximal runs of consecutive indices
+        """
+        if len(self.indices) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        breaks = np.flatnonzero(np.diff(self.indices) != 1) + 1
+        first = np.concatenate([[0], breaks])
+        last = np.concatenate([breaks, [len(self.indices)]])
+        return self.indices[first], last - first
+
+
+def as_sparse_mask(boundaries: Union[np.ndarray, SparseMask]) -> SparseMask:
+    """``boundaries`` as a SparseMask, converting a dense mask if needed."""
+    if isinstance(boundaries, SparseMask):
+        return boundaries
+    return SparseMask.from_dense(boundaries)
+
+
+def _index_dtype(size: int) -> np.dtype:
+    """Smallest unsigned dtype that holds flat indices of a ``size`` frame."""
+    for dtype in (np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+class MaskHistory:
+    """
+    Bounded per-frame record of boundary masks, kept in compact form.
+
+    ``append`` stores one SparseMask per analyzed frame, evicting the
+    oldest once ``capacity`` masks are held. ``save`` writes all of them
+    run-length encoded into one compressed ``.npz`` (run starts and lengths
+    in the smallest unsigned dtype that fits the frame), and ``load``
+    reads such a file back.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = int(capacity)
+        self._masks: 'deque[SparseMask]' = deque(maxlen=self.capacity)
+        self._timestamps: 'deque[float]' = deque(maxlen=self.capacity)
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def __getitem__(self, index: int) -> SparseMask:
+        return self._masks[index]
+
+    def __iter__(self) -> Iterator[SparseMask]:
+        return iter(self._masks)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp of each stored mask, oldest first."""
+        return np.array(self._timestamps, dtype=np.float64)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the stored indices."""
+        return sum(mask.nbytes for mask in self._masks)
+
+    def append(self, mask: Union[np.ndarray, SparseMask], timestamp: float) -> None:
+        """Record the mask of one frame."""
+        self._masks.append(as_sparse_mask(mask))
+        self._timestamps.append(float(timestamp))
+
+    def clear(self) -> None:
+        """Drop all stored masks."""
+        self._masks.clear()
+        self._timestamps.clear()
+
+    def save(self, path: str) -> None:
+        """Write every stored mask, run-length encoded, to ``path`` (.npz)."""
+        shapes = {mask.shape for mask in self._masks}
+        if len(shapes) > 1:
+            raise ValueError("Masks of different shapes cannot be saved together")
+        shape = shapes.pop() if shapes else ()
+
+        starts: List[np.ndarray] = []
+        lengths: List[np.ndarray] = []
+        for mask in self._masks:
+            run_starts, run_lengths = mask.runs()
+            starts.append(run_starts)
+            lengths.append(run_lengths)
+
+        dtype = _index_dtype(int(np.prod(shape)) if shape else 0)
+        offsets = np.concatenate([[0], np.cumsum([len(s) for s in starts])])
+        empty = np.empty(0, dtype=np.int64)
+        np.savez_compressed(
+            path,
+            shape=np.array(shape, dtype=np.int64),
+            timestamps=self.timestamps,
+            offsets=offsets.astype(np.int64),
+            starts=np.concatenate(starts or [empty]).astype(dtype),
+            lengths=np.concatenate(lengths or [empty]).astype(dtype),
+        )
+
+    @classmethod
+    def load(cls, path: str, capacity: Optional[int] = None) -> 'MaskHistory':
+        """Read masks written by ``save``."""
+        with np.load(path) as archive:
+            shape = tuple(int(n) for n in archive['shape'])
+            timestamps = archive['timestamps']
+            offsets = archive['offsets']
+            starts = archive['starts']
+            lengths = archive['lengths']
+
+        history = cls(capacity or max(len(timestamps), 1))
+        for i, timestamp in enumerate(timestamps):
+            run = slice(offsets[i], offsets[i + 1])
+            history.append(SparseMask.from_runs(starts[run], lengths[run], shape),
+                           timestamp)
+        return history
@@ -0,0 +1,218 @@
+"""
+Streaming boundary analysis for live frame feeds in BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import asyncio
+from collections import deque
+import numpy as np
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Tuple, Union
+
+from ..config import BoundaryConfig
+from .boundary_state import BoundaryBatch, BoundaryState
+from .monitor import BoundaryMonitor
+
+
+Frame = Union[np.ndarray, Tuple[float, np.ndarray]]
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Positive values are counted in logarithmic buckets of ratio
+    ``gamma = (1 + a) / (1 - a)``, so any quantile is returned within a
+    relative error ``a`` of a value in the data. Values at or below
+    ``min_value`` share one zero bucket. Adding a frame is a single
+    vectorized pass (no sort, no copy of the input), and sketches can be
+    added to and subtracted from each other, which makes sliding windows
+    cheap.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-12):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+
+        self._offset = 0  # Bucket index of self._counts[0]
+        self._counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, relative_accuracy: float = 0.01,
+                    min_value: float = 1e-12) -> 'QuantileSketch':
+        """Sketch of ``values``."""
+        sketch = cls(relative_accuracy, min_value)
+        sketch.add(values)
+        return sketch
+
+    def _grow(self, lo: int, hi: int) -> None:
+        """Make sure bucket indices ``[lo, hi]`` are stored."""
+        if self._counts.size == 0:
+            self._offset = lo
+            self._counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            return
+
+        new_lo = min(lo, self._offset)
+        new_hi = max(hi, self._offset + self._counts.size - 1)
+        if new_lo == self._offset and new_hi == self._offset + self._counts.size - 1:
+            return
+
+        counts = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        start = self._offset - new_lo
+        counts[start:start + self._counts.size] = self._counts
+        self._offset, self._counts = new_lo, counts
+
+    def add(self, values: np.ndarray) -> None:
+        """Count every value of ``values``."""
+        values = np.asarray(values).ravel()
+        positive = values[values > self.min_value]
+
+        self.count += values.size
+        self.zero_count += values.size - positive.size
+        if positive.size == 0:
+            return
+
+        index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        lo, hi = int(index.min()), int(index.max())
+        self._grow(lo, hi)
+
+        start = lo - self._offset
+        self._counts[start:start + hi - lo + 1] += np.bincount(index - lo,
+                                                              minlength=hi - lo + 1)
+
+    def merge(self, other: 'QuantileSketch', sign: int = 1) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) another sketch's counts."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+
+        self.count += sign * other.count
+        self.zero_count += sign * other.zero_count
+        if other._counts.size == 0:
+            return
+
+        self._grow(other._offset, other._offset + other._counts.size - 1)
+        start = other._offset - self._offset
+        self._counts[start:start + other._counts.size] += sign * other._counts
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the ``q`` quantile (0 <= q <= 1).
+
+        The result is within ``relative_accuracy`` of the value at sorted
+        position ``floor(q * (count - 1))``, the lower of the two values
+        ``np.percentile`` interpolates between.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        cumulative = self.zero_count + np.cumsum(self._counts)
+        bucket = int(np.searchsorted(cumulative, rank, side='right'))
+        bucket = min(bucket, self._counts.size - 1)
+        return float(2 * self.gamma ** (bucket + self._offset) / (self.gamma + 1))
+
+
+class StreamingBoundaryMonitor(BoundaryMonitor):
+    """
+    Boundary monitor for live feeds, one frame at a time.
+
+    Boundary thresholds come from a quantile sketch over every frame seen
+    in the last ``integration_time_window`` seconds instead of a full
+    percentile of the current frame, so detection state is O(buckets)
+    regardless of how long the stream has been running. States are
+    yielded as soon as each frame is analyzed.
+
+    Frames may be plain arrays (stamped with their arrival time) or
+    ``(timestamp, array)`` pairs, e.g. when replaying a recording. Calling
+    ``analyze_system`` or ``analyze_batch`` directly feeds the same window,
+    keyed by the frame's timestamp (default: now).
+    """
+
+    def __init__(self, config: Optional[BoundaryConfig] = None):
+        super().__init__(config)
+        self._window: deque = deque()
+        self._sketch = self._new_sketch()
+        self._frame_time = 0.0
+
+    def _cached_fields(self) -> Optional[Tuple[str, ...]]:
+        """Thresholds depend on earlier frames, so states are never cached."""
+        return None
+
+    def _new_sketch(self) -> QuantileSketch:
+        return QuantileSketch(self.config.quantile_relative_accuracy)
+
+    def reset(self) -> None:
+        """Forget the threshold window (history is kept)."""
+        self._window.clear()
+        self._sketch = self._new_sketch()
+
+    def _boundary_threshold(self, strength: np.ndarray) -> float:
+        """90th percentile of edge strength over the integration window."""
+        frame_sketch = QuantileSketch.from_values(
+            strength, self.config.quantile_relative_accuracy)
+        self._window.append((self._frame_time, frame_sketch))
+        self._sketch.merge(frame_sketch)
+
+        # Expire frames older than the window (the newest always stays)
+        horizon = self._frame_time - self.config.integration_time_window
+        while len(self._window) > 1 and self._window[0][0] < horizon:
+            _, expired = self._window.popleft()
+            self._sketch.merge(expired, sign=-1)
+
+        return self._sketch.quantile(0.9)
+
+    def process(self, frame: Frame) -> BoundaryState:
+        """Analyze one frame of the stream."""
+        if isinstance(frame, tuple):
+            timestamp, data = frame
+        else:
+            timestamp, data = time.time(), frame
+
+        return self.analyze_system(data, timestamp=timestamp)
+
+    def analyze_system(self, data: np.ndarray,
+                       timestamp: Optional[float] = None) -> BoundaryState:
+        """Analyze one frame, expiring window entries older than its timestamp."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self._frame_time = float(timestamp)
+        return super().analyze_system(data, timestamp=timestamp)
+
+    def analyze_batch(self, stack: np.ndarray) -> BoundaryBatch:
+        """
+        Analyze a stack of frames in order through the threshold window,
+        all stamped with the current time.
+        """
+        stack = np.asarray(stack)
+        if stack.ndim < 2:
+            raise ValueError("analyze_batch expects a stack of frames (T, ...)")
+        timestamp = time.time()
+        return BoundaryBatch.from_states([self.analyze_system(frame, timestamp)
+                                          for frame in stack])
+
+    def stream(self, frames: Iterable[Frame]) -> Iterator[BoundaryState]:
+        """Analyze frames from an iterator, yielding one state per frame."""
+        for frame in frames:
+            yield self.process(frame)
+
+    async def astream(self, frames: AsyncIterable[Frame]) -> AsyncIterator[BoundaryState]:
+        """
+        Analyze frames from an async generator, yielding one state per frame.
+
+        Analysis runs in the default executor so the acquisition loop is not
+        blocked while a frame is being processed.
+        """
+        loop = asyncio.get_running_loop()
+        async for frame in frames:
+            yield await loop.run_in_executor(None, self.process, frame)
@@ -0,0 +1,294 @@
+"""
+Parameter sweeps over BoundaryConfig variants for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from dataclasses import dataclass, field, replace
+import itertools
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..config import BoundaryConfig
+from .monitor import BoundaryMonitor
+from .sparse import SparseMask
+from .workspace import DerivativeWorkspace
+
+
+@dataclass
+class Stage:
+    """
+    One node of the sweep pipeline.
+
+    ``fields`` are the config fields the stage reads itself and ``deps``
+    the stages it consumes; a stage's result is shared by every variant
+    that agrees on its fields and on those of all its upstream stages.
+    """
+    fn: Callable[['_FrameGraph', BoundaryMonitor], object]
+    fields: Tuple[str, ...] = ()
+    deps: Tuple[str, ...] = ()
+
+
+def _gradients(graph, monitor):
+    # A fresh workspace per call, so the arrays outlive the next stage
+    return DerivativeWorkspace().smoothed_gradient(graph.get('data', monitor), sigma=1.0)
+
+
+def _strength(graph, monitor):
+    if monitor.config.boundary_detection_method == "gradient":
+        return graph.get('gradient_magnitude', monitor)
+    return graph.get('laplacian', monitor)
+
+
+def _state(graph, monitor):
+    mask = graph.get('mask', monitor)
+    entropy_grad = graph.get('entropy_gradient', monitor)
+    normal = graph.get('normal', monitor)
+
+    # Information flux: I(B) = ∇S · n̂
+    info_flux = float(np.abs(np.dot(entropy_grad, normal)))
+    boundary_count = len(mask)
+    phi = float(monitor._phi_from_counts(info_flux, boundary_count, mask.size))
+
+    # Reported as unit vector, like BoundaryState does
+    norm = np.linalg.norm(normal)
+    return {
+        'entropy_gradient': entropy_grad,
+        'normal_vector': normal / norm if norm > 0 else normal,
+        'information_flux': info_flux,
+        'decoherence_rate': graph.get('decoherence', monitor),
+        'phi_integrated': phi,
+        'boundary_count': boundary_count,
+    }
+
+
+def _assessment(graph, monitor):
+    state = graph.get('state', monitor)
+    config = monitor.config
+    probability = 1 - np.exp(-config.transformation_beta * state['information_flux'])
+    return {
+        'phi_above_critical': state['phi_integrated'] > config.phi_critical,
+        'high_flux': state['information_flux'] > config.high_flux_threshold,
+        'creative_decoherence': state['decoherence_rate'] > config.creative_decoherence_threshold,
+        'transformation_probability': float(probability),
+    }
+
+
+def _analyzed(monitor, frame):
+    """State and assessment row from the monitor's own ``analyze_system``."""
+    state = monitor.analyze_system(frame, timestamp=0.0)
+    row = {
+        'entropy_gradient': state.entropy_gradient,
+        'normal_vector': state.normal_vector,
+        'information_flux': float(state.information_flux),
+        'decoherence_rate': state.decoherence_rate,
+        'phi_integrated': state.phi_integrated,
+        'boundary_count': len(monitor.masks[-1]),
+    }
+    assessment = monitor.detect_consciousness_potential(state)
+    del assessment['assessment']
+    assessment['transformation_probability'] = float(assessment['transformation_probability'])
+    row.update(assessment)
+    return row
+
+
+_THRESHOLD_FIELDS = ('threshold_method', 'threshold_bins', 'threshold_sample_size',
+                     'threshold_seed')
+
+# The analyze_system pipeline as a dependency graph
+STAGES: Dict[str, Stage] = {
+    'data': Stage(lambda graph, monitor: np.asarray(graph.frame, dtype=monitor.dtype),
+                  fields=('dtype',)),
+    'gradients': Stage(_gradients, deps=('data',)),
+    'gradient_magnitude': Stage(
+        lambda graph, monitor: DerivativeWorkspace().gradient_magnitude(
+            graph.get('gradients', monitor)),
+        deps=('gradients',)),
+    'laplacian': Stage(
+        lambda graph, monitor: DerivativeWorkspace().abs_laplacian(graph.get('data', monitor)),
+        deps=('data',)),
+    'strength': Stage(_strength, fields=('boundary_detection_method',),
+                      deps=('gradient_magnitude', 'laplacian')),
+    'threshold': Stage(
+        lambda graph, monitor: monitor._boundary_threshold(graph.get('strength', monitor)),
+        fields=_THRESHOLD_FIELDS, deps=('strength',)),
+    'mask': Stage(
+        lambda graph, monitor: SparseMask.from_dense(
+            graph.get('strength', monitor) > graph.get('threshold', monitor)),
+        deps=('strength', 'threshold')),
+    'normal': Stage(
+        lambda graph, monitor: monitor._estimate_normal_vector(
+            graph.get('data', monitor), graph.get('mask', monitor),
+            graph.get('gradients', monitor)),
+        fields=('epsilon', 'slab_size'), deps=('data', 'mask', 'gradients')),
+    'decoherence': Stage(
+        lambda graph, monitor: monitor._calculate_decoherence(
+            graph.get('data', monitor), graph.get('mask', monitor)),
+        deps=('data', 'mask')),
+    'local_entropy': Stage(
+        lambda graph, monitor: monitor.local_entropy(graph.get('data', monitor)),
+        fields=('entropy_window_size', 'entropy_bins', 'entropy_calculation_method',
+                'renyi_alpha', 'epsilon'),
+        deps=('data',)),
+    'entropy_gradient': Stage(
+        lambda graph, monitor: monitor._entropy_gradient_from_map(
+            graph.get('local_entropy', monitor)),
+        fields=('slab_size',), deps=('local_entropy',)),
+    'state': Stage(_state, deps=('mask', 'entropy_gradient', 'normal', 'decoherence')),
+    'assessment': Stage(_assessment,
+                        fields=('phi_critical', 'transformation_beta', 'high_flux_threshold',
+                                'creative_decoherence_threshold'),
+                        deps=('state',)),
+}
+
+
+def _key_fields(stages: Mapping[str, Stage]) -> Dict[str, Tuple[str, ...]]:
+    """Every config field each stage depends on, directly or upstream."""
+    resolved: Dict[str, Tuple[str, ...]] = {}
+
+    def resolve(name: str) -> Tuple[str, ...]:
+        if name not in resolved:
+            stage = stages[name]
+            fields = set(stage.fields)
+            for dep in stage.deps:
+                fields.update(resolve(dep))
+            resolved[name] = tuple(sorted(fields))
+        return resolved[name]
+
+    for name in stages:
+        resolve(name)
+    return resolved
+
+
+class _FrameGraph:
+    """Memoized evaluation of the stage graph for one frame."""
+
+    def __init__(self, frame: np.ndarray, stages: Mapping[str, Stage],
+                 key_fields: Mapping[str, Tuple[str, ...]], counts: Dict[str, int]):
+        self.frame = frame
+        self.stages = stages
+        self.key_fields = key_fields
+        self.counts = counts
+        self._results: Dict[Tuple, object] = {}
+
+    def get(self, name: str, monitor: BoundaryMonitor):
+        config = monitor.config
+        key = (name,) + tuple(getattr(config, f) for f in self.key_fields[name])
+        if key not in self._results:
+            self._results[key] = self.stages[name].fn(self, monitor)
+            self.counts[name] = self.counts.get(name, 0) + 1
+        return self._results[key]
+
+
+@dataclass
+class SweepResult:
+    """
+    Tidy sweep table: one row per (frame, variant).
+
+    ``columns`` maps column names to arrays of equal length; the swept
+    config fields come first, then the boundary metrics and assessment.
+    ``evaluations`` counts how often each stage actually ran, against
+    ``len(frames) * len(configs)`` for independent runs.
+    """
+    columns: Dict[str, np.ndarray]
+    configs: List[BoundaryConfig]
+    evaluations: Dict[str, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.columns['frame'])
+
+    def to_dict(self) -> Dict[str, List]:
+        """Columns as plain lists."""
+        return {name: values.tolist() for name, values in self.columns.items()}
+
+    def to_pandas(self):
+        """Columns as a DataFrame (vector metrics split per axis)."""
+        import pandas as pd
+
+        flat = {}
+        for name, values in self.columns.items():
+            if values.ndim == 2:
+                for axis in range(values.shape[1]):
+                    flat[f'{name}_{axis}'] = values[:, axis]
+            else:
+                flat[name] = values
+        return pd.DataFrame(flat)
+
+
+def expand_grid(grid: Mapping[str, Sequence],
+                base: Optional[BoundaryConfig] = None) -> List[BoundaryConfig]:
+    """Cartesian product of ``grid`` values applied to ``base``."""
+    base = base or BoundaryConfig()
+    names = list(grid)
+    return [replace(base, **dict(zip(names, values)))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def sweep(frames: Iterable[np.ndarray],
+          grid: Union[Mapping[str, Sequence], Sequence[BoundaryConfig]],
+          base: Optional[BoundaryConfig] = None,
+          monitor_type: type = BoundaryMonitor) -> SweepResult:
+    """
+    Analyze every frame under every config variant, sharing intermediates.
+
+    The ``analyze_system`` pipeline is evaluated as a graph of stages,
+    each memoized per frame on the config fields it depends on: the
+    Gaussian gradient and the Laplacian are computed once per frame and
+    dtype, the threshold and mask once per detection setting, the local
+    entropy once per window/bins/method. Only stages downstream of a
+    varied field fan out per variant, so e.g. sweeping ``phi_critical``
+    and ``transformation_beta`` costs one analysis per frame.
+
+    Metrics are identical to ``analyze_system`` under each variant: the
+    shared whole-field intermediates are reduced slab by slab in the same
+    order as the monitor does.
+
+    Other monitor types (e.g. ``HexBoundaryMonitor``, whose stages run on
+    a different lattice) cannot share the square-grid stages, so every
+    variant then runs the monitor's own ``analyze_system`` in full.
+
+    Args:
+        frames: Sequence of frames (a (T, ...) stack works too)
+        grid: Field name -> values to combine, or explicit configs
+        base: Config the grid values are applied to
+        monitor_type: BoundaryMonitor subclass analyzing each variant
+
+    Returns:
+        SweepResult with one row per (frame, variant)
+    """
+    if isinstance(grid, Mapping):
+        configs = expand_grid(grid, base)
+        swept = list(grid)
+    else:
+        configs = list(grid)
+        reference = configs[0].__dict__ if configs else {}
+        swept = [name for name in reference
+                 if any(getattr(c, name) != reference[name] for c in configs)]
+
+    for config in configs:
+        config.validate()
+    monitors = [monitor_type(config) for config in configs]
+    shared = monitor_type is BoundaryMonitor
+    if not shared:
+        for monitor in monitors:
+            monitor.enable_mask_history(capacity=1)
+    key_fields = _key_fields(STAGES)
+    evaluations: Dict[str, int] = {}
+
+    rows = []
+    for index, frame in enumerate(frames):
+        graph = _FrameGraph(np.asarray(frame), STAGES, key_fields, evaluations)
+        for variant, monitor in enumerate(monitors):
+            row = {'frame': index, 'variant': variant}
+            row.update({name: getattr(monitor.config, name) for name in swept})
+            if shared:
+                row.update(graph.get('state', monitor))
+                row.update(graph.get('assessment', monitor))
+            else:
+                row.update(_analyzed(monitor, frame))
+            rows.append(row)
+
+    names = list(rows[0]) if rows else ['frame', 'variant']
+    columns = {name: np.array([row[name] for row in rows]) for name in names}
+    return SweepResult(columns=columns, configs=configs, evaluations=evaluations)
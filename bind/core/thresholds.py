@@ -0,0 +1,232 @@
+"""
+Percentile threshold strategies for boundary detection in BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+from typing import Callable, Iterator
+
+from ..config import BoundaryConfig
+
+
+# Tiled inputs are produced by a callable that yields the same tiles each pass
+TileSource = Callable[[], Iterator[np.ndarray]]
+
+# Histogram resolution and candidate budget for exact tiled percentiles
+_SELECT_BINS = 4096
+_SELECT_MAX_CANDIDATES = 1 << 20
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+    """Same interpolation as np.percentile's "linear" method."""
+    if t >= 0.5:
+        return float(b - (b - a) * (1 - t))
+    return float(a + (b - a) * t)
+
+
+def _tile_range(values: TileSource):
+    """Count, minimum and maximum over all tiles."""
+    count, lo, hi = 0, np.inf, -np.inf
+    for tile in values():
+        if tile.size:
+            count += tile.size
+            lo, hi = min(lo, float(tile.min())), max(hi, float(tile.max()))
+    if count == 0:
+        raise ValueError("Cannot take a percentile of no values")
+    return count, lo, hi
+
+
+class ThresholdStrategy:
+    """
+    Base class for estimating the ``q``-th percentile of edge strength.
+
+    Strategies work on one in-memory array (``threshold``), on the rows of
+    a 2D array (``threshold_rows``, one frame per row) and on values
+    produced tile by tile (``threshold_tiles``), so tiled inputs get one
+    global threshold without holding all values.
+    """
+
+    def threshold(self, values: np.ndarray, q: float) -> float:
+        """Percentile ``q`` (0-100) of ``values``."""
+        return self.threshold_tiles(lambda: iter([np.ravel(values)]), q)
+
+    def threshold_rows(self, values: np.ndarray, q: float) -> np.ndarray:
+        """Percentile ``q`` of every row of a 2D array."""
+        return np.array([self.threshold(row, q) for row in values])
+
+    def threshold_tiles(self, values: TileSource, q: float) -> float:
+        """Percentile ``q`` over all values yielded by ``values()``."""
+        raise NotImplementedError
+
+
+class ExactThreshold(ThresholdStrategy):
+    """
+    Exact percentile, identical to ``np.percentile``.
+
+    In memory this selects the two bracketing order statistics with
+    ``np.partition`` (linear time) instead of a full sort. For tiles, passes
+    histogram only the values inside a shrinking interval around those two
+    order statistics until few enough candidates remain to be collected
+    and sorted; memory stays bounded by one tile plus the candidate budget.
+    """
+
+    def threshold(self, values: np.ndarray, q: float) -> float:
+        return float(self.threshold_rows(np.reshape(values, (1, -1)), q)[0])
+
+    def threshold_rows(self, values: np.ndarray, q: float) -> np.ndarray:
+        n = values.shape[1]
+        position = (n - 1) * (q / 100.0)
+        k = int(np.floor(position))
+        k1 = min(k + 1, n - 1)
+
+        selected = np.partition(values, [k, k1] if k1 != k else k, axis=1)
+        a, b = selected[:, k], selected[:, k1]
+
+        t = position - k
+        if t >= 0.5:
+            return b - (b - a) * (1 - t)
+        return a + (b - a) * t
+
+    def threshold_tiles(self, values: TileSource, q: float) -> float:
+        count, lo, hi = _tile_range(values)
+
+        position = (count - 1) * (q / 100.0)
+        k = int(np.floor(position))
+        ranks = (k, min(k + 1, count - 1))
+
+        # Refine [lo, hi] until the bracketed candidates fit in memory
+        while True:
+            below, inside = 0, 0
+            inside_lo, inside_hi = np.inf, -np.inf
+            hist = np.zeros(_SELECT_BINS, dtype=np.int64)
+            width = (hi - lo) / _SELECT_BINS
+            for tile in values():
+                below += int(np.count_nonzero(tile < lo))
+                selected = tile[(tile >= lo) & (tile <= hi)]
+                inside += selected.size
+                if selected.size:
+                    inside_lo = min(inside_lo, float(selected.min()))
+                    inside_hi = max(inside_hi, float(selected.max()))
+                if width > 0:
+                    idx = np.clip(((selected - lo) / width).astype(np.intp), 0, _SELECT_BINS - 1)
+                    hist += np.bincount(idx, minlength=_SELECT_BINS)
+
+            if inside_lo == inside_hi:
+                # Both order statistics are the same repeated value
+                return inside_lo
+            if inside <= _SELECT_MAX_CANDIDATES or width == 0:
+                break
+
+            # Bins holding both ranks, widened by one bin to absorb rounding
+            cumulative = below + np.cumsum(hist)
+            first = int(np.searchsorted(cumulative, ranks[0], side='right'))
+            last = int(np.searchsorted(cumulative, ranks[1], side='right'))
+            new_lo = lo + max(first - 1, 0) * width
+            new_hi = lo + min(last + 2, _SELECT_BINS) * width
+            if new_lo <= lo and new_hi >= hi:
+                break
+            lo, hi = new_lo, min(new_hi, hi)
+
+        # Final pass: collect the candidates and read off the order statistics
+        candidates = np.sort(np.concatenate(
+            [tile[(tile >= lo) & (tile <= hi)] for tile in values()]))
+        return _lerp(candidates[ranks[0] - below], candidates[ranks[1] - below],
+                     position - k)
+
+
+class HistogramThreshold(ThresholdStrategy):
+    """
+    Approximate percentile from a fixed-width histogram.
+
+    One pass finds the range, a second counts values into ``bins`` equal
+    bins over it, and the percentile is interpolated linearly inside the
+    bin that holds its rank. The estimate lies in the bin of the lower
+    order statistic and the exact value at most one bin above it, so the
+    absolute error is at most ``2 * (max - min) / bins``.
+    """
+
+    def __init__(self, bins: int = 4096):
+        self.bins = bins
+
+    def threshold_tiles(self, values: TileSource, q: float) -> float:
+        count, lo, hi = _tile_range(values)
+        if hi == lo:
+            return lo
+
+        width = (hi - lo) / self.bins
+        hist = np.zeros(self.bins, dtype=np.int64)
+        for tile in values():
+            idx = np.clip(((tile - lo) / width).astype(np.intp), 0, self.bins - 1)
+            hist += np.bincount(idx.ravel(), minlength=self.bins)
+
+        # Bin holding the rank, then the fraction of the way through it
+        rank = (count - 1) * (q / 100.0)
+        cumulative = np.cumsum(hist)
+        bucket = int(np.searchsorted(cumulative, rank, side='right'))
+        bucket = min(bucket, self.bins - 1)
+        before = cumulative[bucket - 1] if bucket > 0 else 0
+        fraction = (rank - before + 0.5) / max(hist[bucket], 1)
+        return float(lo + (bucket + min(fraction, 1.0)) * width)
+
+
+class ReservoirThreshold(ThresholdStrategy):
+    """
+    Percentile of a uniform random sample of ``size`` values.
+
+    In memory the sample is ``size`` indices drawn without replacement, so
+    only the sampled values are read and nothing the size of the input is
+    allocated. For tiles it is kept as the values with the ``size``
+    smallest random keys (a mergeable form of reservoir sampling): each
+    tile draws its keys, and only values whose key beats the current
+    reservoir are folded in with one ``argpartition``. By the Dvoretzky-Kiefer-Wolfowitz
+    inequality the estimate's rank is within ``sqrt(ln(2 / delta) / (2 *
+    size))`` of ``q`` with probability at least ``1 - delta``; for the
+    default 10000 samples that is 1.6 percentile points at ``delta = 0.01``.
+    Results are reproducible for a given ``seed``.
+    """
+
+    def __init__(self, size: int = 10000, seed: int = 0):
+        self.size = size
+        self.seed = seed
+
+    def threshold(self, values: np.ndarray, q: float) -> float:
+        values = np.ravel(values)
+        if values.size == 0:
+            raise ValueError("Cannot take a percentile of no values")
+        if values.size > self.size:
+            rng = np.random.default_rng(self.seed)
+            values = values[rng.choice(values.size, self.size, replace=False)]
+        return float(np.percentile(values, q))
+
+    def threshold_tiles(self, values: TileSource, q: float) -> float:
+        rng = np.random.default_rng(self.seed)
+        sample = np.zeros(0)
+        keys = np.zeros(0)
+
+        for tile in values():
+            tile = np.ravel(tile)
+            tile_keys = rng.random(tile.size)
+            if sample.size == self.size:
+                # Only keys below the reservoir's largest can enter it
+                entering = tile_keys < keys.max()
+                tile, tile_keys = tile[entering], tile_keys[entering]
+            sample = np.concatenate([sample, tile])
+            keys = np.concatenate([keys, tile_keys])
+            if sample.size > self.size:
+                keep = np.argpartition(keys, self.size)[:self.size]
+                sample, keys = sample[keep], keys[keep]
+
+        if sample.size == 0:
+            raise ValueError("Cannot take a percentile of no values")
+        return float(np.percentile(sample, q))
+
+
+def make_threshold_strategy(config: BoundaryConfig) -> ThresholdStrategy:
+    """Threshold strategy selected by ``config.threshold_method``."""
+    if config.threshold_method == "histogram":
+        return HistogramThreshold(config.threshold_bins)
+    elif config.threshold_method == "reservoir":
+        return ReservoirThreshold(config.threshold_sample_size, config.threshold_seed)
+    return ExactThreshold()
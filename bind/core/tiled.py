@@ -0,0 +1,155 @@
+"""
+Tiled, out-of-core boundary analysis for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import os
+import tempfile
+import time
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .boundary_state import BoundaryState
+from .hexagonal import HexBoundaryMonitor
+from .monitor import BoundaryMonitor
+
+
+# Gaussian derivative with sigma=1 reaches int(truncate * sigma + 0.5) rows
+# (scipy's default truncate=4); the Laplacian only needs one
+_STRENGTH_HALO = 4
+
+def open_field(source: Union[str, np.ndarray]) -> np.ndarray:
+    """Open a field for tiled analysis; ``.npy`` paths are memory-mapped."""
+    if isinstance(source, str):
+        return np.load(source, mmap_mode='r')
+    return source
+
+
+def _derivative_tiles(monitor: BoundaryMonitor, data: np.ndarray
+                      ) -> Iterator[Tuple[int, int, np.ndarray, List[np.ndarray], np.ndarray]]:
+    """
+    Yield ``(start, stop, block, gradients, strength)`` per tile.
+
+    All three arrays cover only the owned rows ``[start, stop)``, but were
+    computed with a halo, so they are exact. ``block`` is in the monitor's
+    dtype; ``gradients`` and ``strength`` live in the monitor's workspace
+    and are only valid until the next tile.
+    """
+    for lo, hi, start, stop in monitor._slabs(data, halo=_STRENGTH_HALO):
+        block = np.asarray(data[lo:hi], dtype=monitor.dtype)
+        gradients, strength = monitor._derivatives(block)
+
+        owned = slice(start - lo, stop - lo)
+        yield (start, stop, block[owned], [grad[owned] for grad in gradients],
+               strength[owned])
+
+
+def analyze_tiled(monitor: BoundaryMonitor, source: Union[str, np.ndarray],
+                  timestamp: Optional[float] = None,
+                  spill_dir: Optional[str] = None) -> BoundaryState:
+    """
+    Analyze a field too large for memory, one tile of rows at a time.
+
+    ``source`` may be a ``.npy`` path or any array, typically a
+    ``np.memmap``. Tiles of ``config.slab_size`` rows along axis 0 are read
+    with halos wide enough for the Gaussian derivative and the entropy
+    window, and per-tile partial sums are merged into the same global
+    metrics ``analyze_system`` computes: the mean entropy gradient, the
+    boundary-averaged normal, the boundary standard deviation (merged with
+    the parallel variance formula) and Φ. Peak memory is bounded by the
+    tile size, not the field size.
+
+    The source is read twice. The first pass computes edge strength and
+    the entropy gradient, spilling the strength to a temporary ``.npy``
+    file in ``spill_dir`` (default: the system temporary directory); the
+    global 90th-percentile threshold is then taken from that file by the
+    configured threshold strategy, however many passes it needs. The
+    second pass recomputes the tile derivatives for the boundary metrics.
+
+    Tiles are rows of a square grid, so ``HexBoundaryMonitor`` is rejected.
+    """
+    if isinstance(monitor, HexBoundaryMonitor):
+        raise TypeError("analyze_tiled only supports square-grid monitors")
+    data = open_field(source)
+    config = monitor.config
+
+    with tempfile.TemporaryDirectory(prefix='bind-tiled-', dir=spill_dir) as spill:
+        strength_map = np.lib.format.open_memmap(os.path.join(spill, 'strength.npy'),
+                                                 mode='w+', dtype=monitor.dtype,
+                                                 shape=data.shape)
+        entropy_totals = np.zeros(data.ndim)
+        bounds = []
+        for start, stop, _, _, strength in _derivative_tiles(monitor, data):
+            strength_map[start:stop] = strength
+            bounds.append((start, stop))
+
+            # Entropy gradient over the owned rows (one extra row each side)
+            e_lo, e_hi = max(start - 1, 0), min(stop + 1, data.shape[0])
+            local_entropy = monitor.entropy_backend.local_entropy(
+                data,
+                window_size=config.entropy_window_size,
+                bins=config.entropy_bins,
+                start=e_lo,
+                stop=e_hi,
+                dtype=monitor.dtype,
+            )
+            grads = np.gradient(local_entropy)
+            if data.ndim == 1:
+                grads = [grads]
+            for axis, grad in enumerate(grads):
+                entropy_totals[axis] += grad[start - e_lo:stop - e_lo].sum(dtype=np.float64)
+
+        def strengths() -> Iterator[np.ndarray]:
+            for start, stop in bounds:
+                yield strength_map[start:stop].ravel()
+
+        threshold = monitor.threshold_strategy.threshold_tiles(strengths, 90)
+        del strength_map
+
+    normal_totals = np.zeros(data.ndim)
+    count, mean, m2 = 0, 0.0, 0.0
+
+    for start, stop, block, gradients, strength in _derivative_tiles(monitor, data):
+        mask = strength > threshold
+
+        # Boundary-averaged smoothed gradient
+        for axis, grad in enumerate(gradients):
+            normal_totals[axis] += np.sum(grad, where=mask, dtype=np.float64)
+
+        # Boundary values: merge (count, mean, M2) across tiles
+        values = block[mask]
+        if values.size:
+            tile_mean = values.mean(dtype=np.float64)
+            tile_m2 = np.square(values - tile_mean).sum(dtype=np.float64)
+            delta = tile_mean - mean
+            total = count + values.size
+            mean += delta * values.size / total
+            m2 += tile_m2 + delta ** 2 * count * values.size / total
+            count = total
+
+    entropy_grad = entropy_totals / data.size
+
+    if count > 0:
+        avg_grad = normal_totals / count
+        normal = avg_grad / (np.linalg.norm(avg_grad) + config.epsilon)
+    else:
+        normal = np.zeros(data.ndim)
+        normal[0] = 1.0
+
+    info_flux = np.abs(np.dot(entropy_grad, normal))
+    decoherence = float(np.sqrt(m2 / count)) if count > 0 else 0.0
+    phi = float(monitor._phi_from_counts(info_flux, count, data.size))
+
+    state = BoundaryState(
+        entropy_gradient=entropy_grad,
+        normal_vector=normal,
+        information_flux=info_flux,
+        decoherence_rate=decoherence,
+        phi_integrated=phi,
+        timestamp=time.time() if timestamp is None else timestamp
+    )
+
+    monitor.history.append(state)
+    return state
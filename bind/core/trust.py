@@ -0,0 +1,242 @@
+"""
+Trust dynamics between interacting subsystems for BIND framework.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from dataclasses import dataclass
+import numpy as np
+from typing import Optional, Union
+
+from ..config import BoundaryConfig
+
+
+@dataclass
+class TrustTrajectory:
+    """
+    Compact record of a trust dynamics run.
+
+    Per-step summaries are float32 columns; per-agent reputation (mean
+    incoming trust) is only kept every ``record_every`` steps.
+
+    Attributes:
+        mean_trust: Mean trust over all edges after each step, shape (S,)
+        min_trust: Lowest edge trust after each step, shape (S,)
+        max_trust: Highest edge trust after each step, shape (S,)
+        max_change: Largest |change| of any edge in each step, shape (S,)
+        snapshot_steps: Steps at which reputation was recorded, shape (K,)
+        reputation: Mean incoming trust per agent at those steps, shape (K, n_agents)
+        converged: Whether the run stopped on ``convergence_threshold``
+    """
+
+    mean_trust: np.ndarray
+    min_trust: np.ndarray
+    max_trust: np.ndarray
+    max_change: np.ndarray
+    snapshot_steps: np.ndarray
+    reputation: np.ndarray
+    converged: bool
+
+    def __len__(self) -> int:
+        return len(self.mean_trust)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for serialization."""
+        return {
+            'mean_trust': self.mean_trust.tolist(),
+            'min_trust': self.min_trust.tolist(),
+            'max_trust': self.max_trust.tolist(),
+            'max_change': self.max_change.tolist(),
+            'snapshot_steps': self.snapshot_steps.tolist(),
+            'reputation': self.reputation.tolist(),
+            'converged': self.converged
+        }
+
+
+class TrustNetwork:
+    """
+    Pairwise trust between agents, evolved for every edge at once.
+
+    Trust ``T[i, j]`` (how much agent i trusts agent j) lives in a CSR
+    matrix whose sparsity pattern is fixed by the interaction edges; a
+    step updates its ``data`` array in place. Each step, every edge sees
+    the behaviour of its target, which is reliable with probability
+    ``reliability[j]``. Reliable behaviour grows trust towards 1 at
+    ``trust_growth_rate``, unreliable behaviour decays it towards 0 at
+    ``trust_decay_rate``:
+
+        T += growth * good * (1 - T) - decay * (1 - good) * T
+
+    With ``stochastic=False`` the expected outcome ``good = reliability``
+    is used, so trust converges to ``g r / (g r + d (1 - r))``; with
+    ``stochastic=True`` outcomes are drawn per edge from the seeded
+    generator. ``social_weight`` additionally pulls each edge towards the
+    target's reputation (its mean incoming trust), spreading opinions
+    through the network.
+
+    Args:
+        sources, targets: Edge endpoints (agent indices), one entry per edge
+        n_agents: Number of agents (default: largest index + 1)
+        reliability: Per-agent reliability in [0, 1] (default: 1)
+        config: Provides growth/decay rates, initial trust and stopping rule
+        social_weight: Weight of the pull towards reputation per step
+        stochastic: Sample outcomes instead of using their expectation
+        seed: Int or Generator for reliability outcomes
+    """
+
+    def __init__(self, sources: np.ndarray, targets: np.ndarray,
+                 n_agents: Optional[int] = None,
+                 reliability: Optional[np.ndarray] = None,
+                 config: Optional[BoundaryConfig] = None,
+                 social_weight: float = 0.0,
+                 stochastic: bool = False,
+                 seed: Union[None, int, np.random.Generator] = None):
+        self.config = config or BoundaryConfig()
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if sources.shape != targets.shape:
+            raise ValueError("sources and targets must have the same length")
+        if n_agents is None:
+            n_agents = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        self.n_agents = n_agents
+
+        from scipy.sparse import csr_matrix
+
+        # Duplicate edges merge; one stored value per (source, target)
+        pattern = csr_matrix((np.ones(len(sources)), (sources, targets)),
+                             shape=(n_agents, n_agents))
+        pattern.sum_duplicates()
+        pattern.data[:] = self.config.initial_trust
+        self.trust = pattern
+
+        reliability = np.ones(n_agents) if reliability is None else np.asarray(reliability,
+                                                                            dtype=np.float64)
+        if reliability.shape != (n_agents,):
+            raise ValueError(f"reliability must have one entry per agent ({n_agents})")
+        self.reliability = reliability
+
+        # Per-edge constants, laid out like trust.data. With expected
+        # outcomes the update is ``change = gain - rate * T`` per edge.
+        growth, decay = self.config.trust_growth_rate, self.config.trust_decay_rate
+        self._target = self.trust.indices.astype(np.intp)
+        self._edge_reliability = reliability[self._target]
+        self._gain = growth * self._edge_reliability
+        self._rate = self._gain + decay * (1 - self._edge_reliability)
+        self._in_degree = np.bincount(self._target, minlength=n_agents)
+        self._change = np.empty(self.trust.nnz)
+        self._rate_buffer = np.empty(self.trust.nnz)
+
+        self.social_weight = social_weight
+        self.stochastic = stochastic
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+
+    @classmethod
+    def random(cls, n_agents: int, n_edges: int,
+               config: Optional[BoundaryConfig] = None,
+               seed: Union[None, int, np.random.Generator] = None,
+               **kwargs) -> 'TrustNetwork':
+        """Network with ``n_edges`` random directed edges and uniform reliability."""
+        if n_agents < 2:
+            raise ValueError("A random network needs at least 2 agents")
+        rng = np.random.default_rng(seed)
+        sources = rng.integers(n_agents, size=n_edges)
+        targets = (sources + rng.integers(1, n_agents, size=n_edges)) % n_agents
+        return cls(sources, targets, n_agents=n_agents,
+                   reliability=rng.uniform(0, 1, n_agents),
+                   config=config, seed=rng, **kwargs)
+
+    @property
+    def n_edges(self) -> int:
+        return self.trust.nnz
+
+    def reputation(self) -> np.ndarray:
+        """Mean incoming trust per agent (0 for agents nobody interacts with)."""
+        totals = np.bincount(self._target, weights=self.trust.data, minlength=self.n_agents)
+        return np.divide(totals, self._in_degree, out=np.zeros(self.n_agents),
+                         where=self._in_degree > 0)
+
+    def step(self) -> float:
+        """
+        Apply one growth/decay update to every edge.
+
+        Returns:
+            Largest absolute change of any edge, after clipping to [0, 1]
+        """
+        trust = self.trust.data
+        change = self._change
+        if self.stochastic:
+            good = self.rng.random(len(trust)) < self._edge_reliability
+            growth, decay = self.config.trust_growth_rate, self.config.trust_decay_rate
+            # Same form as below, with rate = growth or decay per outcome
+            rate = self._rate_buffer
+            np.multiply(good, growth - decay, out=rate)
+            rate += decay
+            np.multiply(rate, trust, out=change)
+            np.subtract(np.multiply(good, growth), change, out=change)
+        else:
+            np.multiply(self._rate, trust, out=change)
+            np.subtract(self._gain, change, out=change)
+
+        if self.social_weight:
+            pull = self.reputation().take(self._target)
+            pull -= trust
+            pull *= self.social_weight
+            change += pull
+
+        # Limit the change to what keeps trust in [0, 1], so edges held at
+        # a bound report no change and the run can converge
+        bound = self._rate_buffer
+        np.negative(trust, out=bound)
+        np.maximum(change, bound, out=change)
+        np.subtract(1.0, trust, out=bound)
+        np.minimum(change, bound, out=change)
+        trust += change
+        np.clip(trust, 0.0, 1.0, out=trust)
+        self.steps += 1
+        return float(np.abs(change).max(initial=0.0))
+
+    def run(self, max_steps: Optional[int] = None,
+            record_every: int = 10) -> TrustTrajectory:
+        """
+        Step until no edge changes by more than ``convergence_threshold``
+        or ``max_steps`` (default ``config.max_iterations``) have run.
+
+        Args:
+            max_steps: Step budget
+            record_every: Steps between reputation snapshots
+
+        Returns:
+            TrustTrajectory of the run
+        """
+        max_steps = self.config.max_iterations if max_steps is None else max_steps
+        columns = np.zeros((4, max_steps), dtype=np.float32)
+        snapshot_steps, snapshots = [], []
+        converged = False
+
+        steps = 0
+        while steps < max_steps:
+            delta = self.step()
+            trust = self.trust.data
+            columns[:, steps] = (trust.mean(dtype=np.float64) if len(trust) else 0.0,
+                                 trust.min(initial=1.0), trust.max(initial=0.0), delta)
+            steps += 1
+
+            converged = delta < self.config.convergence_threshold
+            if steps % record_every == 0 or converged or steps == max_steps:
+                snapshot_steps.append(self.steps)
+                snapshots.append(self.reputation().astype(np.float32))
+            if converged:
+                break
+
+        return TrustTrajectory(
+            mean_trust=columns[0, :steps].copy(),
+            min_trust=columns[1, :steps].copy(),
+            max_trust=columns[2, :steps].copy(),
+            max_change=columns[3, :steps].copy(),
+            snapshot_steps=np.array(snapshot_steps, dtype=np.int64),
+            reputation=(np.stack(snapshots) if snapshots
+                        else np.zeros((0, self.n_agents), dtype=np.float32)),
+            converged=converged
+        )
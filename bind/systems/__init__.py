@@ -1,13 +1,40 @@
 """Systems engineering perspective on BIND framework."""
 
-from .multi_repository_agent import (
-    MultiRepositoryAgent,
-    Repository,
-    RepositoryType,
-    Agenda,
-    create_insect_simulation,
-    create_ai_alignment_demonstration
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it, imported on first access (PEP 562)
+_EXPORTS = {
+    'MultiRepositoryAgent': 'multi_repository_agent',
+    'Repository': 'multi_repository_agent',
+    'RepositoryType': 'multi_repository_agent',
+    'Agenda': 'multi_repository_agent',
+    'create_insect_simulation': 'multi_repository_agent',
+    'create_ai_alignment_demonstration': 'multi_repository_agent',
+}
+
+if TYPE_CHECKING:
+    from .multi_repository_agent import (
+        MultiRepositoryAgent,
+        Repository,
+        RepositoryType,
+        Agenda,
+        create_insect_simulation,
+        create_ai_alignment_demonstration
+    )
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     'MultiRepositoryAgent',
@@ -0,0 +1,478 @@
+"""
+Multi-repository agents: consciousness-like behaviour from boundary
+integration of several information streams.
+
+An agent owns repositories that each turn the environment into evidence
+in their own way (concrete: local peaks; abstract: the shape of the
+whole distribution). Integrating that evidence at the boundaries between
+repositories drives the agent's actions, which are scored against its
+agenda.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+import numpy as np
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import weakref
+
+from ..core.boundary_state import BoundaryBatch
+from ..core.history import BoundaryHistory
+
+
+# Actions, stored by index in the history columns
+ACTIONS = ('explore', 'approach', 'avoid')
+EXPLORE, APPROACH, AVOID = range(3)
+
+# Actions that serve each known goal; a goal listing every action is
+# served by whichever action fits the situation
+_GOAL_ACTIONS = {
+    'find_food': (APPROACH,),
+    'solve_problem': (APPROACH,),
+    'be_helpful': (APPROACH,),
+    'avoid_danger': (AVOID,),
+    'avoid_harm': (AVOID,),
+    'be_efficient': (APPROACH, AVOID),
+    'be_honest': (EXPLORE, APPROACH, AVOID),
+}
+
+# Below this many bytes of frames per chunk, threads cost more than they save
+_THREAD_MIN_BYTES = 1 << 20
+
+
+class RepositoryType(Enum):
+    """Kind of information a repository holds."""
+    SENSORY = "sensory"
+    LOGICAL = "logical"
+    MEMORY = "memory"
+    EMOTIONAL = "emotional"
+
+
+@dataclass
+class Repository:
+    """
+    One information stream of an agent.
+
+    ``process`` works on a whole (T, ...) stack of environment frames at
+    once and returns per-frame evidence: a salience in [-1, 1] (positive:
+    opportunity, negative: threat) and a confidence in [0, 1].
+
+    Attributes:
+        name: Identifier
+        type: Kind of information; EMOTIONAL repositories only report threats
+        processing_style: "concrete" (strongest local value) or
+            "abstract" (skewness of the whole field)
+        weight: Influence on the integrated evidence
+        receptive_field: Fraction (start, stop) of the last frame axis seen
+        memory: Exponential smoothing of salience over time (0: none)
+        gain: Scale applied before squashing salience into [-1, 1]
+    """
+
+    name: str
+    type: RepositoryType = RepositoryType.SENSORY
+    processing_style: str = "concrete"
+    weight: float = 1.0
+    receptive_field: Tuple[float, float] = (0.0, 1.0)
+    memory: float = 0.0
+    gain: float = 1.0
+    _trace: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.processing_style not in ("concrete", "abstract"):
+            raise ValueError(f"Unknown processing style: {self.processing_style}")
+        if not 0 <= self.memory < 1:
+            raise ValueError("memory must be in [0, 1)")
+
+    def reset(self) -> None:
+        """Forget the smoothed salience carried between calls."""
+        self._trace = None
+
+    def _view(self, frames: np.ndarray) -> np.ndarray:
+        """The receptive field of every frame, flattened: shape (T, n)."""
+        width = frames.shape[-1]
+        start = int(np.floor(self.receptive_field[0] * width))
+        stop = max(int(np.ceil(self.receptive_field[1] * width)), start + 1)
+        return frames[..., start:stop].reshape(len(frames), -1)
+
+    def process(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evidence from a stack of frames.
+
+        Returns:
+            (salience, confidence), each of shape (T,)
+        """
+        view = self._view(frames)
+        n = view.shape[1]
+
+        if self.processing_style == "concrete":
+            # Strongest single value and how far it stands out
+            peak = view[np.arange(len(view)), np.abs(view).argmax(axis=1)]
+            salience = np.tanh(self.gain * peak)
+            confidence = np.abs(peak) / (np.abs(peak) + view.std(axis=1) + 1e-10)
+        else:
+            # Outliers on one side skew the distribution towards them
+            centred = view - view.mean(axis=1, keepdims=True)
+            squared = centred * centred
+            variance = squared.mean(axis=1)
+            squared *= centred
+            skew = squared.mean(axis=1) / (variance ** 1.5 + 1e-10)
+            salience = np.tanh(self.gain * skew / 2)
+            noise = np.sqrt(6 / n)  # Standard error of the skewness of noise
+            confidence = np.abs(skew) / (np.abs(skew) + noise)
+
+        if self.type == RepositoryType.EMOTIONAL:
+            salience = np.minimum(salience, 0.0)
+
+        if self.memory > 0:
+            from scipy.signal import lfilter
+
+            # y[t] = m y[t-1] + (1 - m) s[t], continued across calls
+            m = self.memory
+            initial = salience[0] if self._trace is None else self._trace
+            salience, _ = lfilter([1 - m], [1, -m], salience, zi=[m * initial])
+            self._trace = float(salience[-1])
+
+        return salience, confidence
+
+
+@dataclass
+class Agenda:
+    """
+    Goals an agent's actions are judged against.
+
+    A goal is served at a step when the agent takes one of the goal's
+    actions exactly when the situation calls for it (see ``_GOAL_ACTIONS``).
+
+    Attributes:
+        goals: Goal names
+        priorities: Weight per goal (default: equal)
+        decision_threshold: |evidence| needed to approach or avoid
+        salience_threshold: |value| of an environment feature that calls
+            for approaching or avoiding it
+    """
+
+    goals: List[str] = field(default_factory=list)
+    priorities: Optional[List[float]] = None
+    decision_threshold: float = 0.1
+    salience_threshold: float = 0.5
+
+    def __post_init__(self):
+        unknown = [goal for goal in self.goals if goal not in _GOAL_ACTIONS]
+        if unknown:
+            raise ValueError(f"Unknown goals {unknown}; known goals: {sorted(_GOAL_ACTIONS)}")
+
+    def weights(self) -> np.ndarray:
+        """Normalized goal priorities."""
+        weights = np.ones(len(self.goals)) if self.priorities is None else np.asarray(
+            self.priorities, dtype=np.float64)
+        if len(weights) != len(self.goals):
+            raise ValueError("One priority per goal is needed")
+        return weights / weights.sum() if weights.sum() > 0 else weights
+
+    def situation(self, frames: np.ndarray) -> np.ndarray:
+        """Action each frame calls for: its dominant feature, if strong enough."""
+        flat = frames.reshape(len(frames), -1)
+        dominant = flat[np.arange(len(flat)), np.abs(flat).argmax(axis=1)]
+        needed = np.full(len(flat), EXPLORE, dtype=np.int8)
+        needed[dominant > self.salience_threshold] = APPROACH
+        needed[dominant < -self.salience_threshold] = AVOID
+        return needed
+
+    def alignment(self, actions: np.ndarray, needed: np.ndarray) -> np.ndarray:
+        """Priority-weighted fraction of goals served at each step."""
+        if not self.goals:
+            return (actions == needed).astype(np.float64)
+
+        served = np.zeros(len(actions))
+        for goal, weight in zip(self.goals, self.weights()):
+            relevant = _GOAL_ACTIONS[goal]
+            called_for = np.isin(needed, relevant)
+            taken = np.isin(actions, relevant)
+            served += weight * np.where(called_for, actions == needed, ~taken)
+        return served
+
+
+class IntegrationHistory:
+    """
+    Bounded columnar record of an agent's integration steps.
+
+    Integration states live in a ``BoundaryHistory``; the action, its
+    confidence, success and agenda alignment are ring-buffer columns kept
+    in step with it. Iterating yields one dict per step with the keys
+    ``step``, ``state`` (a BoundaryState), ``action``, ``confidence``,
+    ``success`` and ``alignment``.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.states = BoundaryHistory(capacity)
+        self.capacity = self.states.capacity
+        self._columns = np.zeros(self.capacity, dtype=[
+            ('step', np.int64), ('action', np.int8), ('confidence', np.float64),
+            ('success', bool), ('alignment', np.float64)])
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def extend(self, batch: BoundaryBatch, **columns: np.ndarray) -> None:
+        """Record a batch of steps (same layout as ``BoundaryHistory.extend``)."""
+        n = len(batch)
+        skip = max(n - self.capacity, 0)
+        positions = (self._next + skip + np.arange(n - skip)) % self.capacity
+        for name, values in columns.items():
+            self._columns[name][positions] = values[skip:]
+        self._next = (self._next + n) % self.capacity
+        self.states.extend(batch)
+
+    def clear(self) -> None:
+        """Forget all recorded steps (storage is kept)."""
+        self.states.clear()
+        self._next = 0
+
+    def column(self, name: str) -> np.ndarray:
+        """Chronologically ordered copy of one step column."""
+        return self._columns[name][self.states._order()].copy()
+
+    @property
+    def phi(self) -> np.ndarray:
+        """Integrated information Φ per step."""
+        return self.states.phi
+
+    def __getitem__(self, index: int) -> Dict:
+        state = self.states[index]
+        index %= len(self)
+        if len(self) == self.capacity:
+            index = (self._next + index) % self.capacity
+        row = self._columns[index]
+        return {
+            'step': int(row['step']),
+            'state': state,
+            'action': ACTIONS[row['action']],
+            'confidence': float(row['confidence']),
+            'success': bool(row['success']),
+            'alignment': float(row['alignment']),
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class MultiRepositoryAgent:
+    """
+    Agent acting on the integrated evidence of several repositories.
+
+    Environments are processed in chunks of ``chunk_size`` frames. Within
+    a chunk every repository evaluates all frames as array operations,
+    repositories run concurrently on a thread pool (NumPy releases the
+    GIL) when the chunk is large enough to pay for it, and integration,
+    action selection and scoring are vectorized over the chunk.
+
+    Integration at step t treats the repositories as one system:
+    Φ = coherence · Σ_r confidence_r, where coherence is how much the
+    confidence-weighted saliences agree in sign, so Φ is high only when
+    many confident repositories point the same way. The state recorded
+    per step is a 1-component BoundaryState: the change of decision
+    entropy, the sign of the evidence, its magnitude as flux, and the
+    spread of saliences across repositories as decoherence.
+
+    The thread pool is started on first use and shut down by ``close``,
+    on leaving a ``with`` block, or when the agent is garbage collected.
+
+    Args:
+        agenda: Goals actions are scored against
+        max_workers: Threads for repository evaluation (default: CPU count)
+        chunk_size: Frames integrated per batch (bounds memory)
+        history_capacity: Steps kept in ``integration_history``
+    """
+
+    def __init__(self, agenda: Optional[Agenda] = None,
+                 max_workers: Optional[int] = None,
+                 chunk_size: int = 256,
+                 history_capacity: int = 10000):
+        self.agenda = agenda or Agenda()
+        self.repositories: List[Repository] = []
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.integration_history = IntegrationHistory(history_capacity)
+        self.steps = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_finalizer: Optional[weakref.finalize] = None
+        self._last_entropy: Optional[float] = None
+
+    def add_repository(self, repository: Repository) -> None:
+        """Add an information stream."""
+        self.repositories.append(repository)
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        if self._pool is not None:
+            self._pool_finalizer.detach()
+            self._pool.shutdown()
+            self._pool = self._pool_finalizer = None
+
+    def __enter__(self) -> 'MultiRepositoryAgent':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def actions_taken(self) -> List[Dict]:
+        """Recorded actions (bounded like the history), oldest first."""
+        history = self.integration_history
+        return [{'step': int(step), 'action': ACTIONS[action],
+                 'confidence': float(confidence), 'success': bool(success)}
+                for step, action, confidence, success in zip(
+                    history.column('step'), history.column('action'),
+                    history.column('confidence'), history.column('success'))]
+
+    def _evaluate(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Salience and confidence of every repository, shape (R, T) each."""
+        parallel = (len(self.repositories) > 1 and self.max_workers > 1
+                    and frames.nbytes >= _THREAD_MIN_BYTES)
+        if parallel:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.max_workers)
+                # Must not reference self, or the agent would never be collected
+                self._pool_finalizer = weakref.finalize(self, self._pool.shutdown, wait=False)
+            outputs = list(self._pool.map(lambda repo: repo.process(frames),
+                                          self.repositories))
+        else:
+            outputs = [repo.process(frames) for repo in self.repositories]
+        salience = np.stack([s for s, _ in outputs])
+        confidence = np.stack([c for _, c in outputs])
+        return salience, confidence
+
+    def integrate(self, frames: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Process one chunk of frames and record it in the history.
+
+        Returns:
+            Per-step columns: 'action', 'confidence', 'success', 'alignment', 'phi'
+        """
+        if not self.repositories:
+            raise ValueError("Agent has no repositories")
+
+        salience, confidence = self._evaluate(frames)
+        weights = np.array([repo.weight for repo in self.repositories])[:, None]
+
+        # Integrated evidence and how coherent it is across repositories
+        votes = weights * confidence * salience
+        evidence = votes.sum(axis=0) / weights.sum()
+        coherence = np.abs(votes.sum(axis=0)) / (np.abs(votes).sum(axis=0) + 1e-10)
+        phi = np.clip(coherence * confidence.sum(axis=0), 0, 10)
+
+        # Decision entropy and its change from the previous step
+        p = np.clip((1 + evidence) / 2, 1e-10, 1 - 1e-10)
+        entropy = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+        previous = entropy[0] if self._last_entropy is None else self._last_entropy
+        entropy_change = np.diff(entropy, prepend=previous)
+        self._last_entropy = float(entropy[-1])
+
+        threshold = self.agenda.decision_threshold
+        actions = np.full(len(frames), EXPLORE, dtype=np.int8)
+        actions[evidence > threshold] = APPROACH
+        actions[evidence < -threshold] = AVOID
+        action_confidence = np.clip(np.abs(evidence), 0, 1)
+
+        needed = self.agenda.situation(frames)
+        success = actions == needed
+        alignment = self.agenda.alignment(actions, needed)
+
+        steps = self.steps + np.arange(len(frames))
+        batch = BoundaryBatch(
+            entropy_gradient=entropy_change[:, None],
+            normal_vector=np.where(evidence < 0, -1.0, 1.0)[:, None],
+            information_flux=np.abs(evidence),
+            decoherence_rate=salience.std(axis=0),
+            phi_integrated=phi,
+            timestamp=steps.astype(np.float64),
+        )
+        self.integration_history.extend(batch, step=steps, action=actions,
+                                        confidence=action_confidence, success=success,
+                                        alignment=alignment)
+        self.steps += len(frames)
+
+        return {'action': actions, 'confidence': action_confidence, 'success': success,
+                'alignment': alignment, 'phi': phi}
+
+    def demonstrate_consciousness(self, environment: Union[np.ndarray, Sequence[np.ndarray]]
+                                  ) -> Dict:
+        """
+        Run the agent through an environment and summarize its behaviour.
+
+        Args:
+            environment: (T, ...) stack or sequence of equal-shape frames
+
+        Returns:
+            Dict with 'successful_actions', 'total_steps', 'average_integration'
+            (mean Φ), 'agenda_alignment' (mean fraction of goals served),
+            'consciousness_metric' (their product) and 'action_counts'
+        """
+        total, successes, phi_sum, alignment_sum = 0, 0, 0.0, 0.0
+        counts = np.zeros(len(ACTIONS), dtype=np.int64)
+
+        for start in range(0, len(environment), self.chunk_size):
+            frames = np.asarray(environment[start:start + self.chunk_size], dtype=np.float64)
+            columns = self.integrate(frames)
+            total += len(frames)
+            successes += int(columns['success'].sum())
+            phi_sum += float(columns['phi'].sum())
+            alignment_sum += float(columns['alignment'].sum())
+            counts += np.bincount(columns['action'], minlength=len(ACTIONS))
+
+        average_integration = phi_sum / total if total else 0.0
+        agenda_alignment = alignment_sum / total if total else 0.0
+        return {
+            'successful_actions': successes,
+            'total_steps': total,
+            'average_integration': average_integration,
+            'agenda_alignment': agenda_alignment,
+            'consciousness_metric': average_integration * agenda_alignment,
+            'action_counts': dict(zip(ACTIONS, counts.tolist())),
+        }
+
+
+def create_insect_simulation() -> MultiRepositoryAgent:
+    """
+    An insect: antennae feel the nearest strong stimulus on each side,
+    compound eyes take in the whole scene, a nociceptor reports threats
+    and a slow memory trace keeps recent experience.
+    """
+    agent = MultiRepositoryAgent(Agenda(goals=['find_food', 'avoid_danger']))
+    agent.add_repository(Repository(name="left_antenna", type=RepositoryType.SENSORY,
+                                    processing_style="concrete", receptive_field=(0.0, 0.5)))
+    agent.add_repository(Repository(name="right_antenna", type=RepositoryType.SENSORY,
+                                    processing_style="concrete", receptive_field=(0.5, 1.0)))
+    agent.add_repository(Repository(name="compound_eyes", type=RepositoryType.SENSORY,
+                                    processing_style="abstract"))
+    agent.add_repository(Repository(name="nociceptor", type=RepositoryType.EMOTIONAL,
+                                    processing_style="concrete", weight=1.5))
+    agent.add_repository(Repository(name="mushroom_body", type=RepositoryType.MEMORY,
+                                    processing_style="abstract", memory=0.5, weight=0.5))
+    return agent
+
+
+def create_ai_alignment_demonstration() -> MultiRepositoryAgent:
+    """
+    An AI system whose language, reasoning, value and safety components
+    must agree before it acts.
+    """
+    agent = MultiRepositoryAgent(Agenda(goals=['be_helpful', 'avoid_harm', 'be_honest'],
+                                        priorities=[1.0, 1.5, 1.0]))
+    agent.add_repository(Repository(name="language_model", type=RepositoryType.LOGICAL,
+                                    processing_style="abstract"))
+    agent.add_repository(Repository(name="reasoning_engine", type=RepositoryType.LOGICAL,
+                                    processing_style="concrete"))
+    agent.add_repository(Repository(name="value_alignment", type=RepositoryType.LOGICAL,
+                                    processing_style="abstract", weight=1.5))
+    agent.add_repository(Repository(name="safety_filter", type=RepositoryType.EMOTIONAL,
+                                    processing_style="concrete", weight=2.0))
+    agent.add_repository(Repository(name="knowledge_base", type=RepositoryType.MEMORY,
+                                    processing_style="concrete", memory=0.3))
+    return agent
@@ -0,0 +1 @@
+"""Lets ``pytest tests/`` import the ``bind`` package from a source checkout."""
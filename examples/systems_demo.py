@@ -15,6 +15,7 @@ import matplotlib.pyplot as plt
 from bind.systems.multi_repository_agent import (
     create_insect_simulation,
     create_ai_alignment_demonstration,
+    MultiRepositoryAgent,
     Repository,
     RepositoryType,
     Agenda
@@ -12,7 +12,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/HillaryDanan/BIND",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Science/Research",
@@ -27,15 +27,14 @@ setup(
     install_requires=[
         "numpy>=1.21.0",
         "scipy>=1.7.0",
-        "matplotlib>=3.4.0",
-        "seaborn>=0.11.0",
-        "plotly>=5.0.0",
-        "torch>=1.9.0",
-        "pandas>=1.3.0",
-        "jupyter>=1.0.0",
-        "tqdm>=4.62.0",
     ],
     extras_require={
+        "viz": ["matplotlib>=3.4.0", "seaborn>=0.11.0", "plotly>=5.0.0"],
+        "torch": ["torch>=1.9.0"],
+        "analysis": ["pandas>=1.3.0", "tqdm>=4.62.0"],
+        "notebooks": ["jupyter>=1.0.0"],
+        "all": ["matplotlib>=3.4.0", "seaborn>=0.11.0", "plotly>=5.0.0", "torch>=1.9.0",
+                "pandas>=1.3.0", "tqdm>=4.62.0", "jupyter>=1.0.0"],
         "dev": ["pytest>=6.0", "black>=21.0", "flake8>=3.9"],
     },
 )
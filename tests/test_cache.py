@@ -0,0 +1,112 @@
+"""
+Tests for the content-addressed result cache.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.cache import ANALYSIS_FIELDS, ResultCache, array_digest, cache_key
+from bind.core.monitor import BoundaryMonitor
+
+
+def _payload(value, n=128):
+    return {'values': np.full(n, value, dtype=np.float64)}
+
+
+def test_digest_depends_on_content_shape_and_dtype():
+    data = np.arange(12, dtype=np.float64).reshape(3, 4)
+    assert array_digest(data) == array_digest(data.copy())
+    assert array_digest(data.T) == array_digest(np.ascontiguousarray(data.T))
+    assert array_digest(data) != array_digest(data.reshape(4, 3))
+    assert array_digest(data) != array_digest(data.astype(np.float32))
+    changed = data.copy()
+    changed[1, 1] += 1e-12
+    assert array_digest(data) != array_digest(changed)
+
+
+def test_key_depends_only_on_listed_fields():
+    digest = array_digest(np.zeros(4))
+    base = BoundaryConfig()
+    key = cache_key('state', digest, base, ANALYSIS_FIELDS)
+    assert cache_key('state', digest, BoundaryConfig(slab_size=3), ANALYSIS_FIELDS) == key
+    assert cache_key('state', digest, BoundaryConfig(entropy_bins=5), ANALYSIS_FIELDS) != key
+    assert cache_key('local_entropy', digest, base, ANALYSIS_FIELDS) != key
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=3 * 1024)
+    for name in 'abc':
+        cache.put(name, _payload(ord(name)))
+    cache.get('a')  # 'b' is now the oldest
+    cache.put('d', _payload(4))
+    assert cache.get('b') is None
+    assert all(cache.get(name) is not None for name in 'acd')
+    assert cache.evictions == 1 and cache.nbytes <= cache.max_bytes
+
+    stored = cache.get('a')['values']
+    with pytest.raises(ValueError):
+        stored[0] = 0
+
+
+def test_disk_round_trip(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ResultCache(max_bytes=2**20, path=path)
+    cache.put('a', _payload(1.5))
+    cache.close()
+
+    reopened = ResultCache(max_bytes=2**20, path=path)
+    payload = reopened.get('a')
+    np.testing.assert_array_equal(payload['values'], _payload(1.5)['values'])
+    assert reopened.disk_hits == 1 and reopened.disk_entries == 1
+    reopened.close()
+
+
+def test_disk_tier_stays_within_budget(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ResultCache(max_bytes=0, path=path, max_disk_bytes=20 * 1024)
+    cache.put('hot', _payload(-1))
+    for i in range(100):
+        cache.put(str(i), _payload(i))
+        assert cache.get('hot') is not None  # Used every step, never the oldest
+
+    assert 0 < cache.disk_nbytes <= cache.max_disk_bytes
+    assert cache.disk_evictions > 0
+    assert cache.get('99') is not None and cache.get('0') is None
+    stored = sqlite3.connect(path).execute(
+        'SELECT COUNT(*), SUM(LENGTH(value)) FROM entries').fetchone()
+    assert stored == (cache.disk_entries, cache.disk_nbytes)
+    cache.close()
+
+
+def test_old_disk_files_are_upgraded_and_trimmed(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB, nbytes INTEGER, '
+               'created REAL)')
+    for i in range(20):
+        blob = ResultCache._encode(_payload(i))
+        db.execute('INSERT INTO entries VALUES (?, ?, ?, ?)', (str(i), blob, 1024, float(i)))
+    db.commit()
+    db.close()
+
+    cache = ResultCache(max_bytes=0, path=path, max_disk_bytes=10 * 1024)
+    assert cache.disk_nbytes <= 10 * 1024
+    assert cache.get('19') is not None and cache.get('0') is None
+    cache.close()
+
+
+def test_monitor_serves_identical_frames_from_cache():
+    data = np.random.default_rng(9).random((24, 24))
+    monitor = BoundaryMonitor(BoundaryConfig(cache_max_bytes=2**20))
+    first = monitor.analyze_system(data, timestamp=1.0)
+    second = monitor.analyze_system(data.copy(), timestamp=2.0)
+    assert monitor.cache.hits >= 1
+    assert second.phi_integrated == first.phi_integrated
+    assert second.timestamp == 2.0
+    np.testing.assert_array_equal(second.normal_vector, first.normal_vector)
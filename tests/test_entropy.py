@@ -0,0 +1,117 @@
+"""
+Tests for the vectorized local entropy.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+from scipy.stats import entropy
+
+from bind.config import BoundaryConfig
+from bind.core.entropy import (RenyiEntropy, ShannonEntropy, local_entropy,
+                               make_entropy_backend, window_bin_counts)
+
+
+def reference_entropy(data, window_size=5, bins=10, epsilon=1e-10):
+    """The original per-pixel loop over edge-padded windows."""
+    padded = np.pad(np.asarray(data, dtype=float), window_size // 2, mode='edge')
+    result = np.zeros(data.shape)
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            window = padded[i:i + window_size, j:j + window_size]
+            result[i, j] = entropy(np.histogram(window, bins)[0] + epsilon)
+    return result
+
+
+def _fields():
+    rng = np.random.default_rng(0)
+    return {
+        'continuous': rng.random((32, 32)),
+        'grid_0.1': np.round(rng.random((32, 32)), 1),
+        'grid_0.01': np.round(rng.random((32, 32)), 2),
+        'uint8': rng.integers(0, 256, (32, 32)).astype(np.uint8),
+        'constant_patches': np.repeat(np.repeat(rng.integers(0, 3, (4, 4)), 8, 0), 8, 1),
+    }
+
+
+@pytest.mark.parametrize('bins', [10, 40])
+@pytest.mark.parametrize('name', list(_fields()))
+def test_matches_reference_loop(name, bins):
+    data = _fields()[name]
+    np.testing.assert_allclose(local_entropy(data, 5, bins), reference_entropy(data, 5, bins),
+                               rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('window_size', [3, 5])
+def test_matches_reference_loop_window_sizes(window_size):
+    data = _fields()['grid_0.1']
+    np.testing.assert_allclose(local_entropy(data, window_size),
+                               reference_entropy(data, window_size), rtol=0, atol=1e-12)
+
+
+def test_slabs_match_full_field():
+    data = _fields()['grid_0.01']
+    full = local_entropy(data)
+    slabs = np.concatenate([local_entropy(data, start=start, stop=min(start + 7, 32))
+                            for start in range(0, 32, 7)])
+    np.testing.assert_array_equal(slabs, full)
+
+
+def test_every_window_counts_every_sample():
+    data = _fields()['uint8'].reshape(4, 16, 16)
+    counts = window_bin_counts(data, window_size=3, bins=10)
+    assert counts.shape == (10, 4, 16, 16)
+    assert np.all(counts.sum(axis=0) == 27)
+
+
+def reference_renyi(data, alpha, window_size=5, bins=10, epsilon=1e-10):
+    """Rényi entropy of every edge-padded window, straight from the definition."""
+    padded = np.pad(np.asarray(data, dtype=float), window_size // 2, mode='edge')
+    result = np.zeros(data.shape)
+    for i in range(data.shape[0]):
+        for j in range(data.shape[1]):
+            hist = np.histogram(padded[i:i + window_size, j:j + window_size], bins)[0] + epsilon
+            p = hist / hist.sum()
+            result[i, j] = np.log(np.sum(p ** alpha)) / (1 - alpha)
+    return result
+
+
+@pytest.mark.parametrize('alpha', [0.5, 2.0, 3.0])
+def test_renyi_matches_definition(alpha):
+    data = _fields()['grid_0.1']
+    np.testing.assert_allclose(local_entropy(data, backend=RenyiEntropy(alpha)),
+                               reference_renyi(data, alpha), rtol=1e-10, atol=1e-12)
+
+
+def test_renyi_limits():
+    data = _fields()['uint8']
+    counts = window_bin_counts(data, window_size=5, bins=10)
+    renyi = lambda alpha: RenyiEntropy(alpha).from_counts(counts)
+
+    # alpha = 0 is the Hartley entropy: every smoothed bin counts
+    np.testing.assert_allclose(renyi(0.0), np.log(10), rtol=1e-12)
+    # alpha = 1 is exactly the Shannon entropy, and orders close to it converge
+    np.testing.assert_array_equal(renyi(1.0), ShannonEntropy().from_counts(counts))
+    np.testing.assert_allclose(renyi(1.0 + 1e-6), renyi(1.0), atol=1e-5)
+    # alpha = inf is the min-entropy -log max p
+    p = (counts.max(axis=0) + 1e-10) / (25 + 10 * 1e-10)
+    np.testing.assert_allclose(renyi(np.inf), -np.log(p), rtol=1e-12)
+    np.testing.assert_allclose(renyi(1e4), renyi(np.inf), rtol=1e-3)
+
+    # Rényi entropy never increases with the order
+    spectrum = RenyiEntropy([0.0, 0.5, 1.0, 2.0, np.inf]).from_counts(counts)
+    assert spectrum.shape == (5,) + data.shape
+    assert np.all(np.diff(spectrum, axis=0) <= 1e-12)
+
+    with pytest.raises(ValueError):
+        renyi(-1.0)
+
+
+def test_backend_follows_config():
+    assert type(make_entropy_backend(BoundaryConfig())) is ShannonEntropy
+    backend = make_entropy_backend(BoundaryConfig(entropy_calculation_method='renyi',
+                                                  renyi_alpha=3.0, epsilon=1e-8))
+    assert isinstance(backend, RenyiEntropy)
+    assert (backend.alpha, backend.epsilon) == (3.0, 1e-8)
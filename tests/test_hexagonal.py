@@ -0,0 +1,166 @@
+"""
+Tests for the hexagonal monitor's batch paths and grid cache.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+from scipy.stats import entropy
+
+from bind.config import BoundaryConfig
+from bind.core import hexagonal
+from bind.core.entropy import RenyiEntropy
+from bind.core.hexagonal import (HexBoundaryMonitor, clear_hex_grids, hex_hexagon,
+                                 hex_local_entropy, hex_rectangle)
+from bind.core.parallel import analyze_parallel
+from bind.core.pyramid import analyze_pyramid
+from bind.core.recording import Recording
+from bind.core.regions import analyze_regions
+from bind.core.sweep import expand_grid, sweep
+from bind.core.tiled import analyze_tiled
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+@pytest.fixture(scope='module')
+def stack():
+    rng = np.random.default_rng(3)
+    y, x = np.mgrid[0:24, 0:20]
+    edges = [1 / (1 + np.exp(-(np.cos(a) * x + np.sin(a) * y - 10))) for a in (0.2, 0.8, 1.4)]
+    return np.array(edges) + 0.05 * rng.standard_normal((3, 24, 20))
+
+
+def assert_rows_match(batch, states):
+    for i, state in enumerate(states):
+        for name in FIELDS:
+            np.testing.assert_allclose(getattr(batch, name)[i], getattr(state, name),
+                                       rtol=1e-12, atol=1e-15, err_msg=name)
+
+
+def test_batch_runs_hex_path(stack):
+    expected = [HexBoundaryMonitor().analyze_system(frame) for frame in stack]
+    monitor = HexBoundaryMonitor()
+    assert_rows_match(monitor.analyze_batch(stack), expected)
+    assert len(monitor.history) == len(stack)
+
+
+def test_parallel_runs_hex_path(stack):
+    expected = [HexBoundaryMonitor().analyze_system(frame) for frame in stack]
+    assert_rows_match(analyze_parallel(HexBoundaryMonitor(), stack, max_workers=2,
+                                       chunk_size=2), expected)
+
+
+def test_local_entropy_keeps_layout(stack):
+    monitor = HexBoundaryMonitor()
+    assert monitor.local_entropy(stack[0]).shape == stack[0].shape
+
+
+def reference_hex_entropy(grid, values, radius=2, bins=10, epsilon=1e-10):
+    """Per-cell np.histogram of every hexagonal neighbourhood."""
+    offsets = grid.disk(radius)
+    return np.array([entropy(np.histogram(values[grid.gather_indices(offsets, i, i + 1)[:, 0]],
+                                          bins)[0] + epsilon)
+                     for i in range(grid.size)])
+
+
+@pytest.mark.parametrize('bins', [3, 10, 40])
+def test_quantized_values_match_histogram(bins):
+    rng = np.random.default_rng(5)
+    for grid in (hex_rectangle(14, 11), hex_hexagon(5, 12)):
+        for values in (rng.integers(0, 7, grid.size), np.round(rng.random(grid.size), 1)):
+            np.testing.assert_allclose(hex_local_entropy(grid, values, bins=bins),
+                                       reference_hex_entropy(grid, values, bins=bins),
+                                       rtol=0, atol=1e-12)
+
+
+def test_entropy_spectrum(stack):
+    monitor = HexBoundaryMonitor()
+    alphas = [0.5, 1.0, 2.0, np.inf]
+    spectrum = monitor.entropy_spectrum(stack[0], alphas)
+    assert spectrum.shape == (len(alphas),) + stack[0].shape
+    np.testing.assert_allclose(spectrum[1], monitor.local_entropy(stack[0]), rtol=1e-12)
+    grid = monitor.grid_for(stack[0])
+    for alpha, layer in zip(alphas, spectrum):
+        expected = hex_local_entropy(grid, stack[0].ravel(), backend=RenyiEntropy(alpha))
+        np.testing.assert_array_equal(layer.ravel(), expected)
+    # Rényi entropy never increases with the order
+    assert np.all(np.diff(spectrum, axis=0) <= 1e-12)
+
+
+def test_analyze_system_runs_monitor_hooks(stack, tmp_path):
+    expected = [HexBoundaryMonitor().analyze_system(frame, timestamp=0.0) for frame in stack]
+    monitor = HexBoundaryMonitor()
+    monitor.enable_instrumentation()
+    monitor.enable_mask_history()
+    monitor.enable_recording(str(tmp_path / 'hex'))
+    for t, frame in enumerate(stack):
+        monitor.analyze_system(frame, timestamp=float(t))
+    monitor.disable_recording()
+
+    assert len(monitor.masks) == len(stack) and monitor.masks[0].shape == stack[0].shape
+    records = monitor.instrumentation.records
+    assert [r.boundary_pixels for r in records] == [len(mask) for mask in monitor.masks]
+    assert {'detection', 'entropy', 'normal', 'decoherence', 'phi'} <= set(monitor.stats())
+    recording = Recording(str(tmp_path / 'hex'))
+    assert len(recording) == len(stack)
+    for i, state in enumerate(expected):
+        for name in FIELDS:
+            np.testing.assert_array_equal(getattr(recording.state(i), name),
+                                          getattr(state, name))
+
+
+def test_analyze_system_uses_the_cache(stack):
+    monitor = HexBoundaryMonitor(BoundaryConfig(cache_max_bytes=2**20))
+    first = monitor.analyze_system(stack[0])
+    assert monitor.analyze_system(stack[0]).phi_integrated == first.phi_integrated
+    assert monitor.cache.hits == 1
+
+    other = HexBoundaryMonitor(BoundaryConfig(cache_max_bytes=2**20, hex_connectivity=12))
+    other.cache = monitor.cache
+    other.analyze_system(stack[0])
+    assert monitor.cache.hits == 1
+
+    # Frames on a custom lattice are never served from the cache
+    grid = hex_rectangle(24, 20, 12)
+    monitor.analyze_system(stack[0], grid=grid)
+    monitor.analyze_system(stack[0], grid=grid)
+    assert monitor.cache.hits == 1
+
+
+def test_square_grid_helpers_reject_hex(stack):
+    monitor = HexBoundaryMonitor()
+    for analyze in (analyze_tiled, analyze_regions, analyze_pyramid):
+        with pytest.raises(TypeError):
+            analyze(monitor, stack[0])
+
+
+def test_sweep_runs_hex_monitors(stack):
+    grid = {'entropy_bins': [6, 10], 'hex_connectivity': [6, 12]}
+    result = sweep(stack[:2], grid, monitor_type=HexBoundaryMonitor)
+    configs = expand_grid(grid)
+    for row in range(len(result)):
+        monitor = HexBoundaryMonitor(configs[result.columns['variant'][row]])
+        state = monitor.analyze_system(stack[result.columns['frame'][row]])
+        for name in FIELDS:
+            np.testing.assert_array_equal(result.columns[name][row], getattr(state, name))
+        assert result.columns['high_flux'][row] == \
+            monitor.detect_consciousness_potential(state)['high_flux']
+
+
+def test_grid_cache_is_bounded(monkeypatch):
+    clear_hex_grids()
+    grid = hex_rectangle(64, 64, 12)
+    assert hex_rectangle(64, 64, 12) is grid
+
+    monkeypatch.setattr(hexagonal, '_GRID_CACHE_BYTES', 2 * grid.nbytes)
+    for rows in (65, 66, 67):
+        hex_rectangle(rows, 64, 12)
+    assert sum(cached.nbytes for cached in hexagonal._grids.values()) <= 2 * grid.nbytes
+    assert hex_rectangle(64, 64, 12) is not grid
+
+    clear_hex_grids()
+    assert not hexagonal._grids
@@ -0,0 +1,80 @@
+"""
+Tests for the columnar boundary state history.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.core.boundary_state import BoundaryState
+from bind.core.history import BoundaryHistory
+
+
+def _state(t):
+    return BoundaryState(entropy_gradient=np.array([t, 1.0]), normal_vector=np.array([1.0, 0.0]),
+                         information_flux=t, decoherence_rate=2 * t, phi_integrated=3 * t,
+                         timestamp=t)
+
+
+@pytest.fixture
+def history():
+    # Seven appends into five rows: the two oldest states are evicted
+    history = BoundaryHistory(capacity=5)
+    for t in range(7):
+        history.append(_state(float(t)))
+    return history
+
+
+def test_indexing_is_chronological(history):
+    assert len(history) == 5
+    assert history[0].timestamp == 2.0
+    assert history[-1].timestamp == 6.0
+    with pytest.raises(IndexError):
+        history[5]
+
+
+def test_slices_return_states_like_a_list(history):
+    states = list(history)
+    for selection in (slice(-3, None), slice(None, 2), slice(None, None, 2), slice(4, 1, -1)):
+        assert ([s.timestamp for s in history[selection]]
+                == [s.timestamp for s in states[selection]])
+    assert history[10:] == []
+
+
+def test_phi_alias(history):
+    np.testing.assert_array_equal(history.column('phi'), history.phi)
+    np.testing.assert_array_equal(history.rolling_mean('phi', 2),
+                                  history.rolling_mean('phi_integrated', 2))
+    with pytest.raises(ValueError):
+        history.rolling_mean('normal_vector', 2)
+
+
+def test_mixed_dimensionality_is_kept():
+    history = BoundaryHistory(capacity=4)
+    history.append(_state(0.0))
+    volume = BoundaryState(entropy_gradient=np.array([1.0, 2.0, 3.0]),
+                           normal_vector=np.array([0.0, 0.0, 1.0]), information_flux=1.0,
+                           decoherence_rate=2.0, phi_integrated=3.0, timestamp=1.0)
+    history.append(volume)
+    history.append(_state(2.0))
+
+    assert history.ndim == 3
+    np.testing.assert_array_equal(history[0].entropy_gradient, [0.0, 1.0])
+    np.testing.assert_array_equal(history[1].normal_vector, [0.0, 0.0, 1.0])
+    np.testing.assert_array_equal(history[2].normal_vector, [1.0, 0.0])
+    np.testing.assert_array_equal(history.normal_vector,
+                                  [[1.0, 0.0, np.nan], [0.0, 0.0, 1.0], [1.0, 0.0, np.nan]])
+    np.testing.assert_array_equal(history.phi, [0.0, 3.0, 6.0])
+
+
+def test_monitor_reused_across_dimensions():
+    from bind.core.monitor import BoundaryMonitor
+
+    rng = np.random.default_rng(4)
+    monitor = BoundaryMonitor()
+    monitor.analyze_system(rng.random((16, 16)))
+    monitor.analyze_system(rng.random((8, 8, 8)))
+    monitor.analyze_batch(rng.random((2, 16, 16)))
+    assert [len(state.normal_vector) for state in monitor.history] == [2, 3, 2, 2]
@@ -0,0 +1,122 @@
+"""
+Tests for incremental frame-to-frame analysis against analyze_system.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.incremental import IncrementalBoundaryMonitor
+from bind.core.monitor import BoundaryMonitor
+from bind.core.recording import Recording
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+def _frames(shape, count=5):
+    """A smooth field with a few local patches changing between frames."""
+    rng = np.random.default_rng(7)
+    grids = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing='ij')
+    frame = 1 / (1 + np.exp(-8 * (np.sqrt(sum(g * g for g in grids)) - 0.5)))
+    frame = frame + 0.05 * rng.standard_normal(shape)
+
+    frames = [frame.copy()]
+    for _ in range(count - 1):
+        corner = [rng.integers(0, n - n // 4) for n in shape]
+        patch = tuple(slice(c, c + max(n // 4, 1)) for c, n in zip(corner, shape))
+        frame[patch] += rng.normal(0, 0.5, frame[patch].shape)
+        frames.append(frame.copy())
+    return frames
+
+
+@pytest.mark.parametrize('shape, slab_size', [
+    ((400,), 32),
+    ((64, 48), 8),
+    ((24, 20, 16), 6),
+])
+def test_matches_full_analysis(shape, slab_size):
+    config = BoundaryConfig(slab_size=slab_size)
+    incremental = IncrementalBoundaryMonitor(config, tolerance=0.0)
+    full = BoundaryMonitor(BoundaryConfig(slab_size=slab_size))
+
+    for t, frame in enumerate(_frames(shape)):
+        result = incremental.analyze_system(frame, timestamp=float(t))
+        expected = full.analyze_system(frame, timestamp=float(t))
+        for name in FIELDS:
+            np.testing.assert_allclose(getattr(result, name), getattr(expected, name),
+                                       rtol=1e-9, atol=1e-12,
+                                       err_msg=f'{name} at frame {t}')
+
+
+def test_unchanged_frame_recomputes_nothing():
+    frames = _frames((64, 48), count=2)
+    monitor = IncrementalBoundaryMonitor(BoundaryConfig(slab_size=8))
+    monitor.analyze_system(frames[0])
+    assert monitor.dirty_fraction == 1.0
+
+    monitor.analyze_system(frames[0])
+    assert monitor.dirty_fraction == 0.0
+
+    monitor.analyze_system(frames[1])
+    assert 0.0 < monitor.dirty_fraction < 1.0
+
+
+def test_shape_change_starts_over():
+    monitor = IncrementalBoundaryMonitor(BoundaryConfig(slab_size=8))
+    monitor.analyze_system(_frames((32, 32), count=1)[0])
+    frame = _frames((40, 24), count=1)[0]
+
+    result = monitor.analyze_system(frame, timestamp=0.0)
+    expected = BoundaryMonitor(BoundaryConfig(slab_size=8)).analyze_system(frame, timestamp=0.0)
+    assert monitor.dirty_fraction == 1.0
+    np.testing.assert_allclose(result.phi_integrated, expected.phi_integrated, rtol=1e-9)
+
+
+def test_runs_the_monitor_hooks(tmp_path):
+    frames = _frames((64, 48), count=3)
+    incremental = IncrementalBoundaryMonitor(BoundaryConfig(slab_size=8))
+    full = BoundaryMonitor(BoundaryConfig(slab_size=8))
+    for monitor in (incremental, full):
+        monitor.enable_instrumentation()
+        monitor.enable_mask_history()
+        monitor.enable_recording(str(tmp_path / type(monitor).__name__))
+        for t, frame in enumerate(frames):
+            monitor.analyze_system(frame, timestamp=float(t))
+        monitor.disable_recording()
+
+    assert len(incremental.history) == 3
+    np.testing.assert_array_equal(incremental.masks.timestamps, [0.0, 1.0, 2.0])
+    for mine, theirs in zip(incremental.masks, full.masks):
+        np.testing.assert_array_equal(mine.indices, theirs.indices)
+    records = incremental.instrumentation.records
+    assert [r.boundary_pixels for r in records] == [len(mask) for mask in full.masks]
+    assert {'detection', 'entropy', 'normal', 'decoherence', 'phi'} <= set(incremental.stats())
+    recording = Recording(str(tmp_path / 'IncrementalBoundaryMonitor'))
+    assert len(recording) == 3
+    np.testing.assert_array_equal(recording.frame(2), frames[2])
+    assert recording.state(1).phi_integrated == incremental.history[1].phi_integrated
+
+
+def test_exact_mode_uses_the_result_cache():
+    frames = _frames((64, 48), count=2)
+    monitor = IncrementalBoundaryMonitor(BoundaryConfig(slab_size=8, cache_max_bytes=2**20))
+    first = monitor.analyze_system(frames[0], timestamp=0.0)
+    monitor.analyze_system(frames[1], timestamp=1.0)
+    again = monitor.analyze_system(frames[0], timestamp=2.0)
+    assert monitor.cache.hits >= 1
+    assert again.phi_integrated == first.phi_integrated
+    # The next frame is still measured against the content last analyzed
+    after = monitor.analyze_system(frames[1], timestamp=3.0)
+    expected = BoundaryMonitor(BoundaryConfig(slab_size=8)).analyze_system(frames[1])
+    np.testing.assert_allclose(after.phi_integrated, expected.phi_integrated, rtol=1e-9)
+
+    lagging = IncrementalBoundaryMonitor(
+        BoundaryConfig(slab_size=8, cache_max_bytes=2**20), tolerance=0.1)
+    lagging.analyze_system(frames[0])
+    lagging.analyze_system(frames[0])
+    assert lagging.cache.hits == 0
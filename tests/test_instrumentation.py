@@ -0,0 +1,35 @@
+"""
+Tests for per-stage instrumentation of BoundaryMonitor.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+
+
+def test_cache_hits_are_recorded(tmp_path):
+    monitor = BoundaryMonitor(BoundaryConfig(instrumentation=True, cache_max_bytes=2**20))
+    monitor.instrumentation.export_prometheus(str(tmp_path / 'bind.prom'), interval=0.0)
+    data = np.random.default_rng(8).random((32, 32))
+    monitor.analyze_system(data)
+    monitor.analyze_system(data)
+
+    miss, hit = monitor.instrumentation.records
+    assert (miss.cache_hits, hit.cache_hits) == (0, 1)
+    assert hit.boundary_pixels == miss.boundary_pixels > 0
+    assert set(hit.stage_seconds) == {'cache'}
+    assert 'cache' in miss.stage_seconds and 'phi' in miss.stage_seconds
+    assert monitor.stats()['cache']['count'] == 2
+    assert 'bind_cache_hits_total 1' in (tmp_path / 'bind.prom').read_text()
+
+
+def test_uncached_frames_have_no_cache_stage():
+    monitor = BoundaryMonitor(BoundaryConfig(instrumentation=True))
+    monitor.analyze_system(np.random.default_rng(8).random((32, 32)))
+    record = monitor.instrumentation.records[-1]
+    assert 'cache' not in record.stage_seconds
+    assert record.to_dict()['cache_hits'] == 0
@@ -0,0 +1,75 @@
+"""
+Tests for BoundaryMonitor's slab-wise pipeline.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+def _field(shape):
+    rng = np.random.default_rng(1)
+    grids = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing='ij')
+    radius = np.sqrt(sum(g ** 2 for g in grids))
+    return 1 / (1 + np.exp(-(radius - 0.5) / 0.05)) + rng.normal(0, 0.05, shape)
+
+
+@pytest.mark.parametrize('method', ['gradient', 'laplacian'])
+@pytest.mark.parametrize('shape', [(200,), (70, 50), (20, 18, 16)])
+def test_slabs_match_single_slab(shape, method):
+    data = _field(shape)
+    single = BoundaryMonitor(BoundaryConfig(slab_size=1024, boundary_detection_method=method))
+    slabbed = BoundaryMonitor(BoundaryConfig(slab_size=6, boundary_detection_method=method))
+    expected = single.analyze_system(data, timestamp=0.0)
+    result = slabbed.analyze_system(data, timestamp=0.0)
+    for name in FIELDS:
+        np.testing.assert_allclose(getattr(result, name), getattr(expected, name),
+                                   rtol=1e-10, atol=1e-15, err_msg=name)
+
+
+def test_workspace_keeps_at_most_its_budget():
+    data = _field((64, 64, 64))
+    monitor = BoundaryMonitor(BoundaryConfig(slab_size=8, workspace_max_bytes=2**20))
+    monitor.analyze_system(data)
+    assert 0 < monitor.workspace.nbytes <= 2**20
+
+
+def test_workspace_is_slab_sized_and_reused():
+    data = _field((64, 64, 64))
+    monitor = BoundaryMonitor(BoundaryConfig(slab_size=8))
+    monitor.analyze_system(data)
+    # Gradients, strength, scratch and mask of one slab plus its halo
+    assert monitor.workspace.nbytes <= 6 * (8 + 8) * 64 * 64 * 8
+
+    allocations = monitor.workspace.allocations
+    monitor.analyze_system(data)
+    assert monitor.workspace.allocations == allocations
+
+
+def test_batch_releases_workspace():
+    monitor = BoundaryMonitor()
+    monitor.analyze_batch(np.stack([_field((32, 32))] * 4))
+    assert monitor.workspace.nbytes == 0
+
+
+def test_batch_records_masks_like_single_frames():
+    stack = np.stack([_field((40, 36)) * (i + 1) + i for i in range(5)])
+    batched = BoundaryMonitor(BoundaryConfig(record_masks=True, slab_size=2))
+    batched.analyze_batch(stack)
+    single = BoundaryMonitor(BoundaryConfig(record_masks=True))
+    for frame in stack:
+        single.analyze_system(frame)
+
+    assert len(batched.masks) == len(stack)
+    for result, expected in zip(batched.masks, single.masks):
+        assert result.shape == expected.shape
+        np.testing.assert_array_equal(result.indices, expected.indices)
@@ -0,0 +1,132 @@
+"""
+Tests for the multi-repository agent's scoring, history and thread pool.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import gc
+
+import numpy as np
+import pytest
+
+from bind.core.boundary_state import BoundaryBatch
+from bind.systems.multi_repository_agent import (APPROACH, AVOID, EXPLORE, Agenda,
+                                                 IntegrationHistory, MultiRepositoryAgent,
+                                                 Repository, create_insect_simulation)
+
+
+def test_alignment_scores_each_goal():
+    agenda = Agenda(goals=['find_food', 'avoid_danger'], priorities=[3.0, 1.0])
+    needed = np.array([APPROACH, APPROACH, EXPLORE, AVOID, AVOID], dtype=np.int8)
+    actions = np.array([APPROACH, EXPLORE, AVOID, AVOID, APPROACH], dtype=np.int8)
+    # A goal is served by its action when called for and by abstaining otherwise
+    np.testing.assert_allclose(agenda.alignment(actions, needed),
+                               [1.0, 0.25, 0.75, 1.0, 0.0])
+
+    honest = Agenda(goals=['be_honest'])
+    np.testing.assert_array_equal(honest.alignment(actions, needed), actions == needed)
+    np.testing.assert_array_equal(Agenda().alignment(actions, needed), actions == needed)
+
+
+def test_agenda_validation_and_situation():
+    with pytest.raises(ValueError):
+        Agenda(goals=['take_over'])
+    with pytest.raises(ValueError):
+        Agenda(goals=['find_food'], priorities=[1.0, 2.0]).weights()
+
+    frames = np.zeros((3, 4, 4))
+    frames[0, 1, 2] = 0.9
+    frames[1, 3, 0] = -0.9
+    frames[2, 0, 0] = 0.2
+    needed = Agenda(salience_threshold=0.5).situation(frames)
+    assert needed.tolist() == [APPROACH, AVOID, EXPLORE]
+
+
+def _batch(steps):
+    steps = np.asarray(steps, dtype=np.float64)
+    n = len(steps)
+    return BoundaryBatch(entropy_gradient=steps[:, None], normal_vector=np.ones((n, 1)),
+                         information_flux=steps, decoherence_rate=np.zeros(n),
+                         phi_integrated=steps / 10, timestamp=steps)
+
+
+@pytest.mark.parametrize('sizes', [(3, 3), (2, 7), (4, 1, 1, 4), (12,)])
+def test_history_ring_wraps_around(sizes):
+    history = IntegrationHistory(capacity=5)
+    start = 0
+    for n in sizes:
+        steps = np.arange(start, start + n)
+        history.extend(_batch(steps), step=steps, action=(steps % 3).astype(np.int8),
+                       confidence=steps / 100, success=steps % 2 == 0,
+                       alignment=steps / 1000)
+        start += n
+
+    kept = np.arange(max(start - 5, 0), start)
+    assert len(history) == len(kept)
+    np.testing.assert_array_equal(history.column('step'), kept)
+    np.testing.assert_array_equal(history.column('alignment'), kept / 1000)
+    np.testing.assert_allclose(history.phi, kept / 10)
+    for row, step in zip(history, kept):
+        assert row['step'] == step and row['state'].timestamp == step
+        assert row['action'] == ('explore', 'approach', 'avoid')[step % 3]
+        assert row['success'] == (step % 2 == 0)
+    assert history[-1]['step'] == kept[-1]
+
+    history.clear()
+    assert len(history) == 0
+    history.extend(_batch([100]), step=np.array([100]), action=np.array([1], dtype=np.int8),
+                   confidence=np.ones(1), success=np.ones(1, dtype=bool), alignment=np.ones(1))
+    assert history[0]['step'] == 100 and history[0]['state'].timestamp == 100
+
+
+def _agent(max_workers):
+    agent = MultiRepositoryAgent(Agenda(goals=['find_food', 'avoid_danger']),
+                                 max_workers=max_workers)
+    agent.add_repository(Repository('near', processing_style='concrete'))
+    agent.add_repository(Repository('far', processing_style='abstract', memory=0.5))
+    return agent
+
+
+def _environment(frames=4):
+    # Large enough chunks (>= 1 MiB) to run repositories on the thread pool
+    return np.random.default_rng(8).normal(0, 0.3, (frames, 128, 256))
+
+
+def test_thread_pool_matches_serial_and_closes():
+    environment = _environment()
+    with _agent(max_workers=1) as serial:
+        expected = serial.demonstrate_consciousness(environment)
+        assert serial._pool is None
+
+    with _agent(max_workers=2) as agent:
+        assert agent.demonstrate_consciousness(environment) == expected
+        pool = agent._pool
+        assert pool is not None
+        threads = list(pool._threads)
+    assert agent._pool is None and pool._shutdown
+    assert not any(thread.is_alive() for thread in threads)
+    agent.close()  # Closing twice is harmless
+
+
+def test_collected_agent_shuts_its_pool_down():
+    agent = _agent(max_workers=2)
+    agent.integrate(_environment())
+    pool = agent._pool
+    del agent
+    gc.collect()
+    assert pool._shutdown
+
+
+def test_insect_demonstration_summary():
+    environment = np.zeros((30, 8, 8))
+    environment[:10, 2, 2] = 1.0
+    environment[10:20, 5, 5] = -1.0
+    with create_insect_simulation() as agent:
+        summary = agent.demonstrate_consciousness(environment)
+    assert summary['total_steps'] == 30
+    assert sum(summary['action_counts'].values()) == 30
+    assert 0 <= summary['agenda_alignment'] <= 1
+    assert summary['consciousness_metric'] == pytest.approx(
+        summary['average_integration'] * summary['agenda_alignment'])
+    assert len(agent.actions_taken) == 30
@@ -0,0 +1,58 @@
+"""
+Tests for process-pool analysis against analyze_batch.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.core.monitor import BoundaryMonitor
+from bind.core.parallel import analyze_parallel
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+@pytest.fixture(scope='module')
+def stack():
+    # Frames scaled differently, so reading the wrong frame cannot pass
+    rng = np.random.default_rng(0)
+    return rng.random((16, 24, 24)) * np.arange(1, 17)[:, None, None] ** 2
+
+
+@pytest.fixture(scope='module')
+def mapped(stack, tmp_path_factory):
+    path = tmp_path_factory.mktemp('frames') / 'stack.npy'
+    np.save(path, stack)
+    return np.load(path, mmap_mode='r')
+
+
+def assert_matches_batch(frames):
+    monitor = BoundaryMonitor()
+    result = analyze_parallel(monitor, frames, max_workers=2, chunk_size=3)
+    expected = BoundaryMonitor().analyze_batch(np.asarray(frames))
+    for name in FIELDS:
+        np.testing.assert_allclose(getattr(result, name), getattr(expected, name),
+                                   rtol=1e-12, atol=1e-12, err_msg=name)
+    assert len(monitor.history) == len(frames)
+
+
+def test_array(stack):
+    assert_matches_batch(stack)
+
+
+def test_sequence_of_frames(stack):
+    assert_matches_batch(list(stack[:5]))
+
+
+@pytest.mark.parametrize('view', [
+    np.s_[:],           # the whole mapping
+    np.s_[10:14],       # contiguous view past the header
+    np.s_[::2],         # strided view (shared memory path)
+    np.s_[3:9, 2:20],   # non-contiguous crop (shared memory path)
+])
+def test_memmap_views(mapped, view):
+    assert_matches_batch(mapped[view])
@@ -0,0 +1,59 @@
+"""
+Tests for coarse-to-fine analysis against analyze_system.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+from bind.core.pyramid import analyze_pyramid
+from bind.core.simulator import BoundarySimulator
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+def _localized(n):
+    """A smooth ring boundary on a gentle ramp: edges cover part of the field."""
+    x = np.linspace(-1, 1, n)
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    return 1 / (1 + np.exp(-(np.sqrt((X - 0.2) ** 2 + Y ** 2) - 0.4) / 0.03)) + 0.3 * X
+
+
+def assert_matches_full(data, slab_size=32, **kwargs):
+    state, report = analyze_pyramid(BoundaryMonitor(BoundaryConfig(slab_size=slab_size)),
+                                    data, timestamp=0.0, **kwargs)
+    expected = BoundaryMonitor(BoundaryConfig(slab_size=slab_size)).analyze_system(
+        data, timestamp=0.0)
+    for name in FIELDS:
+        np.testing.assert_allclose(getattr(state, name), getattr(expected, name),
+                                   rtol=1e-9, atol=1e-12, err_msg=name)
+    return report
+
+
+def test_localized_boundary_uses_band():
+    report = assert_matches_full(_localized(512))
+    assert not report.fallback
+    assert report.band_fraction < 0.5
+    assert report.sampled_missed == 0
+
+
+def test_noisy_field_falls_back():
+    # Noise puts edges everywhere, so the band cannot be trusted
+    data = BoundarySimulator.generate_two_phase_system((256, 256), seed=0)
+    report = assert_matches_full(data)
+    assert report.fallback
+
+
+@pytest.mark.parametrize('max_refinements', [0, 1])
+def test_refinement_budget_falls_back(max_refinements):
+    data = _localized(256)
+    report = assert_matches_full(data, band=0, candidate_percentile=99.0,
+                                 max_refinements=max_refinements)
+    assert report.fallback
+    assert report.refinements == max_refinements
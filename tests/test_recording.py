@@ -0,0 +1,145 @@
+"""
+Tests for chunked recording and replay.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core import recording as recording_module
+from bind.core.boundary_state import BoundaryBatch
+from bind.core.monitor import BoundaryMonitor
+from bind.core.recording import Recording, RecordingWriter
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux', 'decoherence_rate',
+          'phi_integrated', 'timestamp')
+
+TIMES = [0.0, 1.0, 1.0, 2.0, 3.5, 4.0, 4.0, 4.0, 6.0, 7.0, 9.0]
+
+
+@pytest.fixture(scope='module')
+def analyzed():
+    """Frames with their analyzed states, at non-decreasing timestamps."""
+    frames = np.random.default_rng(12).random((len(TIMES), 12, 10))
+    monitor = BoundaryMonitor(BoundaryConfig())
+    return frames, [monitor.analyze_system(frame, timestamp=t)
+                    for frame, t in zip(frames, TIMES)]
+
+
+def _write(path, frames, states, chunk_frames=4):
+    """Record with single appends and a batch that spans chunk boundaries."""
+    with RecordingWriter(path, chunk_frames=chunk_frames) as writer:
+        writer.append(frames[0], states[0])
+        writer.extend(frames[1:7], BoundaryBatch.from_states(states[1:7]))
+        for frame, state in zip(frames[7:], states[7:]):
+            writer.append(frame, state)
+        assert len(writer) == len(frames)
+
+
+def test_round_trip_across_chunks(tmp_path, analyzed):
+    frames, states = analyzed
+    path = str(tmp_path / 'rec')
+    _write(path, frames, states)
+
+    recording = Recording(path)
+    assert len(recording) == len(frames) and recording.n_chunks == 3
+    for i in range(-len(frames), len(frames)):
+        np.testing.assert_array_equal(recording.frame(i), frames[i])
+        # Rebuilt states renormalize the stored unit normal
+        for name in FIELDS:
+            np.testing.assert_allclose(getattr(recording.state(i), name),
+                                       getattr(states[i], name), rtol=1e-15, atol=0)
+    for name in FIELDS:
+        np.testing.assert_array_equal(recording.column(name),
+                                      [getattr(state, name) for state in states])
+    with pytest.raises(IndexError):
+        recording.frame(len(frames))
+
+    # Slices crossing chunk boundaries come back in pieces of one chunk
+    pieces = list(recording.chunks(2, 10))
+    assert [len(f) for f, _ in pieces] == [2, 4, 2]
+    np.testing.assert_array_equal(np.concatenate([f for f, _ in pieces]), frames[2:10])
+    np.testing.assert_array_equal(recording.column('timestamp', 3, 9), TIMES[3:9])
+    batch = recording.to_batch()
+    np.testing.assert_array_equal(batch.phi_integrated, [s.phi_integrated for s in states])
+    assert recording.column('normal_vector', 5, 5).shape == (0, 2)
+
+
+def test_seek_and_time_range(tmp_path, analyzed):
+    frames, states = analyzed
+    path = str(tmp_path / 'rec')
+    _write(path, frames, states, chunk_frames=3)
+    recording = Recording(path)
+
+    for t in [-1.0, 0.0, 0.5, 1.0, 4.0, 5.0, 9.0, 9.5]:
+        assert recording.seek(t) == int(np.searchsorted(TIMES, t, side='left')), t
+    assert recording.time_range(1.0, 4.0) == (1, 5)
+    assert recording.time_range(4.0, 1.0) == (5, 5)
+    assert recording.time_range() == (0, len(TIMES))
+
+
+def test_replay_between_times(tmp_path, analyzed):
+    frames, states = analyzed
+    path = str(tmp_path / 'rec')
+    _write(path, frames, states)
+    recording = Recording(path)
+
+    replayed = list(recording.replay(start_time=1.0, stop_time=6.0))
+    assert [s.timestamp for s in replayed] == TIMES[1:8]
+    for mine, theirs in zip(replayed, states[1:8]):
+        for name in FIELDS:
+            np.testing.assert_array_equal(getattr(mine, name), getattr(theirs, name))
+
+    monitor = BoundaryMonitor(recording.config)
+    assert len(list(recording.replay(monitor, start_time=7.0))) == 2
+    assert len(monitor.history) == 2
+
+
+def test_timestamps_must_not_decrease(tmp_path, analyzed):
+    frames, states = analyzed
+    path = str(tmp_path / 'rec')
+    with RecordingWriter(path, chunk_frames=4) as writer:
+        writer.append(frames[3], states[3])
+        with pytest.raises(ValueError):
+            writer.append(frames[0], states[0])
+        with pytest.raises(ValueError):
+            writer.extend(frames[:2], BoundaryBatch.from_states([states[4], states[1]]))
+        with pytest.raises(ValueError):
+            writer.extend(frames[1:3], BoundaryBatch.from_states(states[1:3]))
+        with pytest.raises(ValueError):
+            writer.append(frames[0][:5], states[5])
+        writer.extend(frames[4:6], BoundaryBatch.from_states(states[4:6]))
+        assert len(writer) == 3
+
+    # A reopened recording continues after its last timestamp
+    with RecordingWriter(path) as writer:
+        with pytest.raises(ValueError):
+            writer.append(frames[4], states[4])
+        writer.append(frames[9], states[9])
+    assert Recording(path).column('timestamp').tolist() == [2.0, 3.5, 4.0, 7.0]
+
+
+def test_writer_thread_errors_surface(tmp_path, analyzed, monkeypatch):
+    frames, states = analyzed
+
+    def fail(path, array):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(recording_module, '_save_atomic', fail)
+    writer = RecordingWriter(str(tmp_path / 'rec'), chunk_frames=2)
+    writer.append(frames[0], states[0])
+    writer.append(frames[1], states[1])  # Submits the first chunk
+    writer._queue.join()
+
+    with pytest.raises(RuntimeError) as raised:
+        writer.append(frames[2], states[2])
+    assert isinstance(raised.value.__cause__, OSError)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert not writer._thread.is_alive()
+    writer.close()  # Already closed
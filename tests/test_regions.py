@@ -0,0 +1,66 @@
+"""
+Tests for per-region boundary analysis.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+from bind.core.regions import analyze_regions
+
+
+def _blobs():
+    """Two large discs and a small speck, each with its own boundary ring."""
+    y, x = np.mgrid[:64, :64]
+    data = np.zeros((64, 64))
+    data[(y - 18) ** 2 + (x - 18) ** 2 < 100] = 1.0
+    data[(y - 44) ** 2 + (x - 44) ** 2 < 64] = 2.0
+    data[56:58, 6:8] = 1.5
+    return data + np.random.default_rng(3).normal(0, 0.01, data.shape)
+
+
+def test_regions_partition_the_boundary_mask():
+    data = _blobs()
+    monitor = BoundaryMonitor(BoundaryConfig())
+    table = analyze_regions(monitor, data, timestamp=1.0)
+
+    np.testing.assert_array_equal(table.labels > 0, monitor._detect_boundaries(data))
+    np.testing.assert_array_equal(table.label, np.arange(1, len(table) + 1))
+    assert np.all(np.diff(table.size) <= 0)
+    for row, label in enumerate(table.label):
+        region = table.labels == label
+        assert table.size[row] == region.sum()
+        np.testing.assert_allclose(table.centroid[row], np.argwhere(region).mean(axis=0))
+        np.testing.assert_allclose(table.decoherence_rate[row], np.std(data[region]),
+                                   rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(np.linalg.norm(table.normal_vector[row]), 1.0)
+
+
+@pytest.mark.parametrize('connectivity', [1, 2])
+def test_dropped_regions_are_cleared_and_ids_compacted(connectivity):
+    data = _blobs()
+    monitor = BoundaryMonitor(BoundaryConfig())
+    full = analyze_regions(monitor, data, connectivity=connectivity)
+    min_size = int(np.sort(full.size)[-2])
+    table = analyze_regions(monitor, data, connectivity=connectivity, min_size=min_size)
+
+    assert 0 < len(table) < len(full)
+    assert np.all(table.size >= min_size)
+    np.testing.assert_array_equal(np.unique(table.labels), np.arange(len(table) + 1))
+    np.testing.assert_array_equal(table.size,
+                                  np.bincount(table.labels.ravel())[1:])
+    # The kept rows are the largest regions of the unfiltered table, unchanged
+    np.testing.assert_array_equal(table.size, full.size[:len(table)])
+    np.testing.assert_array_equal(table.phi_integrated, full.phi_integrated[:len(table)])
+    for row in range(len(table)):
+        np.testing.assert_array_equal(table.labels == row + 1, full.labels == row + 1)
+
+
+def test_frame_without_regions():
+    table = analyze_regions(BoundaryMonitor(BoundaryConfig()), np.ones((16, 16)), min_size=10**6)
+    assert len(table) == 0 and not table.labels.any()
+    assert table.to_dict()['label'] == []
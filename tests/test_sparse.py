@@ -0,0 +1,102 @@
+"""
+Tests for compact boundary masks and their bounded history.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.core.sparse import MaskHistory, SparseMask
+
+
+def _masks(shape=(37, 29), count=6):
+    rng = np.random.default_rng(4)
+    masks = [rng.random(shape) > 0.8 for _ in range(count)]
+    masks[1][:] = False
+    masks[2][:] = True
+    masks[3] = np.zeros(shape, dtype=bool)
+    masks[3].flat[[0, -1]] = True
+    return masks
+
+
+@pytest.mark.parametrize('shape', [(50,), (37, 29), (6, 7, 8)])
+def test_dense_round_trip(shape):
+    for dense in _masks(shape):
+        mask = SparseMask.from_dense(dense)
+        assert len(mask) == dense.sum() and mask.size == dense.size
+        np.testing.assert_array_equal(mask.to_dense(), dense)
+        np.testing.assert_array_equal(mask.values(np.arange(dense.size).reshape(shape)),
+                                      np.flatnonzero(dense))
+        for mine, theirs in zip(mask.coordinates(), np.nonzero(dense)):
+            np.testing.assert_array_equal(mine, theirs)
+
+
+def test_runs_round_trip():
+    for dense in _masks():
+        mask = SparseMask.from_dense(dense)
+        starts, lengths = mask.runs()
+        assert np.all(lengths > 0)
+        # Runs are maximal: the point after each run is not in the mask
+        ends = starts + lengths
+        assert not np.any(dense.ravel()[ends[ends < dense.size]])
+        rebuilt = SparseMask.from_runs(starts, lengths, dense.shape)
+        np.testing.assert_array_equal(rebuilt.indices, mask.indices)
+        assert rebuilt.shape == dense.shape
+
+    full = SparseMask.from_dense(np.ones((4, 5), dtype=bool)).runs()
+    assert full[0].tolist() == [0] and full[1].tolist() == [20]
+
+
+def test_history_keeps_the_newest_masks():
+    history = MaskHistory(capacity=4)
+    masks = _masks()
+    for t, dense in enumerate(masks):
+        history.append(dense, timestamp=float(t))
+
+    assert len(history) == 4
+    np.testing.assert_array_equal(history.timestamps, [2.0, 3.0, 4.0, 5.0])
+    for stored, dense in zip(history, masks[2:]):
+        np.testing.assert_array_equal(stored.to_dense(), dense)
+    assert history.nbytes == sum(mask.nbytes for mask in history)
+
+    history.clear()
+    assert len(history) == 0 and history.timestamps.size == 0
+    with pytest.raises(ValueError):
+        MaskHistory(capacity=0)
+
+
+@pytest.mark.parametrize('shape', [(37, 29), (300, 300)])
+def test_history_save_load(tmp_path, shape):
+    history = MaskHistory()
+    masks = _masks(shape, count=4)
+    for t, dense in enumerate(masks):
+        history.append(dense, timestamp=0.5 * t)
+    path = str(tmp_path / 'masks.npz')
+    history.save(path)
+
+    loaded = MaskHistory.load(path)
+    assert len(loaded) == len(masks)
+    np.testing.assert_array_equal(loaded.timestamps, history.timestamps)
+    for stored, dense in zip(loaded, masks):
+        assert stored.shape == shape
+        np.testing.assert_array_equal(stored.to_dense(), dense)
+
+    # Runs are stored in the smallest dtype that indexes the frame
+    with np.load(path) as archive:
+        assert archive['starts'].dtype == (np.uint16 if dense.size < 2**16 else np.uint32)
+
+    assert MaskHistory.load(path, capacity=2).timestamps.tolist() == [1.0, 1.5]
+
+
+def test_empty_and_mixed_histories(tmp_path):
+    path = str(tmp_path / 'empty.npz')
+    MaskHistory().save(path)
+    assert len(MaskHistory.load(path)) == 0
+
+    history = MaskHistory()
+    history.append(np.zeros((3, 3), dtype=bool), 0.0)
+    history.append(np.zeros((4, 3), dtype=bool), 1.0)
+    with pytest.raises(ValueError):
+        history.save(str(tmp_path / 'mixed.npz'))
@@ -0,0 +1,64 @@
+"""
+Tests for the streaming monitor's threshold window.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import asyncio
+
+import numpy as np
+
+from bind.config import BoundaryConfig
+from bind.core.streaming import StreamingBoundaryMonitor
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+def _frames(n, shape=(24, 24)):
+    rng = np.random.default_rng(5)
+    return rng.random((n,) + shape) * np.arange(1, n + 1)[:, None, None]
+
+
+def test_direct_calls_expire_the_window():
+    monitor = StreamingBoundaryMonitor(BoundaryConfig(integration_time_window=2.0))
+    for t, frame in enumerate(_frames(20)):
+        monitor.analyze_system(frame, timestamp=float(t))
+    # Frames at t = 17, 18 and 19 are within two seconds of the newest
+    assert [t for t, _ in monitor._window] == [17.0, 18.0, 19.0]
+
+
+def test_default_timestamps_keep_the_window_bounded():
+    monitor = StreamingBoundaryMonitor(BoundaryConfig(integration_time_window=60.0))
+    monitor.analyze_system(_frames(1)[0], timestamp=0.0)
+    monitor.analyze_system(_frames(1)[0])
+    assert len(monitor._window) == 1
+
+
+def test_batch_and_process_feed_the_same_window():
+    frames = _frames(6)
+    batched = StreamingBoundaryMonitor()
+    batch = batched.analyze_batch(frames)
+    timestamp = float(batch.timestamp[0])
+
+    streamed = StreamingBoundaryMonitor()
+    states = [streamed.process((timestamp, frame)) for frame in frames]
+    for i, state in enumerate(states):
+        for name in FIELDS:
+            np.testing.assert_allclose(getattr(batch, name)[i], getattr(state, name),
+                                       rtol=1e-12, err_msg=name)
+    assert len(batched._window) == len(frames)
+
+
+def test_astream_yields_one_state_per_frame():
+    async def frames():
+        for t, frame in enumerate(_frames(3)):
+            yield float(t), frame
+
+    async def collect():
+        return [state async for state in StreamingBoundaryMonitor().astream(frames())]
+
+    states = asyncio.run(collect())
+    assert [state.timestamp for state in states] == [0.0, 1.0, 2.0]
@@ -0,0 +1,64 @@
+"""
+Tests for config sweeps with shared pipeline stages.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+from bind.core.simulator import BoundarySimulator
+from bind.core.sweep import expand_grid, sweep
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux', 'decoherence_rate',
+          'phi_integrated')
+
+
+def _frames():
+    return [BoundarySimulator.generate_two_phase_system((40, 40), seed=seed) for seed in (1, 2)]
+
+
+@pytest.mark.parametrize('slab_size', [64, 7])
+def test_rows_equal_analyze_system(slab_size):
+    grid = {
+        'boundary_detection_method': ['gradient', 'laplacian'],
+        'entropy_bins': [6, 10],
+        'entropy_calculation_method': ['shannon', 'renyi'],
+        'phi_critical': [0.1, 0.5],
+    }
+    base = BoundaryConfig(slab_size=slab_size)
+    result = sweep(_frames(), grid, base)
+    configs = expand_grid(grid, base)
+    assert len(result) == 2 * len(configs)
+
+    for row in range(len(result)):
+        frame = _frames()[result.columns['frame'][row]]
+        monitor = BoundaryMonitor(configs[result.columns['variant'][row]])
+        state = monitor.analyze_system(frame)
+        for name in FIELDS:
+            np.testing.assert_array_equal(result.columns[name][row], getattr(state, name),
+                                          err_msg=name)
+        assessment = monitor.detect_consciousness_potential(state)
+        for name in ('phi_above_critical', 'high_flux', 'creative_decoherence',
+                     'transformation_probability'):
+            assert result.columns[name][row] == assessment[name], name
+
+
+def test_shared_stages_run_once_per_setting():
+    grid = {'phi_critical': [0.1, 0.3, 0.5], 'entropy_bins': [6, 10]}
+    result = sweep(_frames(), grid)
+    counts = result.evaluations
+    assert counts['gradients'] == 2 and counts['mask'] == 2
+    assert counts['local_entropy'] == 4
+    assert counts['assessment'] == 12
+    assert result.columns['phi_critical'].tolist() == [0.1, 0.1, 0.3, 0.3, 0.5, 0.5] * 2
+
+
+def test_explicit_configs_report_varied_fields():
+    configs = [BoundaryConfig(entropy_bins=8), BoundaryConfig(entropy_bins=12)]
+    result = sweep(_frames()[:1], configs)
+    assert result.columns['entropy_bins'].tolist() == [8, 12]
+    assert 'phi_critical' not in result.columns
@@ -0,0 +1,116 @@
+"""
+Tests for the percentile threshold strategies and their error bounds.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+import tracemalloc
+
+from bind.config import BoundaryConfig
+from bind.core import thresholds
+from bind.core.monitor import BoundaryMonitor
+from bind.core.simulator import BoundarySimulator
+from bind.core.thresholds import ExactThreshold, HistogramThreshold, ReservoirThreshold
+from bind.core.tiled import _derivative_tiles
+
+
+QUANTILES = [0, 1, 37.5, 50, 90, 99.9, 100]
+
+
+def _samples():
+    # Not seed 0: the reservoir draws its sampling keys from that stream
+    rng = np.random.default_rng(2025)
+    return {
+        'uniform': rng.random(20000),
+        'lognormal': rng.lognormal(0, 2, 20000),
+        'ties': rng.integers(0, 7, 20000).astype(float),
+        'odd_size': rng.standard_normal(1001),
+    }
+
+
+def _tiles(values, size=3000):
+    return lambda: (values[i:i + size] for i in range(0, len(values), size))
+
+
+@pytest.mark.parametrize('name', list(_samples()))
+def test_exact_equals_np_percentile(name):
+    values = _samples()[name]
+    strategy = ExactThreshold()
+    for q in QUANTILES:
+        expected = np.percentile(values, q)
+        assert strategy.threshold(values, q) == expected
+        assert strategy.threshold_tiles(_tiles(values), q) == expected
+
+    rows = values[:1000].reshape(4, 250)
+    np.testing.assert_array_equal(strategy.threshold_rows(rows, 90),
+                                  np.percentile(rows, 90, axis=1))
+
+
+def test_exact_tiles_refine_until_candidates_fit(monkeypatch):
+    # A small candidate budget forces several histogram refinement passes
+    monkeypatch.setattr(thresholds, '_SELECT_MAX_CANDIDATES', 50)
+    monkeypatch.setattr(thresholds, '_SELECT_BINS', 16)
+    values = _samples()['lognormal']
+    for q in QUANTILES:
+        assert ExactThreshold().threshold_tiles(_tiles(values), q) == np.percentile(values, q)
+
+
+@pytest.mark.parametrize('bins', [16, 256, 4096])
+@pytest.mark.parametrize('name', list(_samples()))
+def test_histogram_error_bound(name, bins):
+    values = _samples()[name]
+    bound = 2 * (values.max() - values.min()) / bins
+    strategy = HistogramThreshold(bins)
+    for q in QUANTILES:
+        estimate = strategy.threshold_tiles(_tiles(values), q)
+        assert abs(estimate - np.percentile(values, q)) <= bound * (1 + 1e-12)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('name', ['uniform', 'lognormal'])
+def test_reservoir_rank_within_dkw_bound(name, seed):
+    values = _samples()[name]
+    size, delta = 2000, 1e-3
+    bound = np.sqrt(np.log(2 / delta) / (2 * size))
+    strategy = ReservoirThreshold(size, seed)
+    for q in [10, 50, 90]:
+        for estimate in (strategy.threshold_tiles(_tiles(values), q),
+                         strategy.threshold(values, q)):
+            rank = np.mean(values <= estimate)
+            assert abs(rank - q / 100) <= bound
+
+
+def test_reservoir_in_memory_reads_only_its_sample():
+    values = np.random.default_rng(2025).random(2_000_000)
+    tracemalloc.start()
+    try:
+        ReservoirThreshold(1000).threshold(values, 90)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < values.nbytes / 20
+
+
+def test_reservoir_is_reproducible():
+    values = _samples()['uniform']
+    assert (ReservoirThreshold(500, seed=3).threshold(values, 90)
+            == ReservoirThreshold(500, seed=3).threshold(values, 90))
+
+
+@pytest.mark.parametrize('method', ['exact', 'histogram'])
+def test_tiled_threshold_equals_in_memory(method):
+    data = BoundarySimulator.generate_two_phase_system((96, 96), seed=0)
+    monitor = BoundaryMonitor(BoundaryConfig(threshold_method=method, slab_size=16,
+                                             threshold_sample_size=500))
+    _, strength = monitor._derivatives(data)
+    in_memory = monitor.threshold_strategy.threshold(strength.copy(), 90)
+
+    def tiles():
+        for _, _, _, _, tile in _derivative_tiles(monitor, data):
+            yield tile.ravel().copy()
+
+    tiled = monitor.threshold_strategy.threshold_tiles(tiles, 90)
+    assert tiled == pytest.approx(in_memory, rel=1e-12, abs=0)
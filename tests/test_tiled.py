@@ -0,0 +1,49 @@
+"""
+Tests for out-of-core tiled analysis against analyze_system.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.monitor import BoundaryMonitor
+from bind.core.tiled import analyze_tiled
+
+
+FIELDS = ('entropy_gradient', 'normal_vector', 'information_flux',
+          'decoherence_rate', 'phi_integrated')
+
+
+@pytest.mark.parametrize('method', ['exact', 'histogram'])
+@pytest.mark.parametrize('shape', [(300,), (60, 50), (20, 16, 12)])
+def test_matches_analyze_system(shape, method, tmp_path):
+    rng = np.random.default_rng(6)
+    grids = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing='ij')
+    field = np.tanh(8 * (sum(grids) - 0.2)) + 0.1 * rng.standard_normal(shape)
+    path = tmp_path / 'field.npy'
+    np.save(path, field)
+
+    config = BoundaryConfig(slab_size=7, threshold_method=method)
+    result = analyze_tiled(BoundaryMonitor(config), str(path), timestamp=0.0,
+                           spill_dir=str(tmp_path))
+    expected = BoundaryMonitor(config).analyze_system(field, timestamp=0.0)
+    for name in FIELDS:
+        np.testing.assert_allclose(getattr(result, name), getattr(expected, name),
+                                   rtol=1e-9, atol=1e-12, err_msg=name)
+    # The spilled strength map is removed afterwards
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['field.npy']
+
+
+def test_derivatives_computed_twice_per_tile(monkeypatch):
+    field = np.random.default_rng(7).random((64, 32))
+    monitor = BoundaryMonitor(BoundaryConfig(slab_size=8))
+    calls = []
+    derivatives = monitor._derivatives
+    monkeypatch.setattr(monitor, '_derivatives',
+                        lambda block, *args, **kwargs: calls.append(1) or
+                        derivatives(block, *args, **kwargs))
+    analyze_tiled(monitor, field)
+    assert len(calls) == 2 * (64 // 8)
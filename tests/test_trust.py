@@ -0,0 +1,72 @@
+"""
+Tests for the vectorized trust dynamics.
+
+Author: Hillary Danan
+Date: July 2025
+"""
+
+import numpy as np
+import pytest
+
+from bind.config import BoundaryConfig
+from bind.core.trust import TrustNetwork
+
+
+def test_expected_dynamics_reach_the_fixed_point():
+    network = TrustNetwork.random(50, 400, seed=1)
+    trajectory = network.run(max_steps=2000)
+    assert trajectory.converged and len(trajectory) < 2000
+
+    g, d = network.config.trust_growth_rate, network.config.trust_decay_rate
+    r = network.reliability[network.trust.indices]
+    np.testing.assert_allclose(network.trust.data, g * r / (g * r + d * (1 - r)), atol=1e-4)
+    assert np.all(np.diff(trajectory.max_change[5:]) <= 1e-7)
+
+
+def test_edges_held_at_the_bounds_converge():
+    # Repulsion from reputation pushes one edge past 1 and the other past 0
+    network = TrustNetwork([0, 1], [2, 2], reliability=[1.0, 1.0, 1.0], social_weight=-1.0)
+    network.trust.data[:] = [0.9, 0.2]
+    trajectory = network.run(max_steps=100)
+
+    assert trajectory.converged
+    np.testing.assert_array_equal(network.trust.data, [1.0, 0.0])
+    assert trajectory.max_change[-1] == 0.0
+    assert np.all((trajectory.min_trust >= 0) & (trajectory.max_trust <= 1))
+
+
+def test_stochastic_runs_are_seeded():
+    runs = [TrustNetwork.random(30, 200, seed=4, stochastic=True).run(max_steps=50)
+            for _ in range(2)]
+    np.testing.assert_array_equal(runs[0].mean_trust, runs[1].mean_trust)
+    np.testing.assert_array_equal(runs[0].reputation, runs[1].reputation)
+    other = TrustNetwork.random(30, 200, seed=5, stochastic=True).run(max_steps=50)
+    assert not np.array_equal(other.mean_trust, runs[0].mean_trust)
+
+
+def test_trajectory_layout():
+    network = TrustNetwork.random(20, 60, seed=2)
+    trajectory = network.run(max_steps=25, record_every=10)
+    assert len(trajectory) == 25 and not trajectory.converged
+    assert trajectory.snapshot_steps.tolist() == [10, 20, 25]
+    assert trajectory.reputation.shape == (3, 20)
+    np.testing.assert_allclose(trajectory.reputation[-1], network.reputation(), rtol=1e-6)
+    assert trajectory.to_dict()['snapshot_steps'] == [10, 20, 25]
+
+
+def test_network_construction():
+    config = BoundaryConfig(initial_trust=0.25)
+    network = TrustNetwork([0, 0, 1, 2], [1, 1, 2, 0], config=config)
+    assert network.n_agents == 3 and network.n_edges == 3
+    np.testing.assert_array_equal(network.trust.data, 0.25)
+    np.testing.assert_array_equal(network.reputation(), [0.25, 0.25, 0.25])
+
+    with pytest.raises(ValueError):
+        TrustNetwork([0, 1], [1])
+    with pytest.raises(ValueError):
+        TrustNetwork([0], [1], reliability=[1.0])
+
+    edges = TrustNetwork.random(2, 50, seed=0).trust.tocoo()
+    assert np.all(edges.row != edges.col)
+    with pytest.raises(ValueError):
+        TrustNetwork.random(1, 5)